@@ -0,0 +1,246 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+import numpy
+import pandas
+
+import HangmanSolver
+import HangmanTester
+from HangmanGame import HangmanGame
+from SolverSession import SolverSession
+
+heuristics = ["frequency", "occurrence", "absence", "avgOccurrenceInWord", "positionsInWord", "entropy", "minimaxPartition"]
+
+# relative frequency of each letter in english text, synthetic words are drawn from it so the statistics look like a real dictionary
+letterWeights = {"e": 12.7, "t": 9.1, "a": 8.2, "o": 7.5, "i": 7.0, "n": 6.7, "s": 6.3, "h": 6.1, "r": 6.0, "d": 4.3, "l": 4.0,
+                 "c": 2.8, "u": 2.8, "m": 2.4, "w": 2.4, "f": 2.2, "g": 2.0, "y": 2.0, "p": 1.9, "b": 1.5, "v": 1.0, "k": 0.8,
+                 "j": 0.2, "x": 0.2, "q": 0.1, "z": 0.1}
+
+
+def makeSyntheticDictionary(fileName: str, wordCount: int, meanLength: float, lengthDeviation: float, seed: int):
+    """
+    Writes a dictionary file of distinct random words. Lengths are drawn from a normal distribution (at least two letters)
+    and letters from english letter frequencies, so the same arguments always give the same file
+    :param fileName: the dictionary text file to write
+    :param wordCount: number of words in the dictionary
+    :param meanLength: average word length
+    :param lengthDeviation: standard deviation of the word length
+    :param seed: seed of the random words
+    """
+    generator = numpy.random.default_rng(seed)
+    letters = numpy.array(list(letterWeights))
+    weights = numpy.array(list(letterWeights.values()))
+    weights = weights/weights.sum()
+    words = {}
+    while len(words) < wordCount:
+        lengths = numpy.maximum(2, numpy.rint(generator.normal(meanLength, lengthDeviation, wordCount)).astype(numpy.int64))
+        text = "".join(generator.choice(letters, int(lengths.sum()), p=weights).tolist())
+        ends = numpy.cumsum(lengths)
+        for start, end in zip((ends - lengths).tolist(), ends.tolist()):
+            words[text[start:end]] = None
+            if len(words) == wordCount:
+                break
+    with open(fileName, "w") as dictionaryFile:
+        dictionaryFile.write("\n".join(words) + "\n")
+
+
+def timeCall(function, repeats: int) -> dict:
+    """
+    :param function: the call to time, without arguments
+    :param repeats: number of times to call it
+    :return: the median and fastest time of one call, in seconds
+    """
+    times = []
+    for repeat in range(0, repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"seconds": statistics.median(times), "min": min(times), "repeats": repeats}
+
+
+def findBoardStates(dictionary, sampleCount: int, seed: int) -> dict:
+    """
+    Plays frequency games for random words and keeps a board state from the start, the middle and the end of each one
+    :param dictionary: index of the dictionary
+    :param sampleCount: number of games to take states from
+    :param seed: seed for picking the words
+    :return: dictionary mapping early, mid and late to lists of (board, usedLetters) pairs
+    """
+    rows = numpy.random.default_rng(seed).choice(dictionary.wordCount, min(sampleCount, dictionary.wordCount), replace=False)
+    states = {"early": [], "mid": [], "late": []}
+    for row in rows.tolist():
+        word = dictionary.getWord(row)
+        game = HangmanGame(word, 8)
+        session = SolverSession(dictionary, "frequency", len(word))
+        turns = []
+        while not game.complete:
+            turns.append((game.board, game.usedLetters))
+            letter, guessedWord = session.getGuess()
+            if guessedWord != "":
+                session.recordWordGuess(guessedWord, game.playWord(guessedWord))
+            else:
+                game.playLetter(letter)
+                session.recordLetterGuess(letter, game.board)
+        states["early"].append(turns[0])
+        states["mid"].append(turns[len(turns)//2])
+        states["late"].append(turns[-1])
+    return states
+
+
+def getVersion() -> str:
+    """
+    :return: the git commit the benchmarks are run on, or unknown outside of a git checkout
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def runBenchmarks(wordCount: int, gameWordCount: int, meanLength: float, lengthDeviation: float, seed: int, sampleCount: int,
+                  repeats: int, processCounts: list, strategies: list) -> dict:
+    """
+    Times the solver's hot functions at early, mid and late game board states, dictionary loading, and games per second
+    for each heuristic, single process and with runTestsOnDictMulti
+    :param wordCount: number of words in the synthetic dictionary the functions are timed on
+    :param gameWordCount: number of words in the synthetic dictionary whole games are played on
+    :param meanLength: average word length of the synthetic dictionaries
+    :param lengthDeviation: standard deviation of the word length of the synthetic dictionaries
+    :param seed: seed of the synthetic dictionaries and of the sampled words
+    :param sampleCount: number of board states per game phase, and of single process games per heuristic
+    :param repeats: number of times each measurement is repeated, the median is reported
+    :param processCounts: process counts to measure runTestsOnDictMulti with
+    :param strategies: heuristics to measure
+    :return: the results, see main for the layout
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        dictionaryFileName = os.path.join(directory, "dictionary.txt")
+        compiledFileName = os.path.join(directory, "dictionary.hdict")
+        makeSyntheticDictionary(dictionaryFileName, wordCount, meanLength, lengthDeviation, seed)
+        HangmanSolver.compileDictionary(dictionaryFileName, compiledFileName)
+
+        results["loadDictionary"] = timeCall(lambda: HangmanSolver.loadDictionary(dictionaryFileName), repeats)
+        results["loadDictionaryIndex/text"] = timeCall(lambda: HangmanSolver.loadDictionaryIndex(dictionaryFileName), repeats)
+        results["loadDictionaryIndex/compiled"] = timeCall(lambda: HangmanSolver.loadDictionaryIndex(compiledFileName), repeats)
+
+        frame = HangmanSolver.loadDictionary(dictionaryFileName)
+        dictionary = HangmanSolver.loadDictionaryIndex(compiledFileName)
+        for phase, states in findBoardStates(dictionary, sampleCount, seed).items():
+            results["getPossibleWords/dataframe/" + phase] = timeCall(
+                lambda: [HangmanSolver.getPossibleWords(board, usedLetters, frame) for board, usedLetters in states], repeats)
+            results["getPossibleWords/index/" + phase] = timeCall(
+                lambda: [HangmanSolver.getPossibleWords(board, usedLetters, dictionary) for board, usedLetters in states], repeats)
+            positions = [dictionary.findCandidatePositions(board, usedLetters) for board, usedLetters in states]
+            for heuristic in strategies:
+                # a new state for every call, so the statistics are worked out each time like they are in a game
+                results["getGuess/" + heuristic + "/" + phase] = timeCall(
+                    lambda: [HangmanSolver.getGuess(heuristic, board, usedLetters, HangmanSolver.CandidateState(board, usedLetters, dictionary, statePositions))
+                             for (board, usedLetters), statePositions in zip(states, positions)], repeats)
+
+        rows = numpy.random.default_rng(seed).choice(dictionary.wordCount, min(sampleCount, dictionary.wordCount), replace=False)
+        words = [dictionary.getWord(row) for row in rows.tolist()]
+        for heuristic in strategies:
+            result = timeCall(lambda: [HangmanTester.testGame(word, dictionary, heuristic) for word in words], repeats)
+            result["gamesPerSecond"] = len(words)/result["seconds"]
+            results["testGame/" + heuristic] = result
+
+        gameDictionaryFileName = os.path.join(directory, "games.txt")
+        makeSyntheticDictionary(gameDictionaryFileName, gameWordCount, meanLength, lengthDeviation, seed + 1)
+        gameDictionary = HangmanSolver.loadDictionaryIndex(gameDictionaryFileName)
+        for heuristic in strategies:
+            for processCount in processCounts:
+                outFileName = os.path.join(directory, "out.csv")
+
+                def runMulti():
+                    if os.path.exists(outFileName):
+                        os.remove(outFileName)
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        HangmanTester.runTestsOnDictMulti(gameDictionary, heuristic, outFileName, processCount)
+
+                result = timeCall(runMulti, repeats)
+                result["gamesPerSecond"] = gameDictionary.wordCount/result["seconds"]
+                results["runTestsOnDictMulti/" + heuristic + "/" + str(processCount)] = result
+
+    return results
+
+
+def compareBenchmarks(baselineFileName: str, currentFileName: str, threshold: float) -> int:
+    """
+    Prints every measurement of two benchmark files side by side and flags the ones that got slower by more than the threshold
+    :param baselineFileName: results of the earlier run
+    :param currentFileName: results of the later run
+    :param threshold: fraction a median time can grow by before it is counted as a regression
+    :return: the number of regressions
+    """
+    with open(baselineFileName) as baselineFile:
+        baseline = json.load(baselineFile)
+    with open(currentFileName) as currentFile:
+        current = json.load(currentFile)
+    if baseline["config"] != current["config"]:
+        print("warning: the runs were made with different settings, times may not be comparable")
+
+    regressions = 0
+    rows = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            rows.append((name, None, result["seconds"], None, "new"))
+            continue
+        ratio = result["seconds"]/baseline["results"][name]["seconds"]
+        status = ""
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+            regressions += 1
+        elif ratio < 1/(1 + threshold):
+            status = "faster"
+        rows.append((name, baseline["results"][name]["seconds"], result["seconds"], ratio, status))
+
+    print(pandas.DataFrame(rows, columns=["measurement", baseline["version"], current["version"], "ratio", ""]).to_string(index=False))
+    print(regressions, "regressions over", str(round(threshold*100)) + "%")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks for the hangman solver on synthetic dictionaries")
+    parser.add_argument("-m", "--mode", help="run the benchmarks, compare two result files, or just write a synthetic dictionary", type=str,
+                        choices=["run", "compare", "makeDictionary"], default="run")
+    parser.add_argument("-o", "--outFile", help="where the results (or the dictionary, with makeDictionary) are written", type=str, default="benchmark.json")
+    parser.add_argument("-b", "--baseline", help="earlier results to compare the outFile with", type=str)
+    parser.add_argument("-t", "--threshold", help="fraction a time can grow by before compare counts it as a regression", type=float, default=0.1)
+    parser.add_argument("-n", "--words", help="number of words in the synthetic dictionary", type=int, default=20000)
+    parser.add_argument("-gn", "--gameWords", help="number of words in the synthetic dictionary runTestsOnDictMulti plays", type=int, default=2000)
+    parser.add_argument("-ml", "--meanLength", help="average word length", type=float, default=8.0)
+    parser.add_argument("-ld", "--lengthDeviation", help="standard deviation of the word length", type=float, default=2.5)
+    parser.add_argument("--seed", help="seed of the synthetic dictionaries and sampled words", type=int, default=0)
+    parser.add_argument("-sc", "--sampleCount", help="board states per game phase and games per heuristic", type=int, default=50)
+    parser.add_argument("-r", "--repeats", help="times each measurement is repeated", type=int, default=3)
+    parser.add_argument("-pc", "--processCounts", help="process counts for runTestsOnDictMulti", type=int, nargs="+", default=[1, os.cpu_count()])
+    parser.add_argument("-s", "--strategies", help="heuristics to measure", type=str, nargs="+", default=heuristics)
+    args = parser.parse_args()
+
+    if args.mode == "makeDictionary":
+        makeSyntheticDictionary(args.outFile, args.words, args.meanLength, args.lengthDeviation, args.seed)
+        print("wrote", args.words, "words to", args.outFile)
+    elif args.mode == "run":
+        config = {"words": args.words, "gameWords": args.gameWords, "meanLength": args.meanLength, "lengthDeviation": args.lengthDeviation,
+                  "seed": args.seed, "sampleCount": args.sampleCount, "repeats": args.repeats, "processCounts": args.processCounts}
+        results = runBenchmarks(args.words, args.gameWords, args.meanLength, args.lengthDeviation, args.seed, args.sampleCount,
+                                args.repeats, args.processCounts, args.strategies)
+        with open(args.outFile, "w") as outFile:
+            json.dump({"version": getVersion(), "python": platform.python_version(), "numpy": numpy.__version__, "pandas": pandas.__version__,
+                       "cpuCount": os.cpu_count(), "config": config, "results": results}, outFile, indent=1)
+        for name, result in results.items():
+            print(name, round(result["seconds"]*1000, 3), "ms", (str(round(result["gamesPerSecond"], 1)) + " games/sec") if "gamesPerSecond" in result else "")
+        print("results written to", args.outFile)
+    elif args.mode == "compare":
+        if compareBenchmarks(args.baseline, args.outFile, args.threshold) > 0:
+            parser.exit(1)
@@ -0,0 +1,275 @@
+import io
+import json
+import mmap
+import re
+
+import numpy
+import pandas
+
+from LetterStatistics import LetterStatistics
+
+compiledMagic = b"HANGDICT"
+compiledVersion = 1
+
+
+class DictionaryIndex:
+    def __init__(self, dictionary: pandas.core.frame.DataFrame):
+        """
+        Precomputes a lookup structure for a dictionary dataframe so boards can be filtered without scanning every word.
+        Words are grouped by length and each (position, letter) pair of a length group gets a bitset of the words that
+        have that letter in that position
+        :param dictionary: dataframe with a "words" column, as made by HangmanSolver.loadDictionary
+        """
+        self._frame = dictionary
+        self._wordText = None
+        self._wordOffsets = None
+        self.wordCount = len(dictionary)
+        self.buckets = {}
+
+        # only the leading run of word characters is considered, the same part of the word the regex filter looks at
+        prefixes = {}
+        for row, word in enumerate(dictionary.words.values):
+            match = re.match(r"\w+", word)
+            if match is None:
+                continue
+            length = match.end()
+            if length in prefixes:
+                prefixes[length][0].append(row)
+                prefixes[length][1].append(match.group())
+            else:
+                prefixes[length] = ([row], [match.group()])
+
+        self.alphabet = "".join(sorted(set("".join("".join(words) for rows, words in prefixes.values()))))
+        self.letterCodes = {letter: code for code, letter in enumerate(self.alphabet)}
+        translation = str.maketrans({letter: chr(code) for code, letter in enumerate(self.alphabet)})
+
+        for length, (rows, words) in prefixes.items():
+            codes = numpy.frombuffer("".join(words).translate(translation).encode("latin-1"), dtype=numpy.uint8)
+            codes = codes.reshape(len(words), length)
+            self.buckets[length] = (numpy.array(rows, dtype=numpy.int64), codes, self._makeBitsets(codes))
+
+    @property
+    def frame(self) -> pandas.core.frame.DataFrame:
+        """
+        :return: the dictionary dataframe, rebuilt from the word list the first time it is needed if the index was loaded from a compiled file
+        """
+        if self._frame is None:
+            # every word is followed by a newline, including the last one
+            words = bytes(self._wordText).decode("utf-8")[:-1].split("\n") if self.wordCount > 0 else []
+            self._frame = pandas.DataFrame(words, columns=["words"])
+        return self._frame
+
+    def getWord(self, row: int) -> str:
+        """
+        :param row: the row of the word in the dictionary dataframe
+        :return: the word, without building the dataframe if the index was loaded from a compiled file
+        """
+        if self._frame is not None:
+            return self._frame.words.values[row]
+        return bytes(self._wordText[self._wordOffsets[row]:self._wordOffsets[row + 1] - 1]).decode("utf-8")
+
+    def save(self, filePath: str):
+        """
+        Writes the index to a compiled dictionary file that DictionaryIndex.load can memory-map
+        :param filePath: the file to write
+        """
+        with open(filePath, "wb") as compiledFile:
+            self.writeCompiled(compiledFile)
+
+    def toBytes(self) -> bytes:
+        """
+        :return: the contents of the compiled dictionary file of the index, for DictionaryIndex.fromBuffer
+        """
+        buffer = io.BytesIO()
+        self.writeCompiled(buffer)
+        return buffer.getvalue()
+
+    def writeCompiled(self, compiledFile):
+        """
+        Writes the index in the compiled dictionary format. It holds a JSON header followed by 64 byte aligned arrays: the
+        words joined by newlines with an offset table into them, and for every length group its dataframe rows, its words
+        packed as fixed-width letter codes and its (position, letter) bitsets
+        :param compiledFile: binary file object to write to, positioned at its start
+        """
+        words = self.frame.words.values
+        wordText = ("\n".join(words) + "\n").encode("utf-8") if self.wordCount > 0 else b""
+        wordOffsets = numpy.zeros(self.wordCount + 1, dtype=numpy.int64)
+        wordOffsets[1:] = numpy.cumsum([len(word.encode("utf-8")) + 1 for word in words])
+
+        arrays = [numpy.frombuffer(wordText, dtype=numpy.uint8), wordOffsets]
+        buckets = {}
+        for length, (rows, codes, bitsets) in sorted(self.buckets.items()):
+            buckets[str(length)] = {"count": len(rows), "bitsetLength": bitsets.shape[2]}
+            arrays += [rows, codes, bitsets]
+
+        # the offsets depend on the header size and the header holds the offsets, so lay the arrays out after a header of fixed size
+        header = {"version": compiledVersion, "alphabet": self.alphabet, "wordCount": self.wordCount, "buckets": buckets, "offsets": []}
+        headerSize = len(json.dumps(header).encode("utf-8")) + 24*len(arrays) + 64
+        offset = -(-(len(compiledMagic) + 8 + headerSize) // 64) * 64
+        for array in arrays:
+            header["offsets"].append(offset)
+            offset += -(-array.nbytes // 64) * 64
+        headerBytes = json.dumps(header).encode("utf-8").ljust(headerSize)
+
+        compiledFile.write(compiledMagic + len(headerBytes).to_bytes(8, "little") + headerBytes)
+        for array, arrayOffset in zip(arrays, header["offsets"]):
+            compiledFile.write(b"\0"*(arrayOffset - compiledFile.tell()))
+            compiledFile.write(numpy.ascontiguousarray(array).tobytes())
+
+    @staticmethod
+    def isCompiled(filePath: str) -> bool:
+        """
+        :param filePath: a dictionary file
+        :return: true if the file is a compiled dictionary written by DictionaryIndex.save
+        """
+        with open(filePath, "rb") as dictionaryFile:
+            return dictionaryFile.read(len(compiledMagic)) == compiledMagic
+
+    @staticmethod
+    def load(filePath: str) -> "DictionaryIndex":
+        """
+        Memory-maps a compiled dictionary file. Nothing is copied, so loading is quick and every process that loads the same
+        file shares one copy of it in the page cache
+        :param filePath: a file written by DictionaryIndex.save
+        :return: the index stored in the file
+        """
+        with open(filePath, "rb") as compiledFile:
+            data = mmap.mmap(compiledFile.fileno(), 0, access=mmap.ACCESS_READ)
+        return DictionaryIndex.fromBuffer(data)
+
+    @staticmethod
+    def fromBuffer(data) -> "DictionaryIndex":
+        """
+        Reads a compiled dictionary out of a buffer without copying it
+        :param data: buffer holding the contents of a file written by DictionaryIndex.save
+        :return: the index stored in the buffer
+        """
+        if bytes(data[:len(compiledMagic)]) != compiledMagic:
+            raise ValueError("not a compiled dictionary")
+        headerSize = int.from_bytes(data[len(compiledMagic):len(compiledMagic) + 8], "little")
+        header = json.loads(bytes(data[len(compiledMagic) + 8:len(compiledMagic) + 8 + headerSize]))
+        if header["version"] != compiledVersion:
+            raise ValueError("compiled dictionary version " + str(header["version"]) + " is not supported, recompile it")
+
+        index = DictionaryIndex.__new__(DictionaryIndex)
+        index._frame = None
+        index.wordCount = header["wordCount"]
+        index.alphabet = header["alphabet"]
+        index.letterCodes = {letter: code for code, letter in enumerate(index.alphabet)}
+        offsets = header["offsets"]
+        index._wordOffsets = numpy.frombuffer(data, dtype=numpy.int64, count=index.wordCount + 1, offset=offsets[1])
+        index._wordText = numpy.frombuffer(data, dtype=numpy.uint8, count=int(index._wordOffsets[-1]), offset=offsets[0])
+        index.buckets = {}
+        for i, (length, bucket) in enumerate(header["buckets"].items()):
+            length = int(length)
+            rows = numpy.frombuffer(data, dtype=numpy.int64, count=bucket["count"], offset=offsets[2 + 3*i])
+            codes = numpy.frombuffer(data, dtype=numpy.uint8, count=bucket["count"]*length, offset=offsets[3 + 3*i]).reshape(bucket["count"], length)
+            bitsetShape = (length, len(index.alphabet), bucket["bitsetLength"])
+            bitsets = numpy.frombuffer(data, dtype=numpy.uint64, count=bitsetShape[0]*bitsetShape[1]*bitsetShape[2], offset=offsets[4 + 3*i]).reshape(bitsetShape)
+            index.buckets[length] = (rows, codes, bitsets)
+        return index
+
+    def _makeBitsets(self, codes: numpy.ndarray) -> numpy.ndarray:
+        """
+        Builds the (position, letter) bitsets for one length group
+        :param codes: matrix of letter codes, one row per word
+        :return: array of shape (word length, alphabet size, bitset length) where bit i of [p, k] is set if word i has letter k at position p
+        """
+        wordCount, length = codes.shape
+        paddedCount = -(-wordCount // 64) * 64
+        oneHot = numpy.zeros((length, len(self.alphabet), paddedCount), dtype=bool)
+        for position in range(0, length):
+            oneHot[position, codes[:, position], numpy.arange(wordCount)] = True
+        return numpy.packbits(oneHot, axis=2, bitorder="little").view(numpy.uint64)
+
+    def bucketSize(self, length: int) -> int:
+        """
+        :param length: a word length
+        :return: the number of words of the length
+        """
+        return len(self.buckets[length][0]) if length in self.buckets else 0
+
+    def getRows(self, length: int, positions: numpy.ndarray) -> numpy.ndarray:
+        """
+        :param length: the length of the words
+        :param positions: positions of the words within the length group, as returned by findCandidatePositions
+        :return: the rows of the words in the dictionary dataframe
+        """
+        return self.buckets[length][0][positions]
+
+    def findCandidatePositions(self, board: str, usedLetters: str) -> numpy.ndarray:
+        """
+        Finds the words of the boards length group that match the board, using the same rules as the regex filter
+        :param board: the current state of the hangman game, used to find size and correct guesses
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: positions of all possible words within the length group of the board, in dictionary order
+        """
+        if len(board) not in self.buckets:
+            return numpy.zeros(0, dtype=numpy.int64)
+        rows, codes, bitsets = self.buckets[len(board)]
+        if len(usedLetters) == 0:
+            return numpy.arange(len(rows))
+
+        usedCodes = [self.letterCodes[letter] for letter in set(usedLetters) if letter in self.letterCodes]
+        revealedPositions = []
+        revealedCodes = []
+        blankPositions = []
+        for position, space in enumerate(board):
+            if space == "_":
+                blankPositions.append(position)
+            elif space in self.letterCodes:
+                revealedPositions.append(position)
+                revealedCodes.append(self.letterCodes[space])
+            else:
+                return numpy.zeros(0, dtype=numpy.int64)
+
+        mask = numpy.full(bitsets.shape[2], numpy.iinfo(numpy.uint64).max, dtype=numpy.uint64)
+        if len(revealedPositions) > 0:
+            mask &= numpy.bitwise_and.reduce(bitsets[revealedPositions, revealedCodes], axis=0)
+        if len(blankPositions) > 0 and len(usedCodes) > 0:
+            excluded = bitsets[numpy.ix_(blankPositions, usedCodes)]
+            mask &= ~numpy.bitwise_or.reduce(excluded.reshape(-1, bitsets.shape[2]), axis=0)
+
+        selected = numpy.unpackbits(mask.view(numpy.uint8), bitorder="little")[:len(rows)]
+        return numpy.flatnonzero(selected)
+
+    def findCandidateRows(self, board: str, usedLetters: str) -> numpy.ndarray:
+        """
+        Finds the rows of the dictionary dataframe that match the board, using the same rules as the regex filter
+        :param board: the current state of the hangman game, used to find size and correct guesses
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: positions (for iloc) of all possible words, in dictionary order
+        """
+        if len(board) not in self.buckets:
+            return numpy.zeros(0, dtype=numpy.int64)
+        return self.buckets[len(board)][0][self.findCandidatePositions(board, usedLetters)]
+
+    def getStatistics(self, length: int, positions: numpy.ndarray) -> LetterStatistics:
+        """
+        Computes the letter statistics of some words of a length group straight from the index, without going through the dataframe
+        :param length: the length of the words
+        :param positions: positions of the words within the length group, as returned by findCandidatePositions
+        :return: the letter statistics of the words
+        """
+        if length not in self.buckets:
+            return LetterStatistics(numpy.zeros((0, length), dtype=numpy.uint8), list(self.alphabet))
+        return LetterStatistics(self.buckets[length][1][positions], list(self.alphabet))
+
+    def getWords(self, length: int, positions: numpy.ndarray) -> pandas.core.frame.DataFrame:
+        """
+        :param length: the length of the words
+        :param positions: positions of the words within the length group, as returned by findCandidatePositions
+        :return: the rows of the dictionary dataframe for the words
+        """
+        if length not in self.buckets:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[self.buckets[length][0][positions]]
+
+    def getPossibleWords(self, board: str, usedLetters: str) -> pandas.core.frame.DataFrame:
+        """
+        Selects all rows of the dictionary dataframe that match the boards size and content
+        :param board: the current state of the hangman game, used to find size and correct guesses
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: all possible words that could be the secret word bases on the correct and incorrect guesses and size of the secret word
+        """
+        return self.frame.iloc[self.findCandidateRows(board, usedLetters)]
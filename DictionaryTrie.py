@@ -0,0 +1,291 @@
+import re
+
+import numpy
+import pandas
+
+from LetterStatistics import LetterStatistics
+from TrieStatistics import TrieStatistics
+
+
+class DictionaryTrie:
+    def __init__(self, words: list):
+        """
+        Stores a dictionary as one trie per word length, in flat arrays instead of node objects. The nodes of each depth are
+        numbered in sorted order, so the children of a node are a contiguous run of the next depth and a depth only needs
+        the start of each node's run and the letter of each node. A board is matched by walking the trie a depth at a time
+        and only following the letters the board allows, so a subtree is skipped as soon as its prefix stops matching
+        :param words: the words of the dictionary, in dictionary order
+        """
+        self._frame = None
+        self.wordCount = len(words)
+        self._wordText = ("\n".join(words) + "\n").encode("utf-8") if self.wordCount > 0 else b""
+        self._wordOffsets = numpy.zeros(self.wordCount + 1, dtype=numpy.int64)
+        self._wordOffsets[1:] = numpy.cumsum([len(word.encode("utf-8")) + 1 for word in words])
+        # length -> (list of (child starts, child letters) per depth, leaf starts, rows in leaf order)
+        self.tries = {}
+
+        # only the leading run of word characters is considered, the same part of the word the regex filter looks at
+        prefixes = {}
+        for row, word in enumerate(words):
+            match = re.match(r"\w+", word)
+            if match is None:
+                continue
+            if match.end() in prefixes:
+                prefixes[match.end()][0].append(row)
+                prefixes[match.end()][1].append(match.group())
+            else:
+                prefixes[match.end()] = ([row], [match.group()])
+
+        self.alphabet = "".join(sorted(set("".join("".join(words) for rows, words in prefixes.values()))))
+        self.letterCodes = {letter: code for code, letter in enumerate(self.alphabet)}
+        codeType = numpy.uint8 if len(self.alphabet) <= 256 else numpy.uint32
+        for length, (rows, lengthWords) in prefixes.items():
+            codes = numpy.array([[self.letterCodes[letter] for letter in word] for word in lengthWords], dtype=codeType).reshape(len(rows), length)
+            self.tries[length] = self._makeTrie(numpy.array(rows, dtype=numpy.int64), codes)
+
+    @staticmethod
+    def _makeTrie(rows: numpy.ndarray, codes: numpy.ndarray) -> (list, numpy.ndarray, numpy.ndarray):
+        """
+        Builds the trie of one length group
+        :param rows: dictionary rows of the words
+        :param codes: matrix of letter codes, one row per word
+        :return: levels, leafStarts, leafRows: for every depth the start of each node's children in the next depth and the
+        letter of every node of the next depth, the start of each leaf's rows, and the rows of the words in leaf order
+        """
+        wordCount, length = codes.shape
+        # sorted by letters, and by row between duplicate words so the first row of a leaf is its lowest
+        order = numpy.lexsort([rows] + [codes[:, position] for position in range(length - 1, -1, -1)])
+        codes = codes[order]
+        levels = []
+        nodes = numpy.zeros(wordCount, dtype=numpy.int64)
+        changed = numpy.zeros(max(wordCount - 1, 0), dtype=bool)
+        for position in range(0, length):
+            changed |= codes[1:, position] != codes[:-1, position]
+            firsts = numpy.flatnonzero(numpy.concatenate(([wordCount > 0], changed)))
+            parents = nodes[firsts]
+            childStarts = numpy.searchsorted(parents, numpy.arange(int(nodes[-1]) + 2 if wordCount > 0 else 2)).astype(numpy.int32)
+            levels.append((childStarts, codes[firsts, position].copy()))
+            nodes = numpy.cumsum(numpy.concatenate(([wordCount > 0], changed))) - 1
+        leafCount = int(nodes[-1]) + 1 if wordCount > 0 else 0
+        leafStarts = numpy.searchsorted(nodes, numpy.arange(leafCount + 1)).astype(numpy.int32)
+        return levels, leafStarts, rows[order].astype(numpy.int32)
+
+    @property
+    def frame(self) -> pandas.core.frame.DataFrame:
+        """
+        :return: the dictionary dataframe, built from the word list the first time it is needed
+        """
+        if self._frame is None:
+            words = self._wordText.decode("utf-8")[:-1].split("\n") if self.wordCount > 0 else []
+            self._frame = pandas.DataFrame(words, columns=["words"])
+        return self._frame
+
+    def getWord(self, row: int) -> str:
+        """
+        :param row: the row of the word in the dictionary dataframe
+        :return: the word
+        """
+        return self._wordText[self._wordOffsets[row]:self._wordOffsets[row + 1] - 1].decode("utf-8")
+
+    def bucketSize(self, length: int) -> int:
+        """
+        :param length: a word length
+        :return: the number of words of the length
+        """
+        return len(self.tries[length][2]) if length in self.tries else 0
+
+    def getRows(self, length: int, positions: numpy.ndarray) -> numpy.ndarray:
+        """
+        :param length: the length of the words
+        :param positions: positions of the words within the length group, as returned by findCandidatePositions
+        :return: the rows of the words in the dictionary dataframe
+        """
+        return self.tries[length][2][positions]
+
+    def _walk(self, board: str, usedLetters: str) -> list:
+        """
+        Walks the trie of the board's length, following only the letters the board allows at each depth
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: for every depth, the matching nodes of the next depth and the index of each one's parent in the previous
+        depth's list, empty if no word matches
+        """
+        if len(board) not in self.tries:
+            return []
+        if len(usedLetters) == 0:
+            # like the regex filter, a board is only checked against once letters have been used
+            board = "_"*len(board)
+        levels = self.tries[len(board)][0]
+        blankAllowed = numpy.ones(len(self.alphabet), dtype=bool)
+        blankAllowed[[self.letterCodes[letter] for letter in set(usedLetters) if letter in self.letterCodes]] = False
+
+        walk = []
+        frontier = numpy.zeros(1, dtype=numpy.int64)
+        for position, space in enumerate(board):
+            childStarts, letters = levels[position]
+            starts = childStarts[frontier].astype(numpy.int64)
+            counts = childStarts[frontier + 1] - starts
+            parents = numpy.repeat(numpy.arange(len(frontier)), counts)
+            children = numpy.arange(int(counts.sum())) + numpy.repeat(starts - (numpy.cumsum(counts) - counts), counts)
+            if space == "_":
+                keep = blankAllowed[letters[children]]
+            elif space in self.letterCodes:
+                keep = letters[children] == self.letterCodes[space]
+            else:
+                return []
+            frontier = children[keep]
+            if len(frontier) == 0:
+                return []
+            walk.append((frontier, parents[keep]))
+        return walk
+
+    def _leafPositions(self, length: int, leaves: numpy.ndarray) -> numpy.ndarray:
+        """
+        :param length: the length of the words
+        :param leaves: leaf nodes of the trie of the length
+        :return: positions of the words of the leaves within the length group, in dictionary order
+        """
+        leafStarts, leafRows = self.tries[length][1:]
+        starts = leafStarts[leaves].astype(numpy.int64)
+        counts = leafStarts[leaves + 1] - starts
+        positions = numpy.arange(int(counts.sum())) + numpy.repeat(starts - (numpy.cumsum(counts) - counts), counts)
+        return positions[numpy.argsort(leafRows[positions], kind="stable")]
+
+    def findCandidatePositions(self, board: str, usedLetters: str) -> numpy.ndarray:
+        """
+        Finds the words of the boards length group that match the board, using the same rules as the regex filter
+        :param board: the current state of the hangman game, used to find size and correct guesses
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: positions of all possible words within the length group of the board, in dictionary order
+        """
+        walk = self._walk(board, usedLetters)
+        if len(walk) == 0:
+            return numpy.zeros(0, dtype=numpy.int64)
+        return self._leafPositions(len(board), walk[-1][0])
+
+    def findCandidateRows(self, board: str, usedLetters: str) -> numpy.ndarray:
+        """
+        :param board: the current state of the hangman game, used to find size and correct guesses
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: positions (for iloc) of all possible words, in dictionary order
+        """
+        if len(board) not in self.tries:
+            return numpy.zeros(0, dtype=numpy.int64)
+        return self.getRows(len(board), self.findCandidatePositions(board, usedLetters))
+
+    def getCodes(self, length: int, positions: numpy.ndarray) -> numpy.ndarray:
+        """
+        Spells words out of the trie as letter codes
+        :param length: the length of the words
+        :param positions: positions of the words within the length group
+        :return: (word, position) matrix of the words' letter codes
+        """
+        levels, leafStarts, leafRows = self.tries[length]
+        nodes = numpy.searchsorted(leafStarts, positions, side="right") - 1
+        codes = numpy.zeros((len(positions), length), dtype=levels[0][1].dtype)
+        for position in range(length - 1, -1, -1):
+            childStarts, letters = levels[position]
+            codes[:, position] = letters[nodes]
+            nodes = numpy.searchsorted(childStarts, nodes, side="right") - 1
+        return codes
+
+    def getStatistics(self, length: int, positions: numpy.ndarray) -> LetterStatistics:
+        """
+        :param length: the length of the words
+        :param positions: positions of the words within the length group, as returned by findCandidatePositions
+        :return: the letter statistics of the words
+        """
+        if length not in self.tries:
+            return LetterStatistics(numpy.zeros((0, length), dtype=numpy.uint8), list(self.alphabet))
+        return LetterStatistics(self.getCodes(length, positions), list(self.alphabet))
+
+    def getBoardStatistics(self, board: str, usedLetters: str):
+        """
+        Counts the letter statistics of the words that match a board while walking the trie, without listing the words. The
+        number of matching words below each matching node is added up from the leaves to the root, and every edge adds
+        that many to its letter's totals (and, the first time the letter is on the path, to the words containing it)
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: TrieStatistics of the matching words, or LetterStatistics if the alphabet is too large for the path bitmasks
+        """
+        length = len(board)
+        walk = self._walk(board, usedLetters)
+        if len(walk) == 0 or len(self.alphabet) > 64:
+            return self.getStatistics(length, self.findCandidatePositions(board, usedLetters))
+        levels, leafStarts, leafRows = self.tries[length]
+
+        # the letters on the path to each matching node, as a bitmask
+        masks = [numpy.zeros(1, dtype=numpy.uint64)]
+        for position, (nodes, parents) in enumerate(walk):
+            masks.append(masks[-1][parents] | (numpy.uint64(1) << levels[position][1][nodes].astype(numpy.uint64)))
+
+        letterCount = len(self.alphabet)
+        totals = numpy.zeros(letterCount, dtype=numpy.int64)
+        containing = numpy.zeros(letterCount, dtype=numpy.int64)
+        histogram = numpy.zeros((letterCount, length), dtype=numpy.int64)
+        # (lowest row, position) of the first time each letter is seen, as lowestRow*(length + 1) + position
+        firstSeen = numpy.full(letterCount, numpy.iinfo(numpy.int64).max, dtype=numpy.int64)
+        # positions are numbered by the letters that have not been used, see LetterStatistics.positionHistogram
+        if len(usedLetters) == 0:
+            board = "_"*length
+        unusedPositions = [space == "_" or space not in usedLetters for space in board]
+        positionIndex = numpy.cumsum(unusedPositions) - 1
+
+        leaves = walk[-1][0]
+        counts = (leafStarts[leaves + 1] - leafStarts[leaves]).astype(numpy.int64)
+        lowestRows = leafRows[leafStarts[leaves]].astype(numpy.int64)
+        for position in range(length - 1, -1, -1):
+            nodes, parents = walk[position]
+            letters = levels[position][1][nodes].astype(numpy.int64)
+            letterCounts = numpy.bincount(letters, weights=counts, minlength=letterCount).astype(numpy.int64)
+            totals += letterCounts
+            if unusedPositions[position]:
+                histogram[:, positionIndex[position]] += letterCounts
+            first = ((masks[position][parents] >> letters.astype(numpy.uint64)) & numpy.uint64(1)) == 0
+            containing += numpy.bincount(letters[first], weights=counts[first], minlength=letterCount).astype(numpy.int64)
+            # nodes whose subtrees were pruned further down have no matching words and no lowest row
+            live = counts > 0
+            numpy.minimum.at(firstSeen, letters[live], lowestRows[live]*(length + 1) + position)
+
+            parentCount = len(walk[position - 1][0]) if position > 0 else 1
+            counts = numpy.bincount(parents, weights=counts, minlength=parentCount).astype(numpy.int64)
+            parentRows = numpy.full(parentCount, numpy.iinfo(numpy.int64).max, dtype=numpy.int64)
+            numpy.minimum.at(parentRows, parents, lowestRows)
+            lowestRows = parentRows
+
+        present = numpy.flatnonzero(totals)
+        present = present[numpy.argsort(firstSeen[present], kind="stable")]
+
+        def makeMatrix():
+            return self.getCodes(length, self._leafPositions(length, leaves)), list(self.alphabet)
+
+        return TrieStatistics([self.alphabet[code] for code in present.tolist()], totals[present], containing[present],
+                              histogram[present], int(counts[0]), usedLetters, makeMatrix)
+
+    def getWords(self, length: int, positions: numpy.ndarray) -> pandas.core.frame.DataFrame:
+        """
+        :param length: the length of the words
+        :param positions: positions of the words within the length group, as returned by findCandidatePositions
+        :return: the rows of the dictionary dataframe for the words
+        """
+        if length not in self.tries:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[self.getRows(length, positions)]
+
+    def getPossibleWords(self, board: str, usedLetters: str) -> pandas.core.frame.DataFrame:
+        """
+        Selects all rows of the dictionary dataframe that match the boards size and content
+        :param board: the current state of the hangman game, used to find size and correct guesses
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: all possible words that could be the secret word bases on the correct and incorrect guesses and size of the secret word
+        """
+        return self.frame.iloc[self.findCandidateRows(board, usedLetters)]
+
+    def getMemoryUsage(self) -> int:
+        """
+        :return: the number of bytes held by the trie arrays and the word list
+        """
+        size = len(self._wordText) + self._wordOffsets.nbytes
+        for levels, leafStarts, leafRows in self.tries.values():
+            size += leafStarts.nbytes + leafRows.nbytes + sum(childStarts.nbytes + letters.nbytes for childStarts, letters in levels)
+        return size
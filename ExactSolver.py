@@ -0,0 +1,168 @@
+import collections
+
+import numpy
+
+# weight of each position in a reveal pattern, a pattern is the sum of the weights of the positions a letter is revealed in
+positionWeights = numpy.uint64(1) << numpy.arange(64, dtype=numpy.uint64)
+# the most possible words a game is searched from unless told otherwise, policy tables take it as the count below which
+# they stop scoring heuristics, so both have to agree for a table to hash the same however it was made
+defaultThreshold = 8
+
+
+class ExactSolver:
+    def __init__(self, threshold: int = defaultThreshold, objective: str = "expected", maxBytes: int = 64 << 20):
+        """
+        Plays the rest of a game perfectly once few enough words are possible. Every way the game can go from there is searched,
+        with branch and bound, for the guesses that make the fewest wrong guesses, and the value of each set of possible
+        words is kept in a transposition table so sets reached along different paths are only solved once.
+        The value of a set of possible words only depends on the words and on which of their positions are revealed. Used
+        letters do not matter, because the words that are still possible either all miss a used letter or all have it in the
+        revealed positions.
+        Guesses are compared by the total number of wrong guesses over the possible words (expected) or by the most wrong
+        guesses any of them takes (worst). The other measure and the total number of guesses break ties
+        :param threshold: the most possible words the game is searched from, above it the heuristics are used
+        :param objective: "expected" or "worst"
+        :param maxBytes: roughly how much memory the transposition table may use, the least recently used sets are dropped beyond it
+        """
+        if objective not in ["expected", "worst"]:
+            raise ValueError("the objective of an exact search is expected or worst, not " + str(objective))
+        self.threshold = threshold
+        self.objective = objective
+        self.maxBytes = maxBytes
+        self.table = collections.OrderedDict()  # (word length, revealed positions, word guesses, code size, codes) -> (value, move)
+        self.tableBytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def name(self) -> str:
+        """
+        :return: name of the search's settings, for keeping its guesses apart from other strategies' guesses
+        """
+        return "exact-" + self.objective + "-" + str(self.threshold)
+
+    def canSolve(self, board: str, candidateCount: int) -> bool:
+        """
+        :param board: the current state of the hangman game
+        :param candidateCount: the number of words that are still possible
+        :return: true if the game is searched from this state rather than left to the heuristics
+        """
+        return 0 < candidateCount <= self.threshold and len(board) <= 64
+
+    def _orderKey(self, value: tuple) -> tuple:
+        """
+        :param value: worst, total, guesses: the most wrong guesses any word takes, the total wrong guesses and the total guesses over the words
+        :return: tuple that sorts the values from best to worst for the objective
+        """
+        worst, total, guesses = value
+        if self.objective == "worst":
+            return worst, total, guesses
+        return total, guesses, worst
+
+    def _store(self, key: tuple, entry: tuple):
+        """
+        Adds a solved set to the transposition table, dropping the least recently used sets if it is over its memory budget
+        :param key: the set's key, see self.table
+        :param entry: value, move of the set
+        """
+        self.table[key] = entry
+        self.tableBytes += len(key[4]) + 200
+        while self.tableBytes > self.maxBytes and len(self.table) > 1:
+            oldKey, oldEntry = self.table.popitem(last=False)
+            self.tableBytes -= len(oldKey[4]) + 200
+
+    def _solve(self, codes: numpy.ndarray, revealed: int, wordGuesses: bool) -> (tuple, tuple):
+        """
+        Finds the best guess for a set of possible words and the value of playing perfectly from there
+        :param codes: (word, position) matrix of the code points of the possible words, no two rows the same, as bytes if they all fit
+        :param revealed: bitmask of the positions that are revealed on the board
+        :param wordGuesses: true to also consider guessing words that might not be the secret word
+        :return: value, move: (worst, total, guesses) as described in _orderKey, and (letter code, None) or (None, row of the word to guess)
+        """
+        wordCount, length = codes.shape
+        key = (length, revealed, wordGuesses, codes.dtype.itemsize, codes.tobytes())
+        entry = self.table.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.table.move_to_end(key)
+            return entry
+        self.misses += 1
+
+        if wordCount == 1:
+            entry = ((0, 0, 1), (None, 0))
+            self._store(key, entry)
+            return entry
+
+        complete = (1 << length) - 1
+        hidden = [position for position in range(length) if not revealed >> position & 1]
+        letters = numpy.unique(codes[:, hidden])
+        patterns = ((codes[:, :, None] == letters[None, None, :]) * positionWeights[:length, None]).sum(axis=1)
+        missCounts = (patterns == 0).sum(axis=0)
+
+        best = None
+        bestKey = None
+        # a guess costs at least the wrong guesses of the words that miss it, so trying the fewest misses first lets the
+        # rest be cut off as soon as that alone is no better than the best guess found. The sets are small enough that
+        # grouping the words in plain lists is faster than numpy
+        columns = patterns.T.tolist()
+        for k in numpy.argsort(missCounts, kind="stable").tolist():
+            groups = {}
+            for row, pattern in enumerate(columns[k]):
+                groups.setdefault(pattern, []).append(row)
+            if len(groups) == 1:
+                # a letter that does not split the words only spends guesses
+                continue
+            missCount = int(missCounts[k])
+            # every word that is not revealed by the guess needs at least one more guess
+            unsolved = [(pattern, rows) for pattern, rows in groups.items() if revealed | pattern != complete]
+            value = [1 if missCount > 0 else 0, missCount, wordCount + sum([len(rows) for pattern, rows in unsolved])]
+            if bestKey is not None and self._orderKey(value) >= bestKey:
+                if self._orderKey((value[0], missCount, 0)) >= bestKey:
+                    # the letters after this one miss at least as many words
+                    break
+                continue
+            for pattern, rows in unsolved:
+                if len(rows) == 1:
+                    # the last possible word is guessed right away, which the lower bound already counts
+                    continue
+                worst, total, guesses = self._solve(codes[rows], revealed | pattern, wordGuesses)[0]
+                value = [max(value[0], worst + (pattern == 0)), value[1] + total, value[2] + guesses - len(rows)]
+                if bestKey is not None and self._orderKey(value) >= bestKey:
+                    break
+            else:
+                best = (tuple(value), (int(letters[k]), None))
+                bestKey = self._orderKey(best[0])
+
+        # a wrong word guess costs every other word a wrong guess and leaves the board as it is. Trying every word this way
+        # multiplies the sets searched, so words are only tried where they could make fewer wrong guesses than the best
+        # letter, not just fewer guesses
+        if wordGuesses and (bestKey is None or self._orderKey((1, wordCount - 1, 2*wordCount - 1))[0] < bestKey[0]):
+            for row in range(wordCount):
+                worst, total, guesses = self._solve(numpy.delete(codes, row, axis=0), revealed, wordGuesses)[0]
+                value = (worst + 1, total + wordCount - 1, guesses + wordCount)
+                if bestKey is None or self._orderKey(value) < bestKey:
+                    best = (value, (None, row))
+                    bestKey = self._orderKey(value)
+
+        self._store(key, best)
+        return best
+
+    def getGuess(self, board: str, words: list, wordGuesses: bool = False) -> (str, str):
+        """
+        :param board: the current state of the hangman game
+        :param words: the words that are still possible
+        :param wordGuesses: true to also consider guessing a word that might not be the secret word, which can only be done
+            when the caller drops a wrongly guessed word from the possible words, as SolverSession does, because the board and
+            used letters do not change
+        :return: letter, word: the letter to guess, and the word to guess instead if a word should be guessed, otherwise an empty string
+        """
+        words = list(dict.fromkeys(words))
+        codePoints = [[ord(letter) for letter in word] for word in words]
+        dtype = numpy.uint8 if max(map(max, codePoints), default=0) < 256 else numpy.uint32
+        codes = numpy.array(codePoints, dtype=dtype).reshape(len(words), len(board))
+        revealed = sum(1 << position for position, space in enumerate(board) if space != "_")
+        value, (letterCode, row) = self._solve(codes, revealed, wordGuesses)
+        if row is not None:
+            word = words[row]
+            return next((letter for letter, space in zip(word, board) if space == "_"), word[0]), word
+        return chr(letterCode), ""
@@ -0,0 +1,97 @@
+import numpy
+
+import HangmanSolver
+from DictionaryIndex import DictionaryIndex
+
+
+class GameTree:
+    def __init__(self, dictionary: DictionaryIndex, heuristic: str, cache=None, states: dict = None):
+        """
+        Decision tree of the games a heuristic plays against a dictionary. Every game of a given length starts from the same
+        empty board and each guess only depends on the board and the used letters, so every (length, board, used letters)
+        state is solved once and the words that reach it are split between its children by the board they would produce
+        :param dictionary: index of the dictionary the secret words are from
+        :param heuristic: the name of the heuristic to use
+        :param cache: optional StrategyCache to look guesses up in before working them out
+        :param states: optional (length, board, usedLetters) -> CandidateState dictionary shared with the trees of other
+            heuristics, the possible words of a state and their letter statistics do not depend on the heuristic, so trees
+            sharing it only filter and count each state once between them
+        """
+        self.dictionary = dictionary
+        self.heuristic = heuristic
+        self.cache = cache
+        self.states = states
+        self.nodes = {}  # (length, board, usedLetters) -> (letter, word, list of child boards)
+
+    def getNode(self, board: str, usedLetters: str, positions=None) -> (str, str, list):
+        """
+        Finds the node of a state, solving the state if it has not been reached before
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :param positions: the possible words as positions within the length group, if they are already known
+        :return: letter, word, children: the guess as returned by HangmanSolver.getGuess and the boards it has led to so far
+        """
+        key = (len(board), board, usedLetters)
+        if key not in self.nodes:
+            state = self.states.get(key) if self.states is not None else None
+            if state is None:
+                state = HangmanSolver.CandidateState(board, usedLetters, self.dictionary, positions)
+                if self.states is not None:
+                    self.states[key] = state
+            if self.cache is not None:
+                letter, word = self.cache.getGuess(board, usedLetters, state)
+            else:
+                letter, word = HangmanSolver.getGuess(self.heuristic, board, usedLetters, state)
+            self.nodes[key] = (letter, word, [])
+        return self.nodes[key]
+
+    def getGuess(self, board: str, usedLetters: str) -> (str, str):
+        """
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: letter, word: the guess for the state, see HangmanSolver.getGuess
+        """
+        return self.getNode(board, usedLetters)[:2]
+
+    def playAll(self, length: int) -> dict:
+        """
+        Plays a game for every word of a length group by walking the tree once and partitioning the words at each node by
+        the board the guess would leave them with
+        :param length: the length of the secret words
+        :return: dictionary mapping the dictionary dataframe row of each word to the result testGame gives for it
+        """
+        rows, codes, bitsets = self.dictionary.buckets[length]
+        results = {}
+
+        stack = [("_"*length, "", numpy.arange(len(rows)), 0, 0, 0)]
+        while len(stack) > 0:
+            board, usedLetters, positions, guessCount, correctGuessCount, incorrectGuessCount = stack.pop()
+            if "_" not in board:
+                for row in rows[positions].tolist():
+                    word = self.dictionary.getWord(row)
+                    results[row] = (word, len(word), guessCount, correctGuessCount, incorrectGuessCount, usedLetters)
+                continue
+
+            letter, word, children = self.getNode(board, usedLetters, positions)
+            if word != "":
+                # the word is only guessed when it is the last one possible, so it is always right
+                for row in rows[positions].tolist():
+                    word = self.dictionary.getWord(row)
+                    results[row] = (word, len(word), guessCount + 1, correctGuessCount + 1, incorrectGuessCount, usedLetters)
+                continue
+
+            revealed = codes[positions] == self.dictionary.letterCodes[letter]
+            patterns, groups = numpy.unique(revealed, axis=0, return_inverse=True)
+            groups = groups.reshape(-1)
+            order = numpy.argsort(groups, kind="stable")
+            splits = numpy.cumsum(numpy.bincount(groups, minlength=len(patterns)))[:-1]
+            for pattern, group in zip(patterns, numpy.split(positions[order], splits)):
+                childBoard = "".join([letter if hit else space for space, hit in zip(board, pattern.tolist())])
+                if childBoard not in children:
+                    children.append(childBoard)
+                if pattern.any():
+                    stack.append((childBoard, usedLetters + letter, group, guessCount + 1, correctGuessCount + 1, incorrectGuessCount))
+                else:
+                    stack.append((childBoard, usedLetters + letter, group, guessCount + 1, correctGuessCount, incorrectGuessCount + 1))
+
+        return results
@@ -1,43 +1,132 @@
+import string
+
+# bit of each letter in a game's used letter mask, a to z are the low 26 bits and any other letter is given the next free
+# bit the first time it is guessed
+letterBits = {letter: 1 << bit for bit, letter in enumerate(string.ascii_lowercase)}
+
+
+def getLetterBit(letter: str) -> int:
+    """
+    :param letter: a letter that can be guessed
+    :return: the bit that stands for the letter in a used letter mask
+    """
+    bit = letterBits.get(letter)
+    if bit is None:
+        bit = 1 << len(letterBits)
+        letterBits[letter] = bit
+    return bit
+
+
 class HangmanGame:
+    __slots__ = ("secretWord", "wrongGuessLimit", "remainingGuesses", "complete", "usedLetterMask", "_board", "_boardCodes",
+                 "_hiddenCount", "_letterPositions", "_usedLetters", "_boardView", "_usedLettersView")
+
     def __init__(self, secretWord: str, wrongGuessLimit: int) -> object:
         """
-        Make a game of hangman with the given word string and a guess limi
+        Make a game of hangman with the given word string and a guess limi. The board is kept as a bytearray with one 32 bit
+        code per space and the used letters as a bitmask, the positions of each letter in the secret word are found up front
+        so a guess only touches the spaces it reveals. board and usedLetters are strings made from these when they are read
         :param secretWord: the word that must be guessed
         :param wrongGuessLimit: the maximum number of wrong guess (game does not end when this reaches zero)
         """
         self.secretWord = secretWord
         self.wrongGuessLimit = wrongGuessLimit
-        self.board = "_"*len(secretWord)
-        self.usedLetters = ""
         self.remainingGuesses = wrongGuessLimit
         self.complete = False
+        self.usedLetterMask = 0
+
+        self._board = bytearray("_"*len(secretWord), "utf-32-le")
+        self._boardCodes = memoryview(self._board).cast("I")
+        self._hiddenCount = len(secretWord)
+        self._letterPositions = {}
+        for i in range(0, len(secretWord)):
+            self._letterPositions.setdefault(secretWord[i], []).append(i)
+        self._usedLetters = []
+        self._boardView = None
+        self._usedLettersView = ""
 
         #print("Secret word:", secretWord)
         #print(wrongGuessLimit, "wrong guesses allowed")
         #print("board:", self.board)
 
-    def guessLetter(self, letter: str) -> (str, str, int, bool):
+    @property
+    def board(self) -> str:
         """
-        Guess the provided letter, wrong guesses will be subtracted from the remaining guesses, correct guess will be added to the board where appropriate
+        :return: the secret word with every space that has not been revealed replaced by '_'
+        """
+        if self._boardView is None:
+            self._boardView = self._board.decode("utf-32-le")
+        return self._boardView
+
+    @property
+    def usedLetters(self) -> str:
+        """
+        :return: a string containing all used letters, in the order they were guessed
+        """
+        if self._usedLettersView is None:
+            self._usedLettersView = "".join(self._usedLetters)
+        return self._usedLettersView
+
+    def playLetter(self, letter: str) -> bool:
+        """
+        Guess the provided letter without building the board or used letter strings, see guessLetter
         :param letter: letter to be guessed
-        :return: a quadruple containing: the updated board, a string containing all used letters, the number of remaining guesses, a flag that is true if the guess was correct, otherwise false
+        :return: true if the guess was correct, otherwise false
         """
+        self._usedLetters.append(letter)
+        self._usedLettersView = None
+        bit = getLetterBit(letter)
+        alreadyUsed = self.usedLetterMask & bit
+        self.usedLetterMask |= bit
+
         correctFlag = False
-        self.usedLetters += letter
-        if letter in self.secretWord:
-            for i in range(0, len(self.secretWord)):
-                if letter == self.secretWord[i]:
-                    self.board = self.board[:i] + letter + self.board[i + 1:]
+        positions = self._letterPositions.get(letter)
+        if positions is not None:
+            # a letter that was guessed before has already been revealed
+            if not alreadyUsed:
+                code = ord(letter)
+                for i in positions:
+                    self._boardCodes[i] = code
+                self._hiddenCount -= len(positions)
+                self._boardView = None
             correctFlag = True
         else:
             self.remainingGuesses -= 1
-            # correctFlag = False
             # print(letter, "is not in the secret word")
 
-        if "_" not in self.board:
+        if self._hiddenCount == 0:
+            self.complete = True
+            # print("you win")
+        return correctFlag
+
+    def playWord(self, word: str) -> bool:
+        """
+        Guess the provided word without building the board or used letter strings, see guessWord
+        :param word: the suspected secret word
+        :return: true if the guess was correct, otherwise false
+        """
+        if word == self.secretWord:
+            # print("correct")
+            for letter, positions in self._letterPositions.items():
+                code = ord(letter)
+                for i in positions:
+                    self._boardCodes[i] = code
+            self._hiddenCount = 0
+            self._boardView = word
             self.complete = True
             # print("you win")
+            return True
+        self.remainingGuesses -= 1
+        # print("incorrect")
+        return False
 
+    def guessLetter(self, letter: str) -> (str, str, int, bool):
+        """
+        Guess the provided letter, wrong guesses will be subtracted from the remaining guesses, correct guess will be added to the board where appropriate
+        :param letter: letter to be guessed
+        :return: a quadruple containing: the updated board, a string containing all used letters, the number of remaining guesses, a flag that is true if the guess was correct, otherwise false
+        """
+        correctFlag = self.playLetter(letter)
         # print("board:", self.board)
         # print(self.remainingGuesses, "guesses remaining")
         return self.board, self.usedLetters, self.remainingGuesses, correctFlag
@@ -48,14 +137,5 @@ class HangmanGame:
         :param word: the suspected secret word
         :return: a quadruple containing: the updated board, a string containing all used letters, the number of remaining guesses, a flag that is true if the guess was correct, otherwise false
         """
-        if word == self.secretWord:
-            # print("correct")
-            self.board = word
-            self.complete = True
-            # print("board:", self.board)
-            # print("you win")
-            return self.board, self.usedLetters, self.remainingGuesses, True
-        else:
-            self.remainingGuesses -= 1
-            return self.board, self.usedLetters, self.remainingGuesses, False
-            # print("incorrect")
+        correctFlag = self.playWord(word)
+        return self.board, self.usedLetters, self.remainingGuesses, correctFlag
@@ -1,5 +1,110 @@
+import collections
+import math
+
+import numpy
 import pandas
 
+from DictionaryIndex import DictionaryIndex
+from DictionaryTrie import DictionaryTrie
+from LetterStatistics import LetterStatistics
+
+wordListPasses = collections.Counter()  # passes made over the word list, by kind ("filter" or "statistics")
+profiler = None  # set to a Profiler to time the phases of every turn, see Profiler
+policyTable = None  # the PolicyTable the adaptive heuristic picks a heuristic for each turn from
+exactSolver = None  # set to an ExactSolver to play the rest of each game perfectly once few enough words are possible
+openingBook = None  # set to an OpeningBook to look the first guesses of its heuristic up instead of working them out
+indexTypes = (DictionaryIndex, DictionaryTrie)  # dictionary backends that find candidates without scanning the dataframe
+
+
+class CandidateState:
+    def __init__(self, board: str, usedLetters: str, dictionary, positions=None):
+        """
+        The possible words of one turn and everything derived from them. The filtering and the letter statistics are each done
+        at most once, when first needed, and are shared by every heuristic and by the single word check in getGuess
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :param dictionary: the dictionary the hangman word is believed to be from, either a dataframe, a DictionaryIndex or a DictionaryTrie
+        :param positions: the possible words as positions within the length group of the DictionaryIndex or DictionaryTrie, if they are already known
+        """
+        self.board = board
+        self.usedLetters = usedLetters
+        self.dictionary = dictionary
+        self._positions = positions
+        self._words = None
+        self._statistics = None
+
+    @property
+    def positions(self):
+        """
+        :return: positions of the possible words within the length group of a DictionaryIndex or DictionaryTrie
+        """
+        if self._positions is None:
+            wordListPasses["filter"] += 1
+            if profiler is not None:
+                profiler.start("filter")
+            self._positions = self.dictionary.findCandidatePositions(self.board, self.usedLetters)
+            if profiler is not None:
+                profiler.stop(self.dictionary.bucketSize(len(self.board)))
+        return self._positions
+
+    @property
+    def words(self) -> pandas.core.frame.DataFrame:
+        """
+        :return: all possible words that could be the secret word
+        """
+        if self._words is None:
+            if isinstance(self.dictionary, indexTypes):
+                self._words = self.dictionary.getWords(len(self.board), self.positions)
+            else:
+                self._words = getPossibleWords(self.board, self.usedLetters, self.dictionary)
+        return self._words
+
+    @property
+    def candidateCount(self) -> int:
+        """
+        :return: the number of possible words
+        """
+        if isinstance(self.dictionary, DictionaryTrie) and self._positions is None and self._statistics is not None:
+            return self._statistics.wordCount
+        if isinstance(self.dictionary, indexTypes):
+            return len(self.positions)
+        return len(self.words)
+
+    def getWord(self, i: int) -> str:
+        """
+        :param i: which of the possible words to get
+        :return: the i-th possible word, in dictionary order
+        """
+        if isinstance(self.dictionary, indexTypes):
+            return self.dictionary.getWord(int(self.dictionary.getRows(len(self.board), self.positions[i:i + 1])[0]))
+        return self.words.words.iloc[i]
+
+    @property
+    def statistics(self) -> LetterStatistics:
+        """
+        :return: the letter statistics of the possible words
+        """
+        if self._statistics is None:
+            wordListPasses["statistics"] += 1
+            if isinstance(self.dictionary, DictionaryTrie) and self._positions is None:
+                # the trie counts the statistics while it finds the words, so they never have to be listed
+                if profiler is not None:
+                    profiler.start("statistics")
+                self._statistics = self.dictionary.getBoardStatistics(self.board, self.usedLetters)
+            elif isinstance(self.dictionary, indexTypes):
+                positions = self.positions
+                if profiler is not None:
+                    profiler.start("statistics")
+                self._statistics = self.dictionary.getStatistics(len(self.board), positions)
+            else:
+                words = self.words.words.tolist()
+                if profiler is not None:
+                    profiler.start("statistics")
+                self._statistics = LetterStatistics.fromWords(words)
+            if profiler is not None:
+                profiler.stop(self._statistics.wordCount)
+        return self._statistics
+
 
 def loadDictionary(filePath: str) -> pandas.core.frame.DataFrame:
     """
@@ -16,14 +121,64 @@ def loadDictionary(filePath: str) -> pandas.core.frame.DataFrame:
     return pandas.DataFrame(dictFrame)
 
 
-def getPossibleWords(board: str, usedLetters: str, dictionary: pandas.core.frame.DataFrame) -> pandas.core.frame.DataFrame:
+def loadDictionaryIndex(filePath: str) -> DictionaryIndex:
+    """
+    Loads a dictionary as a DictionaryIndex, memory-mapping it if it is a compiled dictionary file
+    :param filePath: dictionary text file where each line is another word, or a file written by compileDictionary
+    :return: the index of the dictionary
+    """
+    if DictionaryIndex.isCompiled(filePath):
+        return DictionaryIndex.load(filePath)
+    return DictionaryIndex(loadDictionary(filePath))
+
+
+def loadDictionaryTrie(filePath: str) -> DictionaryTrie:
+    """
+    Loads a dictionary txt file into a DictionaryTrie, the words are read the same way loadDictionary reads them but are never put in a dataframe
+    :param filePath: dictionary text file where each line is another word
+    :return: the trie of the dictionary
     """
-    Uses regular expressions to select all rows of the dictionary dataframe that match the boards size and content
+    with open(filePath) as word_file:
+        return DictionaryTrie([line.rstrip('\n').lower() for line in word_file])
+
+
+def compileDictionary(filePath: str, compiledFilePath: str):
+    """
+    Indexes a dictionary text file and writes it as a compiled dictionary that loadDictionaryIndex can memory-map
+    :param filePath: dictionary text file where each line is another word
+    :param compiledFilePath: the compiled dictionary file to write
+    """
+    DictionaryIndex(loadDictionary(filePath)).save(compiledFilePath)
+
+
+def indexDictionary(dictionary) -> DictionaryIndex:
+    """
+    Builds a DictionaryIndex for the dictionary so getPossibleWords can use set operations instead of a regex scan
+    :param dictionary: the dictionary dataframe, or an existing DictionaryIndex or DictionaryTrie which is returned unchanged
+    :return: the index of the dictionary
+    """
+    if isinstance(dictionary, indexTypes):
+        return dictionary
+    return DictionaryIndex(dictionary)
+
+
+def getPossibleWords(board: str, usedLetters: str, dictionary) -> pandas.core.frame.DataFrame:
+    """
+    Uses regular expressions to select all rows of the dictionary dataframe that match the boards size and content. If the dictionary has been indexed the index is used instead of the regex, with the same results
     :param board: the current state of the hangman game, used to find size and correct guesses
     :param usedLetters: list of letters that have been used already, both correct and incorrect
-    :param dictionary: the dictionary the hangman word is believed to be from
+    :param dictionary: the dictionary the hangman word is believed to be from, either a dataframe, a DictionaryIndex or a DictionaryTrie
     :return: all possible words that could be the secret word bases on the correct and incorrect guesses and size of the secret word
     """
+    wordListPasses["filter"] += 1
+    if profiler is not None:
+        profiler.start("filter")
+    if isinstance(dictionary, indexTypes):
+        possibleWords = dictionary.getPossibleWords(board, usedLetters)
+        if profiler is not None:
+            profiler.stop(dictionary.bucketSize(len(board)))
+        return possibleWords
+
     regex = "(?=\\b\\w{"+str(len(board))+"}\\b)"
 
     if len(usedLetters) > 0:
@@ -35,7 +190,22 @@ def getPossibleWords(board: str, usedLetters: str, dictionary: pandas.core.frame
                 regex += space
         regex += ")"
 
-    return dictionary[dictionary.words.str.match(regex)]
+    possibleWords = dictionary[dictionary.words.str.match(regex)]
+    if profiler is not None:
+        profiler.stop(len(dictionary))
+    return possibleWords
+
+
+def getLetterStatistics(words) -> LetterStatistics:
+    """
+    Computes the letter statistics that all of the rank heuristics are derived from
+    :param words: List of words to analyze, or a CandidateState whose cached statistics are used
+    :return: the letter statistics of the words
+    """
+    if isinstance(words, CandidateState):
+        return words.statistics
+    wordListPasses["statistics"] += 1
+    return LetterStatistics.fromWords(words.words.tolist())
 
 
 def findPossibleLetters(words: pandas.core.frame.DataFrame, usedLetters: str) -> list:
@@ -45,14 +215,7 @@ def findPossibleLetters(words: pandas.core.frame.DataFrame, usedLetters: str) ->
     :param usedLetters: list of letters that have been used already, both correct and incorrect
     :return: letters: list of remaining possible guesses
     """
-    letters = []
-    for word in words.values:
-        word = word[0]
-        for letter in word:
-            if letter not in letters and letter not in usedLetters:
-                letters.append(letter)
-
-    return letters
+    return [letter for letter in getLetterStatistics(words).letters if letter not in usedLetters]
 
 
 def findLetterTotals(words: pandas.core.frame.DataFrame) -> (list, int):
@@ -61,18 +224,10 @@ def findLetterTotals(words: pandas.core.frame.DataFrame) -> (list, int):
     :param words: List of words to analyze
     :return: totals, letterCount: dictionary containing all observed letters and their occurrence frequency, total number of letters counted
     """
-    totals = {}
-    letterCount = 0
-    for word in words.values:
-        word = word[0]
-        for letter in word:
-            letterCount += 1
-            if letter in totals:
-                totals[letter] = totals[letter] + 1
-            else:
-                totals[letter] = 1
+    statistics = getLetterStatistics(words)
+    totals = dict(zip(statistics.letters, statistics.letterTotals.tolist()))
 
-    return totals, letterCount
+    return totals, statistics.letterCount
 
 
 def rankPossibleGuessesByFrequency(board: str, usedLetters: str, possibleWords: pandas.core.frame.DataFrame) -> pandas.core.frame.DataFrame:
@@ -80,15 +235,14 @@ def rankPossibleGuessesByFrequency(board: str, usedLetters: str, possibleWords:
     Ranks the remaining possible letters (from the english alphabet) based on the frequency that they occur in the possible words
     :param board: the current state of the hangman game
     :param usedLetters: list of letters that have been used already, both correct and incorrect
-    :param possibleWords: list of words the hangman word is believed to be from/in
+    :param possibleWords: list of words the hangman word is believed to be from/in, or the CandidateState of the turn
     :return freqs: chance that each of the remaining un-guessed letters appear in the secret word
     """
-    results = findLetterTotals(possibleWords)
+    statistics = getLetterStatistics(possibleWords)
 
-    totals = results[0]
-    letterCount = results[1]
+    letterCount = statistics.letterCount
     freqs = {}
-    for k, v in totals.items():
+    for k, v in zip(statistics.letters, statistics.letterTotals.tolist()):
         if k not in usedLetters:  # if letter is not already used, add it to possible moves
             freqs[k] = v
         else:  # letter has already been guessed, remove it from the options
@@ -104,43 +258,15 @@ def rankPossibleGuessesByOccurrences(board: str, usedLetters: str, possibleWords
     Ranks the remaining possible letters by number of words they appear in
     :param board: the current state of the hangman game
     :param usedLetters: list of letters that have been used already, both correct and incorrect
-    :param possibleWords: list of words the hangman word is believed to be from/in
+    :param possibleWords: list of words the hangman word is believed to be from/in, or the CandidateState of the turn
     :return: occurrences: number of times each letter was present in a possible word
     """
-    letters = findPossibleLetters(possibleWords, usedLetters)
-    '''
-    occurrences = {}
-    for letter in letters:
-        count = 0
-        for word in possibleWords.values:
-            word = word[0]
-            if letter in word:
-                count += 1
-        occurrences[letter] = count
-
-    '''
-    '''
-    occurrences = {}
-    for word in possibleWords.values:
-        word = word[0]
-        for letter in letters:
-            if letter in word:
-                if letter in occurrences:
-                    occurrences[letter] = occurrences[letter] + 1
-                else:
-                    occurrences[letter] = 1
-    '''
+    statistics = getLetterStatistics(possibleWords)
+
     occurrences = {}
-    for word in possibleWords.values:
-        word = word[0]
-        seenLetters = ""  # list of characters already seen in the word so far
-        for letter in word:
-            if letter in letters and letter not in seenLetters:
-                seenLetters += letter
-                if letter in occurrences:
-                    occurrences[letter] = occurrences[letter] + 1
-                else:
-                    occurrences[letter] = 1
+    for letter, count in zip(statistics.letters, statistics.wordsContaining.tolist()):
+        if letter not in usedLetters:
+            occurrences[letter] = count
 
     return occurrences
 
@@ -150,19 +276,15 @@ def rankPossibleGuessesByAbsence(board: str, usedLetters: str, possibleWords: pa
     Ranks the remaining possible letters by number of words they do not appear in
     :param board: the current state of the hangman game
     :param usedLetters: list of letters that have been used already, both correct and incorrect
-    :param possibleWords: list of words the hangman word is believed to be from/in
+    :param possibleWords: list of words the hangman word is believed to be from/in, or the CandidateState of the turn
     :return: occurrences: number of times each letter was not present in a possible word
     """
-    letters = findPossibleLetters(possibleWords, usedLetters)
+    statistics = getLetterStatistics(possibleWords)
 
     absences = {}
-    for letter in letters:
-        count = 0
-        for word in possibleWords.values:
-            word = word[0]
-            if letter not in word:
-                count += 1
-        absences[letter] = count
+    for letter, count in zip(statistics.letters, statistics.wordsContaining.tolist()):
+        if letter not in usedLetters:
+            absences[letter] = statistics.wordCount - count
 
     return absences
 
@@ -172,17 +294,15 @@ def rankPossibleGuessesByAvgOccurrenceInWord(board: str, usedLetters: str, possi
     Ranks the remaining possible letters by the average number of times they appear on a word when they appear
     :param board: the current state of the hangman game
     :param usedLetters: list of letters that have been used already, both correct and incorrect
-    :param possibleWords: list of words the hangman word is believed to be from/in
+    :param possibleWords: list of words the hangman word is believed to be from/in, or the CandidateState of the turn
     :return: avgOccurrenceInWord: average number of times a letter appears in a word when it appears
     """
-    possibleLetters = findPossibleLetters(possibleWords, usedLetters)
-
-    letterCounts = findLetterTotals(possibleWords)[0]
-    occurrences = rankPossibleGuessesByOccurrences(board, usedLetters, possibleWords)
+    statistics = getLetterStatistics(possibleWords)
 
     avgOccurrenceInWord = {}
-    for letter in possibleLetters:
-        avgOccurrenceInWord[letter] = letterCounts[letter]/occurrences[letter]
+    for letter, total, count in zip(statistics.letters, statistics.letterTotals.tolist(), statistics.wordsContaining.tolist()):
+        if letter not in usedLetters:
+            avgOccurrenceInWord[letter] = total/count
 
     return avgOccurrenceInWord
 
@@ -192,40 +312,91 @@ def rankPossibleGuessesByPositionsInWord(board: str, usedLetters: str, possibleW
     Ranks the remaining possible letters by the number of different positions they appear in
     :param board: the current state of the hangman game
     :param usedLetters: list of letters that have been used already, both correct and incorrect
-    :param possibleWords: list of words the hangman word is believed to be from/in
+    :param possibleWords: list of words the hangman word is believed to be from/in, or the CandidateState of the turn
     :return: occurrenceInWord: number of different positions a word appears in
     """
-    positions = len(board)
-    oneHotEncodings = {}
-    for word in possibleWords.values:
-        position = 0
-        word = word[0]
-        for letter in word:
-            if letter in usedLetters:
-                continue
-            if letter in oneHotEncodings:
-                oneHotEncodings[letter][position] = oneHotEncodings[letter][position] + 1
-            else:
-                oneHotEncodings[letter] = [0 for i in range(0, positions)]
-                oneHotEncodings[letter][position] = oneHotEncodings[letter][position] + 1
-            position += 1
+    statistics = getLetterStatistics(possibleWords)
+    histogram = statistics.positionHistogram(usedLetters)
+
+    wordCount = statistics.wordCount
     ranks = {}
-    for k, v in oneHotEncodings.items():
+    for letter, v in zip(statistics.letters, histogram.tolist()):
+        if letter in usedLetters:
+            continue
         # ranks[k] = len([c for c in v if c > 0])/len(possibleWords.values)
-        ranks[k] = sum([c/len(possibleWords.values) for c in v if c > 0])*len([c for c in v if c > 0])/len(possibleWords.values)
+        ranks[letter] = sum([c/wordCount for c in v if c > 0])*len([c for c in v if c > 0])/wordCount
 
     return ranks
 
 
-def getGuess(heuristic: str, board: str, usedLetters: str, dictionary: pandas.core.frame.DataFrame) -> (str, str):
+def rankPossibleGuessesByEntropy(board: str, usedLetters: str, possibleWords: pandas.core.frame.DataFrame) -> pandas.core.frame.DataFrame:
+    """
+    Ranks the remaining possible letters by the information guessing them is expected to give. A guess splits the possible words into groups by the positions the letter would be revealed in (a miss being the group with none), the entropy of that split is the expected number of bits learned about the secret word
+    :param board: the current state of the hangman game
+    :param usedLetters: list of letters that have been used already, both correct and incorrect
+    :param possibleWords: list of words the hangman word is believed to be from/in, or the CandidateState of the turn
+    :return: entropies: expected information gain, in bits, of guessing each letter
+    """
+    statistics = getLetterStatistics(possibleWords)
+
+    entropies = {}
+    letters = [letter for letter in statistics.letters if letter not in usedLetters]
+    for letter, sizes in zip(letters, statistics.partitionSizes(usedLetters)):
+        probabilities = sizes / statistics.wordCount
+        entropies[letter] = float(-(probabilities * numpy.log2(probabilities)).sum())
+
+    return entropies
+
+
+def rankPossibleGuessesByMinimaxPartition(board: str, usedLetters: str, possibleWords: pandas.core.frame.DataFrame) -> pandas.core.frame.DataFrame:
+    """
+    Ranks the remaining possible letters by the largest group of possible words that could be left after guessing them, so the best guess is the one whose worst outcome leaves the fewest words. Letters with the same worst outcome are ranked by entropy
+    :param board: the current state of the hangman game
+    :param usedLetters: list of letters that have been used already, both correct and incorrect
+    :param possibleWords: list of words the hangman word is believed to be from/in, or the CandidateState of the turn
+    :return: ranks: negated size of the largest group, plus the entropy scaled to less than one
+    """
+    statistics = getLetterStatistics(possibleWords)
+
+    ranks = {}
+    letters = [letter for letter in statistics.letters if letter not in usedLetters]
+    for letter, sizes in zip(letters, statistics.partitionSizes(usedLetters)):
+        probabilities = sizes / statistics.wordCount
+        entropy = float(-(probabilities * numpy.log2(probabilities)).sum())
+        ranks[letter] = -int(sizes.max()) + entropy/(math.log2(statistics.wordCount) + 1)
+
+    return ranks
+
+
+def getGuess(heuristic: str, board: str, usedLetters: str, dictionary) -> (str, str):
     """
     Retrieves a guess based on the heuristic, current board, used letters, and dictionary
     :param heuristic: the name of the heuristic to use
     :param board: the current state of the hangman game
     :param usedLetters: list of letters that have been used already, both correct and incorrect
-    :param dictionary: dictionary dataframe assumed to contain the secret word
-    :return: letter, word: the best letter to guess based on the given heuristic, the last remaining word if only one is left, otherwise an empty string
+    :param dictionary: dictionary dataframe assumed to contain the secret word, or the CandidateState of the turn which saves filtering the words again
+    :return: letter, word: the best letter to guess based on the given heuristic, the last remaining word if only one is left, otherwise an empty string. Once exactSolver can solve the turn its guess is returned instead
     """
+    if openingBook is not None and heuristic == openingBook.heuristic:
+        guess = openingBook.getGuess(board, usedLetters)
+        if guess is not None:
+            return guess
+    if profiler is not None:
+        profiler.start("rank")
+    if exactSolver is not None:
+        if not isinstance(dictionary, CandidateState):
+            dictionary = CandidateState(board, usedLetters, dictionary)
+        if exactSolver.canSolve(board, dictionary.candidateCount):
+            guess = exactSolver.getGuess(board, dictionary.words.words.tolist())
+            if profiler is not None:
+                profiler.stop(dictionary.candidateCount)
+            return guess
+    if heuristic == "adaptive":
+        if policyTable is None:
+            raise ValueError("the adaptive heuristic needs a policy table, see PolicyTable")
+        if not isinstance(dictionary, CandidateState):
+            dictionary = CandidateState(board, usedLetters, dictionary)
+        heuristic = policyTable.chooseHeuristic(board, dictionary.candidateCount)
     if heuristic == "frequency":
         letterRanks = rankPossibleGuessesByFrequency(board, usedLetters, dictionary)
     elif heuristic == "occurrence":
@@ -236,6 +407,10 @@ def getGuess(heuristic: str, board: str, usedLetters: str, dictionary: pandas.co
         letterRanks = rankPossibleGuessesByAvgOccurrenceInWord(board, usedLetters, dictionary)
     elif heuristic == "positionsInWord":
         letterRanks = rankPossibleGuessesByPositionsInWord(board, usedLetters, dictionary)
+    elif heuristic == "entropy":
+        letterRanks = rankPossibleGuessesByEntropy(board, usedLetters, dictionary)
+    elif heuristic == "minimaxPartition":
+        letterRanks = rankPossibleGuessesByMinimaxPartition(board, usedLetters, dictionary)
     else:
         print("Heuristics are:")
         print("frequency")
@@ -243,16 +418,24 @@ def getGuess(heuristic: str, board: str, usedLetters: str, dictionary: pandas.co
         print("absence")
         print("avgOccurrenceInWord")
         print("positionsInWord")
+        print("entropy")
+        print("minimaxPartition")
+        print("adaptive")
         letterRanks = rankPossibleGuessesByFrequency(board, usedLetters, dictionary)
     v = list(letterRanks.values())
     k = list(letterRanks.keys())
 
-    possibleWords = getPossibleWords(board, usedLetters, dictionary)
-    if possibleWords.size == 1:  # can guess word
-        word = possibleWords.words.iloc[0]
+    if isinstance(dictionary, CandidateState):
+        possibleWords = dictionary
+    else:
+        possibleWords = CandidateState(board, usedLetters, dictionary)
+    if possibleWords.candidateCount == 1:  # can guess word
+        word = possibleWords.getWord(0)
     else:
         word = ""
 
+    if profiler is not None:
+        profiler.stop()
     return k[v.index(max(v))], word
 
 
@@ -1,20 +1,47 @@
 import argparse
-
+import asyncio
+import csv
+import functools
+import math
+import os
+import statistics
+import subprocess
+import sys
+
+import numpy
 import pandas
+from DictionaryIndex import DictionaryIndex
+from DictionaryTrie import DictionaryTrie
+from ExactSolver import ExactSolver, defaultThreshold
+from GameTree import GameTree
+from LockstepSimulator import LockstepSimulator
 from HangmanGame import HangmanGame
+from IncrementalAggregator import IncrementalAggregator
+from SolverSession import SolverSession
+from StateCache import StateCache
+from StrategyCache import StrategyCache, hashDictionaryFile
+from TestCoordinator import TestCoordinator
 import OutFileEvaluator
+from OutFileWriter import OutFileWriter, formatGameResult, getColumnarFileName, outFileHeader
+from OpeningBook import OpeningBook, getBookFileName
+from PolicyTable import PolicyTable
+from Profiler import Profiler
 import HangmanSolver
-from multiprocessing import Pool
+from multiprocessing import Pool, shared_memory
 
 
-def testGame(word: str, words: pandas.core.frame.DataFrame, heuristic: str) -> (str, int, int, int, int, str):
+def testGame(word: str, words, heuristic: str, cache: StrategyCache = None, stateCache: StateCache = None) -> (str, int, int, int, int, str):
     """
     Runs a game of hangman with the provided settings and returns the details
     :param word: the secret word
-    :param words: the dictionary the secret is (believed) to be from
+    :param words: the dictionary the secret is (believed) to be from, either a dataframe, a DictionaryIndex or a DictionaryTrie
     :param heuristic: the strategy the function will use to make guesses
+    :param cache: optional StrategyCache for guesses made from previous runs, not used with a dataframe
+    :param stateCache: optional StateCache of the states of the games played before this one, only used with a DictionaryIndex
     :return: (the secret word, the length of the secret word, the total number of guesses used, the total number of correct guesses, the total number of incorrect guesses, the letters guesses in the order they were guessed)
     """
+    if HangmanSolver.profiler is not None:
+        HangmanSolver.profiler.startGame(heuristic, len(word), cache, stateCache)
     game = HangmanGame(word, 8)
 
     heuristicFlag = False
@@ -22,27 +49,44 @@ def testGame(word: str, words: pandas.core.frame.DataFrame, heuristic: str) -> (
     guessCount = 0
     correctGuessCount = 0
     incorrectGuessCount = 0
+    possibleWords = words
+    # an index lets a session narrow the words down with each guess's outcome, a dataframe is re-filtered turn by turn instead
+    session = SolverSession(words, heuristic, len(word), cache, stateCache) if isinstance(words, DictionaryIndex) else None
     while not game.complete:
         board = game.board
         usedLetters = game.usedLetters
-        words = HangmanSolver.getPossibleWords(board, usedLetters, words)
-
-        guess = HangmanSolver.getGuess(heuristic, board, usedLetters, words)
+        if session is not None:
+            possibleWords = session.getState()
+            guess = session.getGuess()
+        elif isinstance(words, DictionaryTrie):
+            # the trie is walked again each turn, pruned by the whole board, rather than narrowing a list of words
+            possibleWords = HangmanSolver.CandidateState(board, usedLetters, words)
+            if cache is not None:
+                guess = cache.getGuess(board, usedLetters, possibleWords)
+            else:
+                guess = HangmanSolver.getGuess(heuristic, board, usedLetters, possibleWords)
+        else:
+            possibleWords = HangmanSolver.getPossibleWords(board, usedLetters, possibleWords)
+            guess = HangmanSolver.getGuess(heuristic, board, usedLetters, possibleWords)
         # print(guess)
 
         # Alternating heuristic usage
         '''
         if heuristicFlag:
-            guess = HangmanSolver.getGuess("frequency", board, usedLetters, words)
+            guess = HangmanSolver.getGuess("frequency", board, usedLetters, possibleWords)
         else:
-            guess = HangmanSolver.getGuess("avgOccurrenceInWord", board, usedLetters, words)
+            guess = HangmanSolver.getGuess("avgOccurrenceInWord", board, usedLetters, possibleWords)
         heuristicFlag = not heuristicFlag
         '''
 
         if guess[1] != "":
-            result = game.guessWord(guess[1])[3]
+            result = game.playWord(guess[1])
+            if session is not None:
+                session.recordWordGuess(guess[1], result)
         else:
-            result = game.guessLetter(guess[0])[3]
+            result = game.playLetter(guess[0])
+            if session is not None:
+                session.recordLetterGuess(guess[0], game.board)
 
         if result:
             correctGuessCount += 1
@@ -51,6 +95,8 @@ def testGame(word: str, words: pandas.core.frame.DataFrame, heuristic: str) -> (
 
         guessCount += 1
 
+    if HangmanSolver.profiler is not None:
+        HangmanSolver.profiler.endGame(guessCount)
     return word, len(word), guessCount, correctGuessCount, incorrectGuessCount, game.usedLetters
 
 
@@ -77,48 +123,50 @@ def makeDictFromDict(words):
     print(sum)
 
 
-def runTestsOnDict(words: pandas.core.frame.DataFrame, heuristic: str, outFileName: str):
+def runTestsOnDict(words, heuristic: str, outFileName: str, cache: StrategyCache = None, aggregator: IncrementalAggregator = None,
+                   aggFileName: str = None):
     """
-    Runs the "testGame" function on every word in the dictionary. If the file already exists, it will pick up where it left off
-    :param words: the dictionary the secret is (believed) to be from
+    Runs the "testGame" function on every word in the dictionary. If the file already exists, only the games missing from it are played
+    :param words: the dictionary the secret is (believed) to be from, either a dataframe or a DictionaryIndex
     :param heuristic: the strategy the function will use to make guesses
     :param outFileName: name of the file that the program should append results to
+    :param cache: optional StrategyCache for guesses made from previous runs
+    :param aggregator: optional IncrementalAggregator of the outFile to publish the statistics of the games so far with while the run goes
+    :param aggFileName: name of the file the aggregator writes the statistics to
     """
-    try:
-        print("loading existing out file")
-        with open(outFileName, "r") as outFile:
-            # get the last line of the file, split it by , and grab the first element of the list
-            gameNumber = int(outFile.readlines()[-1].split(',')[0])
-    except(FileNotFoundError, ValueError):
-        print("creating out file")
-        with open(outFileName, "w") as outFile:
-            outFile.write("gameNumber,word,wordLength,guessCount,correctGuessCount,incorrectGuessCount,usedLetters")
-        gameNumber = 0
-    # game numbers start at one, so game x uses word x - 1
-    print("last word:", gameNumber, words.values[gameNumber-1])
-    print("starting at:", gameNumber+1, words.values[gameNumber])
+    dictionary = HangmanSolver.indexDictionary(words)
+    print("loading existing out file")
+    outFile = OutFileWriter(outFileName)
+    print(len(outFile.completedGames), "games already in the out file")
 
-    with open(outFileName, "a") as outFile:
-        wordVals = words.values[gameNumber:]
-
-        for word in wordVals:
-            gameNumber += 1
-            word = word[0]
-            gameResult = testGame(word, words, heuristic)
+    try:
+        for gameNumber in range(1, dictionary.wordCount + 1):
+            if gameNumber in outFile.completedGames:
+                continue
+            # game numbers start at one, so game x uses word x - 1
+            word = dictionary.getWord(gameNumber - 1)
+            gameResult = testGame(word, dictionary, heuristic, cache)
             print(gameResult)
-            outFile.write("\n" + str(gameNumber) + ',' + gameResult[0] + ',' + str(gameResult[1]) + ',' + str(gameResult[2]) + ',' + str(gameResult[3]) + ',' + str(gameResult[4]) + ',' + str(gameResult[5]))
+            outFile.write(gameNumber, gameResult)
+            if aggregator is not None and aggregator.isDue():
+                outFile.checkpoint()
+                aggregator.publish(aggFileName, final=False)
+    finally:
+        outFile.close()
 
 
-def runTestsOnSectionOfDict(words: pandas.core.frame.DataFrame, heuristic: str, outFileName: str, start: int, finish: int) -> str:
+def runTestsOnSectionOfDict(words, heuristic: str, outFileName: str, start: int, finish: int) -> str:
     """
     Runs the "testGame" function on every word in the range provided. The words are indexed in the order they appear in the dictionary. If the file already exists, it will pick up where it left off.
-    :param words: the dictionary the secret is (believed) to be from
+    :param words: the dictionary the secret is (believed) to be from, either a dataframe or a DictionaryIndex
     :param heuristic: the strategy the function will use to make guesses
     :param outFileName: name of the file that the program should append results to
     :param start: the index of the beginning of the range; includes this word
     :param finish: the index of the end of the range; this word will not be included
     :return: the completed game details each in its own line
     """
+    dictionary = HangmanSolver.indexDictionary(words)
+    words = dictionary.frame
     try:
         print("loading existing out file")
         with open(outFileName, "r") as outFile:
@@ -128,7 +176,7 @@ def runTestsOnSectionOfDict(words: pandas.core.frame.DataFrame, heuristic: str,
     except(FileNotFoundError, ValueError):
         print("creating out file")
         with open(outFileName, "w") as outFile:
-            outFile.write("gameNumber,word,wordLength,guessCount,correctGuessCount,incorrectGuessCount,usedLetters")
+            outFile.write(outFileHeader)
         #gameNumber = 0
     gameNumber = start
     # game numbers start at one, so game x uses word x - 1
@@ -136,7 +184,7 @@ def runTestsOnSectionOfDict(words: pandas.core.frame.DataFrame, heuristic: str,
     print("starting at:", start+1, words.values[start])
     print("stopping at:", finish, words.values[finish-1])
 
-    tests = ""
+    tests = []
     with open(outFileName, "a") as outFile:
         wordVals = words.values[gameNumber:]
 
@@ -145,26 +193,28 @@ def runTestsOnSectionOfDict(words: pandas.core.frame.DataFrame, heuristic: str,
             if gameNumber >= finish:
                 break
             word = word[0]
-            gameResult = testGame(word, words, heuristic)
+            gameResult = testGame(word, dictionary, heuristic)
             print(gameResult)
-            tests += "\n" + str(gameNumber) + ',' + gameResult[0] + ',' + str(gameResult[1]) + ',' + str(gameResult[2]) + ',' + str(gameResult[3]) + ',' + str(gameResult[4]) + ',' + str(gameResult[5])
-    return tests
+            tests.append("\n" + formatGameResult(gameNumber, gameResult))
+    return "".join(tests)
 
 
-def runTestsOnSectionMulti(words: pandas.core.frame.DataFrame, heuristic: str, outFileName: str, start: int, finish: int) -> str:
+def runTestsOnSectionMulti(words, heuristic: str, outFileName: str, start: int, finish: int) -> str:
     """
     Runs the "testGame" function on every word in the range provided. The words are indexed in the order they appear in the dictionary. If the file already exists, it will pick up where it left off.
-    :param words: the dictionary the secret is (believed) to be from
+    :param words: the dictionary the secret is (believed) to be from, either a dataframe or a DictionaryIndex
     :param heuristic: the strategy the function will use to make guesses
     :param outFileName: name of the file that the program should append results to
     :param start: the index of the beginning of the range; includes this word
     :param finish: the index of the end of the range; this word will not be included
     :return: the completed game details each in its own line
     """
+    dictionary = HangmanSolver.indexDictionary(words)
+    words = dictionary.frame
     print("starting chunk -> words", start, "to", finish,)
     gameNumber = start
     chunkLength = finish - start
-    tests = ""
+    tests = []
     lastProgress = 0
     with open(outFileName, "a") as outFile:
         wordVals = words.values[gameNumber:]
@@ -178,46 +228,444 @@ def runTestsOnSectionMulti(words: pandas.core.frame.DataFrame, heuristic: str, o
             if gameNumber >= finish:
                 break
             word = word[0]
-            gameResult = testGame(word, words, heuristic)
+            gameResult = testGame(word, dictionary, heuristic)
             #print(gameResult)
-            tests += "\n" + str(gameNumber) + ',' + gameResult[0] + ',' + str(gameResult[1]) + ',' + str(gameResult[2]) + ',' + str(gameResult[3]) + ',' + str(gameResult[4]) + ',' + str(gameResult[5])
+            tests.append("\n" + formatGameResult(gameNumber, gameResult))
     print("finished chunk -> words", start, "to", finish, )
-    return tests
+    return "".join(tests)
+
+
+workerDictionary = None  # the DictionaryIndex of a pool worker, read out of the shared memory block the parent made
+workerSharedMemory = None
+workerStateCacheBytes = 64 << 20  # memory budget of each of a worker's StateCaches, 0 to play without them
+workerStateCaches = {}  # heuristic -> the StateCache of the games a worker has played with it
 
 
-def runTestsOnDictMulti(words, heuristic, outFileName, processCount):
+def getWorkerStateCache(heuristic: str) -> StateCache:
+    """
+    :param heuristic: the strategy the worker's games are played with
+    :return: the StateCache the worker keeps for the heuristic across its batches, or None if workers play without one
+    """
+    if workerStateCacheBytes <= 0:
+        return None
+    if heuristic not in workerStateCaches:
+        workerStateCaches[heuristic] = StateCache(heuristic, workerStateCacheBytes)
+    return workerStateCaches[heuristic]
+
+
+def attachSharedDictionary(sharedMemoryName: str, profile: bool = False, policyFileName: str = None, exactSearch: tuple = None,
+                           bookFileName: str = None, stateCacheBytes: int = 64 << 20, traceAllocations: bool = False):
+    """
+    Pool initializer that lets a worker use the compiled dictionary the parent put in shared memory, without copying it
+    :param sharedMemoryName: name of the shared memory block holding the compiled dictionary
+    :param profile: true to profile the worker's games, the records are sent back with each batch
+    :param policyFileName: the policy table file for the adaptive heuristic, if one is used
+    :param exactSearch: (threshold, objective, maxBytes) of the ExactSolver to finish games with, if one is used
+    :param bookFileName: the opening book file to look the first guesses up in, if one is used
+    :param stateCacheBytes: memory budget of the worker's StateCache for each heuristic, 0 to play without one
+    :param traceAllocations: whether the worker's Profiler also records the memory each game allocates
+    """
+    global workerDictionary, workerSharedMemory, workerStateCacheBytes
+    workerStateCacheBytes = stateCacheBytes
+    workerSharedMemory = shared_memory.SharedMemory(name=sharedMemoryName)
+    workerDictionary = DictionaryIndex.fromBuffer(workerSharedMemory.buf)
+    if profile:
+        HangmanSolver.profiler = Profiler(traceAllocations)
+    if policyFileName is not None:
+        HangmanSolver.policyTable = PolicyTable.load(policyFileName)
+    if exactSearch is not None:
+        HangmanSolver.exactSolver = ExactSolver(*exactSearch)
+    if bookFileName is not None:
+        HangmanSolver.openingBook = OpeningBook.load(bookFileName)
+
+
+def runTestsOnBatch(heuristic: str, gameNumbers: list) -> (list, list, dict):
     """
-    Runs the "testGame" function on every word in the dictionary. Spawns the number of processes as defined by the param: processCount and distributes an evenly sized portion of the words dataframe for it to test
-    :param words: the dictionary the secret is (believed) to be from
+    Runs the "testGame" function on a batch of words in a pool worker, using the dictionary from attachSharedDictionary
+    :param heuristic: the strategy the function will use to make guesses
+    :param gameNumbers: the game numbers to play, game x uses word x - 1
+    :return: results, profileRecords, stateCacheStats: list of (game number, game details) pairs, the Profiler records of the games if the worker is profiling, and the worker's StateCache.getStats() so far or None if it has no cache
+    """
+    results = []
+    stateCache = getWorkerStateCache(heuristic)
+    for gameNumber in gameNumbers:
+        word = workerDictionary.getWord(gameNumber - 1)
+        results.append((gameNumber, testGame(word, workerDictionary, heuristic, stateCache=stateCache)))
+    profileRecords = HangmanSolver.profiler.takeRecords() if HangmanSolver.profiler is not None else []
+    return results, profileRecords, stateCache.getStats() if stateCache is not None else None
+
+
+def makeBatches(dictionary: DictionaryIndex, gameNumbers, batchSize: int) -> list:
+    """
+    Splits games into batches of words of the same length, most expensive first. A game costs roughly in proportion to how
+    many words share its length, since that is how many words its first guesses are chosen from
+    :param dictionary: the dictionary the words are from
+    :param gameNumbers: the game numbers to split up
+    :param batchSize: the most games in one batch
+    :return: list of lists of game numbers
+    """
+    gameNumbers = set(gameNumbers)
+    batches = []
+    for length, (rows, codes, bitsets) in dictionary.buckets.items():
+        lengthGames = [row + 1 for row in rows.tolist() if row + 1 in gameNumbers]
+        for i in range(0, len(lengthGames), batchSize):
+            batches.append((len(rows), lengthGames[i:i + batchSize]))
+    batches.sort(key=lambda batch: batch[0], reverse=True)
+    return [batch for cost, batch in batches]
+
+
+def runTestsOnDictMulti(words, heuristic: str, outFileName: str, processCount: int, batchSize: int = 64, policyFileName: str = None,
+                        exactSearch: tuple = None, bookFileName: str = None, aggregator: IncrementalAggregator = None, aggFileName: str = None,
+                        stateCacheBytes: int = 64 << 20):
+    """
+    Runs the "testGame" function on every word in the dictionary using the number of processes defined by the param: processCount.
+    The compiled dictionary is put in shared memory once for all of the processes, and the words are handed out in small
+    batches from a queue, most expensive first, so every process stays busy until the end. Results are streamed to the out
+    file as batches finish, and if the file already exists only the games missing from it are played
+    :param words: the dictionary the secret is (believed) to be from, either a dataframe or a DictionaryIndex
     :param heuristic: the strategy the function will use to make guesses
     :param outFileName: name of the file that the program should append results to
-    :param processCount: the number of processes to use in the multiprocessing (determines the size of the chunk each process will test
+    :param processCount: the number of processes to use in the multiprocessing
+    :param batchSize: the most words in one batch handed to a process
+    :param policyFileName: the policy table file the workers load for the adaptive heuristic
+    :param exactSearch: (threshold, objective, maxBytes) of the ExactSolver each worker finishes its games with
+    :param bookFileName: the opening book file the workers look the first guesses up in
+    :param aggregator: optional IncrementalAggregator of the outFile to publish the statistics of the games so far with while the run goes
+    :param aggFileName: name of the file the aggregator writes the statistics to
+    :param stateCacheBytes: memory budget of each worker's StateCache, which keeps the states of the games it played for the next ones, 0 to play without one
     """
-    wordCount = len(words)
-    chunkSize = int(wordCount/processCount)
+    dictionary = HangmanSolver.indexDictionary(words)
+    outFile = OutFileWriter(outFileName)
+    remainingGames = [gameNumber for gameNumber in range(1, dictionary.wordCount + 1) if gameNumber not in outFile.completedGames]
+    batches = makeBatches(dictionary, remainingGames, batchSize)
+    print("words", dictionary.wordCount)
+    print("games already in the out file", dictionary.wordCount - len(remainingGames))
+    print("batches", len(batches), "of up to", batchSize, "words")
+
+    compiled = dictionary.toBytes()
+    sharedMemory = shared_memory.SharedMemory(create=True, size=len(compiled))
+    workerCacheStats = {}  # process id -> the latest StateCache stats of the worker
+    try:
+        sharedMemory.buf[:len(compiled)] = compiled
+        del compiled
+        profile = HangmanSolver.profiler is not None
+        traceAllocations = profile and HangmanSolver.profiler.traceAllocations
+        with Pool(processes=processCount, initializer=attachSharedDictionary,
+                  initargs=(sharedMemory.name, profile, policyFileName, exactSearch, bookFileName, stateCacheBytes, traceAllocations)) as batchPool:
+            # this process is the only writer, results are appended in the order batches finish
+            for i, (batchResults, profileRecords, stateCacheStats) in enumerate(batchPool.imap_unordered(functools.partial(runTestsOnBatch, heuristic), batches)):
+                for gameNumber, gameResult in batchResults:
+                    outFile.write(gameNumber, gameResult)
+                if profile:
+                    HangmanSolver.profiler.records.extend(profileRecords)
+                if stateCacheStats is not None:
+                    workerCacheStats[stateCacheStats["pid"]] = stateCacheStats
+                print("finished batch", i + 1, "of", len(batches))
+                if aggregator is not None and aggregator.isDue():
+                    outFile.checkpoint()
+                    aggregator.publish(aggFileName, final=False)
+        for pid, stats in sorted(workerCacheStats.items()):
+            print("worker", pid, StateCache.formatStats(stats))
+    finally:
+        outFile.close()
+        sharedMemory.close()
+        sharedMemory.unlink()
+
+
+def runComparisonOnLength(heuristics: list, length: int) -> (int, dict):
+    """
+    Plays every word of a length group with each heuristic in a pool worker, using the dictionary from
+    attachSharedDictionary. The heuristics' game trees share their states, so a board state that several of them reach is
+    filtered and counted once
+    :param heuristics: the strategies to play the words with
+    :param length: the length of the words
+    :return: length, results: the length, and {heuristic: {dictionary row: the result testGame gives for the word}}
+    """
+    states = {}
+    results = {}
+    for heuristic in heuristics:
+        results[heuristic] = GameTree(workerDictionary, heuristic, states=states).playAll(length)
+    return length, results
 
-    print("words", wordCount)
-    print("chunk size", chunkSize)
 
-    # assign chunks to processes
-    chunkPool = Pool(processes=processCount)
-    parameters = []
-    for i in range(0, processCount):
-        start = i*chunkSize
-        if i < processCount - 1:
-            finish = (i+1)*chunkSize
-        else:
-            finish = wordCount+1
-        print("chunk:", i, "-> words", start, "to", finish)
-        parameters.append((words, heuristic, outFileName, start, finish))
-    print("assigning chunks to processes")
-    chunks = chunkPool.starmap(runTestsOnSectionMulti, parameters)
-    #print(chunks)
+def runStrategyComparison(words, heuristics: list, outFileNames: dict, processCount: int, policyFileName: str = None,
+                          exactSearch: tuple = None):
+    """
+    Plays every word in the dictionary with each of the heuristics in one process pool, a task per word length, largest
+    first. The compiled dictionary is put in shared memory once for every heuristic and worker, and within a length the
+    heuristics share the possible words and letter statistics of the states they have in common, starting with the empty
+    board. Each heuristic's results go to its own outFile, games already in it are not written again
+    :param words: the dictionary the secret is (believed) to be from, either a dataframe or a DictionaryIndex
+    :param heuristics: the strategies to compare
+    :param outFileNames: {heuristic: name of the file its results are appended to}
+    :param processCount: the number of processes to use in the multiprocessing
+    :param policyFileName: the policy table file the workers load for the adaptive heuristic
+    :param exactSearch: (threshold, objective, maxBytes) of the ExactSolver each worker finishes its games with
+    """
+    dictionary = HangmanSolver.indexDictionary(words)
+    outFiles = {heuristic: OutFileWriter(outFileNames[heuristic]) for heuristic in heuristics}
+    lengths = []
+    for length, (rows, codes, bitsets) in sorted(dictionary.buckets.items(), key=lambda bucket: len(bucket[1][0]), reverse=True):
+        if any([row + 1 not in outFiles[heuristic].completedGames for heuristic in heuristics for row in rows.tolist()]):
+            lengths.append(length)
+    print("comparing", len(heuristics), "strategies over", dictionary.wordCount, "words,", len(lengths), "word lengths left to play")
+
+    compiled = dictionary.toBytes()
+    sharedMemory = shared_memory.SharedMemory(create=True, size=len(compiled))
+    try:
+        sharedMemory.buf[:len(compiled)] = compiled
+        del compiled
+        with Pool(processes=processCount, initializer=attachSharedDictionary, initargs=(sharedMemory.name, False, policyFileName, exactSearch)) as lengthPool:
+            for i, (length, results) in enumerate(lengthPool.imap_unordered(functools.partial(runComparisonOnLength, heuristics), lengths)):
+                for heuristic, heuristicResults in results.items():
+                    for row in sorted(heuristicResults):
+                        if row + 1 not in outFiles[heuristic].completedGames:
+                            outFiles[heuristic].write(row + 1, heuristicResults[row])
+                    outFiles[heuristic].checkpoint()
+                print("finished words of length", length, "(" + str(i + 1), "of", str(len(lengths)) + ")")
+    finally:
+        for outFile in outFiles.values():
+            outFile.close()
+        sharedMemory.close()
+        sharedMemory.unlink()
+
+
+def allocateSample(strataSizes: dict, drawn: dict, deviations: dict, gameCount: int) -> dict:
+    """
+    Splits the next games of a sampled run between the word lengths in proportion to each length's word count times the
+    standard deviation of its wrong guesses, so lengths that vary more are sampled more (Neyman allocation)
+    :param strataSizes: maps word length to the number of words of that length
+    :param drawn: maps word length to the number of its words already played
+    :param deviations: maps word length to the standard deviation of its wrong guesses so far
+    :param gameCount: number of games to split
+    :return: maps word length to the number of its words to play next
+    """
+    remaining = {length: size - drawn[length] for length, size in strataSizes.items() if size > drawn[length]}
+    weights = {length: strataSizes[length]*deviations[length] for length in remaining}
+    if sum(weights.values()) == 0:
+        weights = {length: strataSizes[length] for length in remaining}
+    totalWeight = sum(weights.values())
+    shares = {length: gameCount*weight/totalWeight for length, weight in weights.items()}
+    allocation = {length: min(int(share), remaining[length]) for length, share in shares.items()}
+    # the games lost to rounding down go to the lengths with the largest leftover shares that still have words to play
+    while sum(allocation.values()) < gameCount:
+        unfilled = [length for length in remaining if allocation[length] < remaining[length]]
+        if len(unfilled) == 0:
+            break
+        for length in sorted(unfilled, key=lambda length: shares[length] - allocation[length], reverse=True)[:gameCount - sum(allocation.values())]:
+            allocation[length] += 1
+    return allocation
+
+
+def runSampledTests(words, heuristic: str, outFileName: str, aggFileName: str, sampleSize: int, targetWidth: float = None,
+                    confidence: float = 0.95, seed: int = 0, cache: StrategyCache = None, roundSize: int = 250, pilotSize: int = 30):
+    """
+    Estimates how a heuristic does over the whole dictionary by playing words drawn at random within each word length.
+    Every round the mean wrong guesses per game is estimated with its confidence interval, and the per length means and
+    standard deviations are written to the aggFile, so the run can be stopped once the interval is narrow enough. Games
+    already in the outFile are counted again rather than played, so a stopped run can be picked up with the same seed
+    :param words: the dictionary the secret is (believed) to be from, either a dataframe or a DictionaryIndex
+    :param heuristic: the strategy the function will use to make guesses
+    :param outFileName: name of the file the sampled games are appended to
+    :param aggFileName: name of the file the per length statistics of the sampled games are written to
+    :param sampleSize: the most games to play, the pilot included
+    :param targetWidth: the run stops once the confidence interval of the mean wrong guesses per game is this narrow, if given
+    :param confidence: confidence level of the interval
+    :param seed: seed of the order the words of each length are drawn in
+    :param cache: optional StrategyCache for guesses made from previous runs
+    :param roundSize: number of games played between estimates
+    :param pilotSize: number of words of every length played before the rest are allocated by how much each length varies,
+        fewer if the sample cannot hold that many of every length
+    """
+    dictionary = HangmanSolver.indexDictionary(words)
+    rng = numpy.random.default_rng(seed)
+    strata = {length: rng.permutation(rows).tolist() for length, (rows, codes, bitsets) in sorted(dictionary.buckets.items())}
+    strataSizes = {length: len(rows) for length, rows in strata.items()}
+    drawn = dict.fromkeys(strata, 0)
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence/2)
+
+    # a pilot of every length first, so every length has a mean and a deviation to allocate the rest by. A handful of
+    # words is not enough, a length whose first few games all go without a wrong guess would look like it never varies
+    # and never be sampled again. The pilot comes out of the sample, so it is cut down to fit, but not below two words
+    # of a length as it takes two to have a deviation
+    if sum([min(2, size) for size in strataSizes.values()]) > min(sampleSize, dictionary.wordCount):
+        raise ValueError("a sample of " + str(sampleSize) + " games is too small to play two words of each of the " + str(len(strataSizes)) + " word lengths")
+    pilotSize = max(2, min(pilotSize, sampleSize // len(strataSizes)))
+
+    dataDict = {}
+    # the writer cuts off a line that was being written when a run stopped, so only whole games are read back
+    outFile = OutFileWriter(outFileName)
+    previousResults = {}
+    with open(outFileName, "r") as outFileCSV:
+        for entry in csv.DictReader(outFileCSV, delimiter=','):
+            previousResults[int(entry["gameNumber"])] = (int(entry["wordLength"]), int(entry["guessCount"]), int(entry["correctGuessCount"]), int(entry["incorrectGuessCount"]))
+
+    def playRound(allocation: dict):
+        for length, count in allocation.items():
+            for row in strata[length][drawn[length]:drawn[length] + count]:
+                gameNumber = row + 1
+                if gameNumber in previousResults:
+                    OutFileEvaluator.addGameToDataDict(dataDict, *previousResults[gameNumber])
+                else:
+                    gameResult = testGame(dictionary.getWord(row), dictionary, heuristic, cache)
+                    OutFileEvaluator.addGameToDataDict(dataDict, gameResult[1], gameResult[2], gameResult[3], gameResult[4])
+                    outFile.write(gameNumber, gameResult)
+            drawn[length] += count
+
+    try:
+        playRound({length: min(pilotSize, size) for length, size in strataSizes.items()})
+        while True:
+            played = sum(drawn.values())
+            mean, halfWidth = OutFileEvaluator.getStratifiedEstimate(dataDict, strataSizes, 4, z)
+            guessMean, guessHalfWidth = OutFileEvaluator.getStratifiedEstimate(dataDict, strataSizes, 0, z)
+            print(played, "games: wrong guesses per game", round(mean, 4), "+/-", round(halfWidth, 4), "guesses per game", round(guessMean, 4), "+/-", round(guessHalfWidth, 4))
+            outFile.checkpoint()
+            OutFileEvaluator.writeAggDataFile(dataDict, aggFileName)
+            if played >= min(sampleSize, dictionary.wordCount) or (targetWidth is not None and 2*halfWidth <= targetWidth):
+                break
+            deviations = {}
+            for length, values in dataDict.items():
+                count = values[6]
+                deviations[length] = math.sqrt(max(values[5] - values[4]*values[4]/count, 0)/(count - 1)) if count > 1 else 0.0
+            playRound(allocateSample(strataSizes, drawn, deviations, min(roundSize, sampleSize - played)))
+    finally:
+        outFile.close()
+    print("estimated from", sum(drawn.values()), "of", dictionary.wordCount, "games at", str(confidence*100) + "% confidence")
+
+
+def runTestsOnDictTree(words, heuristic: str, outFileName: str, cache: StrategyCache = None):
+    """
+    Plays every word in the dictionary by walking a GameTree for each word length instead of running "testGame" on each word.
+    The results are the same as "testGame" gives, but every board state is only solved once
+    :param words: the dictionary the secret is (believed) to be from, either a dataframe or a DictionaryIndex
+    :param heuristic: the strategy the function will use to make guesses
+    :param outFileName: name of the file that the results are written to
+    :param cache: optional StrategyCache for guesses made from previous runs
+    """
+    dictionary = HangmanSolver.indexDictionary(words)
+    tree = GameTree(dictionary, heuristic, cache)
+    results = {}
+    for length in sorted(dictionary.buckets):
+        print("testing", len(dictionary.buckets[length][0]), "words of length", length)
+        results.update(tree.playAll(length))
+    print("solved", len(tree.nodes), "board states")
+
     with open(outFileName, "w") as outFile:
-        chunkStrings = ""
-        for chunk in chunks:
-            chunkStrings += chunk
-        outFile.write("gameNumber,word,wordLength,guessCount,correctGuessCount,incorrectGuessCount,usedLetters"+chunkStrings)
+        outFile.write(outFileHeader + "\n")
+        for row in sorted(results):
+            outFile.write(formatGameResult(row + 1, results[row]) + "\n")
+
+
+def runTestsOnDictLockstep(words, heuristic: str, outFileName: str, cache: StrategyCache = None, batchSize: int = 4096,
+                           aggregator: IncrementalAggregator = None, aggFileName: str = None):
+    """
+    Plays the dictionary's games in batches with a LockstepSimulator, so games that reach the same board state share its
+    guess. The results are the same as "testGame" gives, and games already in the outFile are skipped
+    :param words: the dictionary the secret is (believed) to be from, either a dataframe or a DictionaryIndex
+    :param heuristic: the strategy the function will use to make guesses
+    :param outFileName: name of the file that the results are appended to
+    :param cache: optional StrategyCache for guesses made from previous runs
+    :param batchSize: number of games to play at once, each batch is written and synced to disk when it completes
+    :param aggregator: optional IncrementalAggregator of the outFile to publish the statistics of the games so far with while the run goes
+    :param aggFileName: name of the file the aggregator writes the statistics to
+    """
+    dictionary = HangmanSolver.indexDictionary(words)
+    simulator = LockstepSimulator(dictionary, heuristic, cache)
+    writer = OutFileWriter(outFileName, batchSize)
+    gameNumbers = [gameNumber for gameNumber in range(1, dictionary.wordCount + 1) if gameNumber not in writer.completedGames]
+    print(dictionary.wordCount - len(gameNumbers), "games already in", outFileName)
+
+    for start in range(0, len(gameNumbers), batchSize):
+        results = simulator.playGames(gameNumbers[start:start + batchSize])
+        for gameNumber in sorted(results):
+            writer.write(gameNumber, results[gameNumber])
+        writer.checkpoint()
+        print("tested", min(start + batchSize, len(gameNumbers)), "of", len(gameNumbers), "games")
+        if aggregator is not None and aggregator.isDue():
+            aggregator.publish(aggFileName, final=False)
+    writer.close()
+    print("solved", simulator.solvedStates, "board states")
+
+
+def runDistributedTests(dictionaryFileName: str, wordCount: int, outFileNames: dict, host: str, port: int, localWorkers: int = 0,
+                        rangeSize: int = 500, leaseTimeout: float = 60, policyFileName: str = None, exactSearch: tuple = None) -> bool:
+    """
+    Coordinates a dictionary test played by TestWorkers, which can run on other machines (python TestWorker.py -d
+    <dictionary> -H <this machine> -p <port>) as well as in local processes started here. Each strategy's outFile is
+    appended to in game number order, and if it already exists only the games missing from it are played. If local
+    workers were started and they have all exited before every game is in, the test stops with the games left unplayed
+    :param dictionaryFileName: the dictionary the workers load, they need the same file
+    :param wordCount: the number of words in the dictionary
+    :param outFileNames: {strategy: outFile its results are appended to}
+    :param host: address to listen for workers on
+    :param port: port to listen for workers on
+    :param localWorkers: number of worker processes to start on this machine
+    :param rangeSize: the most games leased to a worker at once
+    :param leaseTimeout: seconds a lease is kept without word from its worker before it is given to another
+    :param policyFileName: the policy table file for the adaptive heuristic, sent to the workers
+    :param exactSearch: (threshold, objective, maxBytes) of the ExactSolver the workers finish their games with
+    :return: true if every game was played
+    """
+    settings = {"exactSearch": exactSearch, "policy": PolicyTable.load(policyFileName).toJson() if policyFileName is not None else None}
+    coordinator = TestCoordinator(wordCount, hashDictionaryFile(dictionaryFileName), outFileNames, rangeSize, leaseTimeout, settings)
+    # local workers are separate processes running TestWorker.py, just as they would on other machines
+    workerScript = os.path.join(os.path.dirname(os.path.abspath(__file__)), "TestWorker.py")
+    workers = [subprocess.Popen([sys.executable, workerScript, "-d", dictionaryFileName, "-H", host, "-p", str(port), "-n", "local-" + str(i + 1)])
+               for i in range(localWorkers)]
+    workersAlive = (lambda: any(worker.poll() is None for worker in workers)) if len(workers) > 0 else None
+    try:
+        asyncio.run(coordinator.serve(host, port, workersAlive=workersAlive))
+    finally:
+        for worker in workers:
+            if not coordinator.complete:
+                worker.terminate()
+            worker.wait()
+    return coordinator.complete
+
+
+def loadOpeningBook(bookFileName: str, dictionaryFileName: str, heuristic: str) -> OpeningBook:
+    """
+    Loads an opening book if it fits the run
+    :param bookFileName: the opening book file
+    :param dictionaryFileName: the dictionary file of the run
+    :param heuristic: the heuristic of the run
+    :return: the book, or None if there is no book or it was made from another dictionary or heuristic
+    """
+    if not os.path.exists(bookFileName):
+        print("no opening book at", bookFileName + ", make one with makeOpeningBook")
+        return None
+    book = OpeningBook.load(bookFileName)
+    if book.dictionaryHash != hashDictionaryFile(dictionaryFileName):
+        print("the opening book at", bookFileName, "was made from another version of the dictionary and is not used, make it again")
+        return None
+    if book.heuristic != heuristic:
+        print("the opening book at", bookFileName, "was made with", book.heuristic, "and is not used")
+        return None
+    policyHash = HangmanSolver.policyTable.policyHash if heuristic == "adaptive" and HangmanSolver.policyTable is not None else None
+    if book.policyHash != policyHash:
+        print("the opening book at", bookFileName, "was made with another policy table and is not used, make it again")
+        return None
+    print("opening book of", len(book.nodes), "states loaded from", bookFileName)
+    return book
+
+
+def aggregateOutFile(outFileName: str, aggFileName: str, outFormat: str):
+    """
+    Aggregates the results of a dictionary test, from its columnar file if the npz format was asked for
+    :param outFileName: name of the file the results were written to
+    :param aggFileName: name of the file the aggregated data is written to
+    :param outFormat: "csv" to aggregate the out file as it is, only reading the games added since it was last aggregated,
+        "npz" to aggregate the columnar .npz file the outFile's writer wrote next to it
+    """
+    if outFormat == "npz":
+        columnarFileName = getColumnarFileName(outFileName)
+        # modes that write the outFile without an OutFileWriter leave the columnar file behind it, it is converted from the outFile then
+        if not os.path.exists(columnarFileName) or os.path.getmtime(columnarFileName) < os.path.getmtime(outFileName):
+            OutFileEvaluator.convertOutFileToColumnar(outFileName, columnarFileName)
+            print("columnar results written at:", columnarFileName)
+        OutFileEvaluator.aggregateColumnarData(columnarFileName, aggFileName)
+    else:
+        IncrementalAggregator(outFileName).publish(aggFileName)
 
 
 if __name__ == '__main__':
@@ -226,27 +674,145 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Hangman heuristics and game playing")
     parser.add_argument("-m", "--mode", help="what to do with the input", type=str)
     parser.add_argument("-w", "--word", help="secret word, determines the board", type=str)
-    parser.add_argument("-d", "--dictionary", help="dictionary to search through", type=str)
+    parser.add_argument("-d", "--dictionary", help="dictionary to search through, a text file or a compiled dictionary", type=str)
+    parser.add_argument("-b", "--backend", help="index to load the dictionary into, the trie uses far less memory (solve and testDictionary only)", type=str, choices=["index", "trie"], default="index")
     parser.add_argument("-s", "--strategy", help="guessing heuristic to use", type=str)
-    parser.add_argument("-of", "--outFile", help="relative location/name of file where bulk dictionary testing results will be written/appended to", type=str)
+    parser.add_argument("--strategies", help="guessing heuristics to compare with compareStrategies", type=str, nargs="+")
+    parser.add_argument("--comparisonFile", help="csv file compareStrategies writes the comparison table to, in aggFiles by default", type=str)
+    parser.add_argument("-of", "--outFile", help="relative location/name of file where bulk dictionary testing results will be written/appended to (or the compiled dictionary, with compileDictionary)", type=str)
     parser.add_argument("-af", "--aggFile", help="relative location/name of file where aggregated data from the outFile will be written", type=str)
-    parser.add_argument("-pc", "--processCount", help="number of processes to spawn when using multiprocessing", type=str)
+    parser.add_argument("-ofmt", "--outFormat", help="csv, or npz to also write the results as a columnar file as they are played and aggregate from it", type=str, choices=["csv", "npz"], default="csv")
+    parser.add_argument("--host", help="address testDictionaryW/Distributed listens for workers on", type=str, default="127.0.0.1")
+    parser.add_argument("--port", help="port testDictionaryW/Distributed listens for workers on", type=int, default=8090)
+    parser.add_argument("--localWorkers", help="number of worker processes testDictionaryW/Distributed starts on this machine", type=int, default=0)
+    parser.add_argument("--rangeSize", help="most games testDictionaryW/Distributed leases to a worker at once", type=int, default=500)
+    parser.add_argument("--leaseTimeout", help="seconds testDictionaryW/Distributed keeps a lease without word from its worker", type=float, default=60)
+    parser.add_argument("-pc", "--processCount", help="number of processes to spawn when using multiprocessing", type=int, default=os.cpu_count())
+    parser.add_argument("-cf", "--cacheFile", help="SQLite file that caches guesses between runs with the same dictionary and strategy (not used with multiprocessing)", type=str)
+    parser.add_argument("-la", "--liveAggregate", help="seconds between publishing the statistics of the games so far to the aggFile while testDictionary, testDictionaryW/Multiprocessing or testDictionaryW/Lockstep runs", type=float)
+    parser.add_argument("-bs", "--batchSize", help="number of games played at once with testDictionaryW/Lockstep", type=int, default=4096)
+    parser.add_argument("--profile", help="time the phases of every game and print a summary per strategy and word length (testDictionary, testDictionaryW/Multiprocessing and solve)", action="store_true")
+    parser.add_argument("--profileAllocations", help="with --profile, also record the peak memory each game allocates, which slows the games down", action="store_true")
+    parser.add_argument("--profileFile", help="csv file the profile summary per strategy and word length is written to", type=str)
+    parser.add_argument("-pf", "--policyFile", help="policy table the adaptive strategy picks a heuristic for each turn from, written by learnPolicy", type=str)
+    parser.add_argument("--outFiles", help="heuristic=outFile pairs of past runs that learnPolicy learns from", type=str, nargs="+")
+    parser.add_argument("--sampleSize", help="most games learnPolicy replays from each outFile, or testDictionaryW/Sampling plays", type=int, default=20000)
+    parser.add_argument("--targetWidth", help="width of the confidence interval of the mean wrong guesses per game at which testDictionaryW/Sampling stops", type=float)
+    parser.add_argument("--confidence", help="confidence level of the intervals testDictionaryW/Sampling reports", type=float, default=0.95)
+    parser.add_argument("--seed", help="seed of the order testDictionaryW/Sampling draws words in", type=int, default=0)
+    parser.add_argument("-es", "--exactSearch", help="play the rest of each game perfectly once --exactThreshold or fewer words are possible, making the fewest wrong guesses on average or at worst", type=str, choices=["expected", "worst"])
+    parser.add_argument("--exactThreshold", help="candidate count at or below which --exactSearch takes over and the adaptive strategy stops scoring heuristics, stored in the policy table by learnPolicy", type=int, default=defaultThreshold)
+    parser.add_argument("--stateCacheSize", help="megabytes each testDictionaryW/Multiprocessing worker may keep the states of its games in for the next ones, 0 to turn it off", type=int, default=64)
+    parser.add_argument("--exactTableSize", help="megabytes the exact search may keep solved sets of words in", type=int, default=64)
+    parser.add_argument("-ob", "--openingBook", help="look the first guesses up in the opening book made for the dictionary and strategy by makeOpeningBook", action="store_true")
+    parser.add_argument("--bookFile", help="opening book file to make or use, next to the dictionary by default", type=str)
+    parser.add_argument("--bookPlies", help="number of guesses makeOpeningBook works out from the empty board", type=int, default=2)
+    parser.add_argument("--bookMinimum", help="fewest possible words a state needs for makeOpeningBook to put it in the book", type=int, default=100)
+    parser.add_argument("-cs", "--cacheSize", help="maximum number of guesses kept in the cache file", type=int, default=1000000)
     args = parser.parse_args()
 
-    dictFrame = HangmanSolver.loadDictionary(args.dictionary)
-    print("loaded", len(dictFrame), "words from", args.dictionary)
+    if args.mode == "compileDictionary":
+        compiledFileName = args.outFile if args.outFile is not None else os.path.splitext(args.dictionary)[0] + ".hdict"
+        HangmanSolver.compileDictionary(args.dictionary, compiledFileName)
+        parser.exit(0, "compiled " + args.dictionary + " to " + compiledFileName + "\n")
+
+    if args.backend == "trie":
+        if args.mode not in ["solve", "testDictionary"]:
+            parser.error("the trie backend only supports solve and testDictionary")
+        dictionary = HangmanSolver.loadDictionaryTrie(args.dictionary)
+        print("loaded", dictionary.wordCount, "words from", args.dictionary, "into a trie of", dictionary.getMemoryUsage(), "bytes")
+    else:
+        dictionary = HangmanSolver.loadDictionaryIndex(args.dictionary)
+        print("loaded", dictionary.wordCount, "words from", args.dictionary)
+    if args.mode == "testDictionaryW/Distributed" and (args.openingBook or args.cacheFile is not None):
+        parser.error("testDictionaryW/Distributed does not send --openingBook or --cacheFile to its workers")
+    OutFileWriter.columnarOutput = args.outFormat == "npz"
+    if args.profile:
+        HangmanSolver.profiler = Profiler(args.profileAllocations)
+    exactSearch = None
+    if args.exactSearch is not None:
+        exactSearch = (args.exactThreshold, args.exactSearch, args.exactTableSize << 20)
+        HangmanSolver.exactSolver = ExactSolver(*exactSearch)
+    if args.mode == "learnPolicy":
+        outFileNames = dict(pair.split("=", 1) for pair in args.outFiles)
+        policyTable = PolicyTable(PolicyTable.learn(dictionary, outFileNames, args.sampleSize), exactThreshold=args.exactThreshold)
+        policyTable.save(args.policyFile)
+        print("policy table of", len(policyTable.choices), "states written to", args.policyFile)
+    elif args.policyFile is not None:
+        HangmanSolver.policyTable = PolicyTable.load(args.policyFile)
+    elif args.strategy == "adaptive" or "adaptive" in (args.strategies or []):
+        parser.error("the adaptive strategy needs a --policyFile, see learnPolicy")
+    bookFileName = args.bookFile if args.bookFile is not None else getBookFileName(args.dictionary, str(args.strategy))
+    if args.mode == "makeOpeningBook":
+        openingBook = OpeningBook.make(HangmanSolver.indexDictionary(dictionary), args.dictionary, args.strategy, args.bookPlies, args.bookMinimum)
+        openingBook.save(bookFileName)
+        print("opening book of", len(openingBook.nodes), "states written to", bookFileName)
+    elif args.openingBook:
+        HangmanSolver.openingBook = loadOpeningBook(bookFileName, args.dictionary, args.strategy)
+    strategyCache = None
+    if args.cacheFile is not None:
+        strategyCache = StrategyCache(args.cacheFile, args.dictionary, args.strategy, args.cacheSize)
+    liveAggregator = None
+    if args.liveAggregate is not None and args.outFile is not None and args.aggFile is not None:
+        liveAggregator = IncrementalAggregator(args.outFile, interval=args.liveAggregate)
     if args.mode == "solve":
-        print(testGame(args.word, dictFrame, args.strategy))
+        gameResult = testGame(args.word, dictionary, args.strategy, strategyCache)
+        print(gameResult)
+        print("passes over the word list per turn:", {k: v / gameResult[2] for k, v in HangmanSolver.wordListPasses.items()})
     elif args.mode == "testDictionary":
         print("testing all words in", args.dictionary, "with", args.strategy)
-        runTestsOnDict(dictFrame, args.strategy, args.outFile)
+        runTestsOnDict(dictionary, args.strategy, args.outFile, strategyCache, liveAggregator, args.aggFile)
         print("tested all words in", args.dictionary, "with", args.strategy)
-        OutFileEvaluator.aggregateOutFileData(args.outFile, args.aggFile)
+        aggregateOutFile(args.outFile, args.aggFile, args.outFormat)
     elif args.mode == "testDictionaryW/Multiprocessing":
         print("testing all words in", args.dictionary, "with", args.strategy, "using multiprocessing")
-        runTestsOnDictMulti(dictFrame, args.strategy, args.outFile, args.processCount)
+        runTestsOnDictMulti(dictionary, args.strategy, args.outFile, args.processCount, policyFileName=args.policyFile, exactSearch=exactSearch,
+                            bookFileName=bookFileName if HangmanSolver.openingBook is not None else None, aggregator=liveAggregator, aggFileName=args.aggFile,
+                            stateCacheBytes=args.stateCacheSize << 20)
         print("tested all words in", args.dictionary, "with", args.strategy, "using multiprocessing")
-        OutFileEvaluator.aggregateOutFileData(args.outFile, args.aggFile)
+        aggregateOutFile(args.outFile, args.aggFile, args.outFormat)
+    elif args.mode == "testDictionaryW/GameTree":
+        print("testing all words in", args.dictionary, "with", args.strategy, "using a game tree")
+        runTestsOnDictTree(dictionary, args.strategy, args.outFile, strategyCache)
+        print("tested all words in", args.dictionary, "with", args.strategy, "using a game tree")
+        aggregateOutFile(args.outFile, args.aggFile, args.outFormat)
+    elif args.mode == "testDictionaryW/Lockstep":
+        print("testing all words in", args.dictionary, "with", args.strategy, "in lockstep batches")
+        runTestsOnDictLockstep(dictionary, args.strategy, args.outFile, strategyCache, args.batchSize, liveAggregator, args.aggFile)
+        print("tested all words in", args.dictionary, "with", args.strategy, "in lockstep batches")
+        aggregateOutFile(args.outFile, args.aggFile, args.outFormat)
+    elif args.mode == "testDictionaryW/Sampling":
+        print("estimating", args.strategy, "over", args.dictionary, "from a sample stratified by word length")
+        runSampledTests(dictionary, args.strategy, args.outFile, args.aggFile, args.sampleSize, args.targetWidth, args.confidence, args.seed, strategyCache)
+    elif args.mode == "testDictionaryW/Distributed":
+        # with --strategies the outFile and aggFile names are templates where {strategy} is replaced by each strategy's name
+        strategies = args.strategies if args.strategies is not None else [args.strategy]
+        outFileNames = {strategy: args.outFile.replace("{strategy}", strategy) for strategy in strategies}
+        print("testing all words in", args.dictionary, "with", ", ".join(strategies), "on distributed workers")
+        if not runDistributedTests(args.dictionary, dictionary.wordCount, outFileNames, args.host, args.port, args.localWorkers, args.rangeSize,
+                                   args.leaseTimeout, args.policyFile, exactSearch):
+            parser.exit(1, "the distributed test stopped before every game was played, run it again to play the rest\n")
+        print("tested all words in", args.dictionary, "with", ", ".join(strategies), "on distributed workers")
+        for strategy in strategies:
+            aggregateOutFile(outFileNames[strategy], args.aggFile.replace("{strategy}", strategy), args.outFormat)
+    elif args.mode == "compareStrategies":
+        if args.strategies is None:
+            parser.error("compareStrategies needs the --strategies to compare")
+        # the outFile and aggFile names are templates where {strategy} is replaced by each strategy's name
+        dictionaryName = os.path.splitext(os.path.basename(args.dictionary))[0]
+        outFileTemplate = args.outFile if args.outFile is not None else os.path.join("outFiles", "{strategy}_" + dictionaryName + ".csv")
+        aggFileTemplate = args.aggFile if args.aggFile is not None else os.path.join("aggFiles", "aggData_{strategy}_" + dictionaryName + ".csv")
+        outFileNames = {strategy: outFileTemplate.replace("{strategy}", strategy) for strategy in args.strategies}
+        print("comparing", ", ".join(args.strategies), "over", args.dictionary)
+        runStrategyComparison(dictionary, args.strategies, outFileNames, args.processCount, args.policyFile, exactSearch)
+        for strategy in args.strategies:
+            aggregateOutFile(outFileNames[strategy], aggFileTemplate.replace("{strategy}", strategy), args.outFormat)
+        comparisonFileName = args.comparisonFile if args.comparisonFile is not None else os.path.join("aggFiles", "comparison_" + dictionaryName + ".csv")
+        OutFileEvaluator.compareOutFiles(outFileNames, comparisonFileName)
+    if strategyCache is not None:
+        strategyCache.close()
+    if HangmanSolver.profiler is not None:
+        HangmanSolver.profiler.report(args.profileFile)
 
     #dictFrame = HangmanSolver.loadDictionary(r"dictionaries/Collins Scrabble Words (2019).txt")
     #print("loaded", len(dictFrame), "words\n")
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import math
+import os
+import time
+
+import OutFileEvaluator
+
+aggregatorVersion = 2
+# the bytes before the offset that are hashed to tell whether the outFile is still the one the state was read from
+checkBytes = 4096
+
+
+def getStateFileName(outFileName: str) -> str:
+    """
+    :param outFileName: the outFile that is aggregated
+    :return: the file the aggregation state of the outFile is kept in, next to it
+    """
+    return os.path.splitext(outFileName)[0] + ".aggstate.json"
+
+
+class IncrementalAggregator:
+    def __init__(self, outFileName: str, stateFileName: str = None, interval: float = 0):
+        """
+        Aggregates an outFile a piece at a time. The count, sum, running mean and sum of squared deviations of the guesses,
+        correct guesses and wrong guesses of every word length are kept up to date one game at a time, along with how far
+        into the outFile has been read. The means are worked out from the exact sums, so they come out as they always have,
+        and the deviations from the running moments (Welford's method), which unlike sums of squares never go negative. Both are
+        saved to a small state file next to the outFile, so aggregating it again after a run is resumed only reads the
+        games added since. If the outFile was rewritten rather than appended to, it is read again from the start
+        :param outFileName: the outFile to aggregate
+        :param stateFileName: the file the state is saved to, next to the outFile by default
+        :param interval: the fewest seconds between two publishes that are not forced
+        """
+        self.outFileName = outFileName
+        self.stateFileName = stateFileName if stateFileName is not None else getStateFileName(outFileName)
+        self.interval = interval
+        # the first publish that is not forced waits for the interval, rather than going out before any game is played
+        self.lastPublish = time.monotonic()
+        self._reset()
+        if os.path.exists(self.stateFileName):
+            with open(self.stateFileName, "r") as stateFile:
+                state = json.load(stateFile)
+            if state["version"] == aggregatorVersion and state["offset"] <= self._fileSize() and state["check"] == self._check(state["offset"]):
+                self.offset = state["offset"]
+                self.check = state["check"]
+                self.moments = {int(length): values for length, values in state["moments"].items()}
+            else:
+                print("the outFile", outFileName, "changed since it was last aggregated, aggregating it from the start")
+
+    def _reset(self):
+        """
+        Forgets every game read so far
+        """
+        self.offset = 0
+        self.check = ""
+        self.moments = {}  # word length -> [count, sum, mean, M2 of guesses, sum, mean, M2 of correct guesses, sum, mean, M2 of wrong guesses]
+
+    def _fileSize(self) -> int:
+        """
+        :return: the size of the outFile in bytes, 0 if there is none
+        """
+        return os.path.getsize(self.outFileName) if os.path.exists(self.outFileName) else 0
+
+    def _check(self, offset: int) -> str:
+        """
+        :param offset: a byte offset into the outFile
+        :return: sha256 hex digest of the bytes before the offset, up to checkBytes of them, empty at the start of the file
+        """
+        if offset == 0:
+            return ""
+        with open(self.outFileName, "rb") as outFile:
+            outFile.seek(max(offset - checkBytes, 0))
+            return hashlib.sha256(outFile.read(min(offset, checkBytes))).hexdigest()
+
+    def addGame(self, wordLength: int, guesses: int, correctGuesses: int, wrongGuesses: int):
+        """
+        :param wordLength: the length of the secret word
+        :param guesses: the total number of guesses used
+        :param correctGuesses: the number of correct guesses
+        :param wrongGuesses: the number of incorrect guesses
+        """
+        values = self.moments.setdefault(wordLength, [0, 0, 0.0, 0.0, 0, 0.0, 0.0, 0, 0.0, 0.0])
+        values[0] += 1
+        count = values[0]
+        for i, value in ((1, guesses), (4, correctGuesses), (7, wrongGuesses)):
+            values[i] += value
+            delta = value - values[i + 1]
+            values[i + 1] += delta/count
+            values[i + 2] += delta*(value - values[i + 1])
+
+    def update(self, final: bool = True) -> int:
+        """
+        Reads the games added to the outFile since the last update
+        :param final: true if the outFile is no longer being written, so a last line without a line break is a whole game
+            (outFiles written before lines were terminated end this way), false to stop before it as it may still be being written
+        :return: the number of games read
+        """
+        if self._fileSize() < self.offset or (self.offset > 0 and self._check(self.offset) != self.check):
+            print("the outFile", self.outFileName, "was rewritten, aggregating it from the start")
+            self._reset()
+        if not os.path.exists(self.outFileName):
+            return 0
+        with open(self.outFileName, "rb") as outFile:
+            outFile.seek(self.offset)
+            content = outFile.read()
+        if not final:
+            content = content[:content.rfind(b"\n") + 1]
+        gameCount = 0
+        for line in content.decode("utf-8").split("\n"):
+            # blank lines carry no game, the line break before a line that was written after an unterminated one included
+            if line.strip() == "" or line.startswith("gameNumber,"):
+                continue
+            fields = line.split(',')
+            self.addGame(int(fields[2]), int(fields[3]), int(fields[4]), int(fields[5]))
+            gameCount += 1
+        if len(content) > 0:
+            self.offset += len(content)
+            self.check = self._check(self.offset)
+        return gameCount
+
+    def save(self):
+        """
+        Writes the state to the state file, replacing it in one step so a stopped run never leaves half of it behind
+        """
+        state = {"version": aggregatorVersion, "outFileName": self.outFileName, "offset": self.offset, "check": self.check,
+                 "moments": {str(length): values for length, values in sorted(self.moments.items())}}
+        with open(self.stateFileName + ".tmp", "w") as stateFile:
+            json.dump(state, stateFile)
+        os.replace(self.stateFileName + ".tmp", self.stateFileName)
+
+    def getStatistics(self) -> dict:
+        """
+        :return: maps word length to (avgGuesses, avgCorrectGuesses, avgWrongGuesses, stddevGuesses, stddevCorrectGuesses, stddevWrongGuesses), the deviations over the games read
+        """
+        statistics = {}
+        for length, (count, guesses, guessesMean, guessesM2, correct, correctMean, correctM2, wrong, wrongMean, wrongM2) in self.moments.items():
+            statistics[length] = (guesses/count, correct/count, wrong/count, math.sqrt(guessesM2/count), math.sqrt(correctM2/count), math.sqrt(wrongM2/count))
+        return statistics
+
+    def getTotals(self) -> (int, float, float, float):
+        """
+        Merges the moments of every word length into those of the whole outFile
+        :return: games, avgGuesses, avgWrongGuesses, stddevWrongGuesses over every game read
+        """
+        count, guesses, wrong, wrongMean, wrongM2 = 0, 0, 0, 0.0, 0.0
+        for values in self.moments.values():
+            lengthCount = values[0]
+            total = count + lengthCount
+            delta = values[8] - wrongMean
+            wrongMean += delta*lengthCount/total
+            wrongM2 += values[9] + delta*delta*count*lengthCount/total
+            guesses += values[1]
+            wrong += values[7]
+            count = total
+        if count == 0:
+            return 0, 0.0, 0.0, 0.0
+        return count, guesses/count, wrong/count, math.sqrt(wrongM2/count)
+
+    def isDue(self) -> bool:
+        """
+        :return: true if the interval has passed since the last publish
+        """
+        return time.monotonic() - self.lastPublish >= self.interval
+
+    def publish(self, aggDataFileName: str, force: bool = True, final: bool = True) -> bool:
+        """
+        Reads the new games, saves the state, prints the totals and writes the aggFile, if forced or if the interval has passed since the last publish
+        :param aggDataFileName: name of the file the aggregated data is written to
+        :param force: false to skip the publish if the last one was less than the interval ago
+        :param final: false while the outFile is still being written, see update
+        :return: true if it was published
+        """
+        if not force and not self.isDue():
+            return False
+        self.lastPublish = time.monotonic()
+        gameCount = self.update(final)
+        self.save()
+        games, avgGuesses, avgWrongGuesses, stddevWrongGuesses = self.getTotals()
+        print(games, "games aggregated,", gameCount, "new: guesses per game", round(avgGuesses, 4), "wrong guesses per game",
+              round(avgWrongGuesses, 4), "stddev", round(stddevWrongGuesses, 4))
+        OutFileEvaluator.writeAggStatistics(self.getStatistics(), aggDataFileName)
+        return True
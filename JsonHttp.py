@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+
+def checkRequest(request, fields: dict, optionalFields: dict = None) -> dict:
+    """
+    Checks the decoded body of a request before it is used, so a body of the wrong shape is turned away with a 400 rather
+    than failing somewhere inside the server
+    :param request: the decoded body of a request
+    :param fields: {name: type or tuple of types} of the fields the request must have
+    :param optionalFields: {name: type or tuple of types} of the fields the request may have
+    :return: the request
+    """
+    if not isinstance(request, dict):
+        raise ValueError("the body of the request is not a JSON object")
+    for name, fieldType in fields.items():
+        if name not in request:
+            raise ValueError("the request has no " + name)
+    for name, fieldType in list(fields.items()) + list((optionalFields or {}).items()):
+        # bool is an int to isinstance, but never a sensible number of anything in a request
+        if name in request and (not isinstance(request[name], fieldType) or (isinstance(request[name], bool) and fieldType is int)):
+            raise ValueError(name + " has the wrong type, " + type(request[name]).__name__)
+    return request
+
+
+async def serveConnection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, route):
+    """
+    Serves the HTTP requests of one connection, keeping it open between requests until the client closes it. Every request
+    gets a response with a status: 400 if it cannot be read or its body is not what the route expects, and 500 if the route
+    fails some other way. A request that could not be read closes the connection, as where it ends is unknown
+    :param reader: stream the requests are read from
+    :param writer: stream the responses are written to
+    :param route: function of method, path and decoded JSON body (None if there is no body) that returns the status and
+        the body of the response, and raises KeyError, ValueError or TypeError for a request it cannot answer
+    """
+    try:
+        while True:
+            requestLine = await reader.readline()
+            if requestLine == b"":
+                break
+            headers = {}
+            version = "HTTP/1.0"
+            requestRead = False
+            try:
+                method, path, version = requestLine.decode("latin-1").split()
+                while True:
+                    headerLine = await reader.readline()
+                    if headerLine in (b"\r\n", b"\n", b""):
+                        break
+                    name, value = headerLine.decode("latin-1").split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                requestRead = True
+                status, response = route(method, path, json.loads(body) if len(body) > 0 else None)
+            except (KeyError, ValueError, TypeError) as error:
+                status = "400 Bad Request"
+                response = {"error": repr(error)}
+                if not requestRead:
+                    # the rest of a malformed request cannot be told apart from the next one, so the connection is closed
+                    headers["connection"] = "close"
+            except (asyncio.IncompleteReadError, ConnectionError):
+                raise
+            except Exception as error:
+                print("failed to answer", requestLine.decode("latin-1").strip() + ":", repr(error))
+                status = "500 Internal Server Error"
+                response = {"error": repr(error)}
+                if not requestRead:
+                    headers["connection"] = "close"
+
+            responseBody = json.dumps(response).encode("utf-8")
+            keepAlive = headers.get("connection", "keep-alive" if version == "HTTP/1.1" else "close").lower() == "keep-alive"
+            writer.write(("HTTP/1.1 " + status + "\r\nContent-Type: application/json\r\nContent-Length: " + str(len(responseBody)) +
+                          "\r\nConnection: " + ("keep-alive" if keepAlive else "close") + "\r\n\r\n").encode("latin-1") + responseBody)
+            await writer.drain()
+            if not keepAlive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
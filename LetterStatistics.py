@@ -0,0 +1,115 @@
+import numpy
+
+
+class LetterStatistics:
+    def __init__(self, matrix: numpy.ndarray, alphabet: list):
+        """
+        Computes the letter statistics of a set of words in one batched pass, every rank heuristic in HangmanSolver is derived from these arrays
+        :param matrix: (word count, word length) matrix of letter codes, the code len(alphabet) pads out words that are shorter than the others
+        :param alphabet: the letter each code stands for
+        """
+        self.wordCount = matrix.shape[0]
+        padding = len(alphabet)
+
+        seen = numpy.zeros((self.wordCount, padding + 1), dtype=bool)
+        seen[numpy.arange(self.wordCount)[:, None], matrix] = True
+        present = numpy.flatnonzero(seen[:, :padding].any(axis=0))
+
+        # letters are relabeled in the order they are first seen when reading the words in order, which is the order the
+        # per-word loops this replaces inserted letters into their result dictionaries (and so decides ties between letters)
+        if len(present) > 0:
+            firstRows = seen[:, present].argmax(axis=0)
+            firstSeen = [(row, int(numpy.argmax(matrix[row] == code))) for row, code in zip(firstRows.tolist(), present.tolist())]
+            present = present[sorted(range(len(present)), key=firstSeen.__getitem__)]
+        remap = numpy.full(padding + 1, len(present), dtype=matrix.dtype)
+        remap[present] = numpy.arange(len(present))
+
+        self.letters = [alphabet[code] for code in present.tolist()]
+        self.matrix = remap[matrix]
+        self.presence = seen[:, present]
+        self.letterTotals = numpy.bincount(self.matrix.ravel(), minlength=len(present) + 1)[:len(present)]
+        self.letterCount = int(self.letterTotals.sum())
+        self.wordsContaining = self.presence.sum(axis=0)
+        self._revealPatterns = None
+
+    @staticmethod
+    def fromWords(words: list) -> "LetterStatistics":
+        """
+        Builds the code matrix for a list of words and computes its statistics
+        :param words: the words to analyze
+        :return: the statistics of the words
+        """
+        words = list(words)
+        lengths = numpy.fromiter(map(len, words), dtype=numpy.int64, count=len(words))
+        text = "".join(words)
+        if text.isascii():
+            codePoints = numpy.frombuffer(text.encode("ascii"), dtype=numpy.uint8)
+        else:
+            codePoints = numpy.frombuffer(text.encode("utf-32-le"), dtype=numpy.uint32)
+
+        present = numpy.flatnonzero(numpy.bincount(codePoints))
+        dtype = numpy.uint8 if len(present) < 255 else numpy.uint32
+        table = numpy.zeros(present[-1] + 1 if len(present) > 0 else 1, dtype=dtype)
+        table[present] = numpy.arange(len(present))
+        alphabet = [chr(codePoint) for codePoint in present.tolist()]
+
+        width = int(lengths.max()) if len(words) > 0 else 0
+        if len(words) > 0 and int(lengths.min()) == width:
+            matrix = table[codePoints].reshape(len(words), width)
+        else:
+            matrix = numpy.full((len(words), width), len(alphabet), dtype=dtype)
+            rows = numpy.repeat(numpy.arange(len(words)), lengths)
+            columns = numpy.arange(len(codePoints)) - numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+            matrix[rows, columns] = table[codePoints]
+
+        return LetterStatistics(matrix, alphabet)
+
+    def unusedMask(self, usedLetters: str) -> numpy.ndarray:
+        """
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: boolean array that is true for every letter (in self.letters order) that has not been used
+        """
+        return numpy.array([letter not in usedLetters for letter in self.letters], dtype=bool)
+
+    def positionHistogram(self, usedLetters: str) -> numpy.ndarray:
+        """
+        Counts how often each letter appears at each position. Positions only count letters that have not been used, the
+        same way rankPossibleGuessesByPositionsInWord always numbered them, so with no used letters these are the real positions
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: (letter, position) matrix of counts, used letters are all zero
+        """
+        unused = numpy.append(self.unusedMask(usedLetters), False)[self.matrix]
+        positions = numpy.cumsum(unused, axis=1) - 1
+        width = self.matrix.shape[1]
+        counts = numpy.bincount(self.matrix[unused].astype(numpy.int64) * width + positions[unused], minlength=len(self.letters) * width)
+        return counts.reshape(len(self.letters), width)
+
+    def revealPatterns(self) -> numpy.ndarray:
+        """
+        Guessing a letter splits the words into groups that would reveal it in the same positions, this gives those
+        positions as bitmasks so the groups can be found by sorting integers. Words can be at most 64 letters long
+        :return: (word, letter) matrix of bitmasks where bit p is set if the word has the letter at position p
+        """
+        if self._revealPatterns is None:
+            width = self.matrix.shape[1]
+            if width > 64:
+                raise ValueError("reveal patterns are limited to words of 64 letters")
+            patterns = numpy.zeros((self.wordCount, len(self.letters) + 1), dtype=numpy.uint64)
+            rows = numpy.arange(self.wordCount)
+            for position in range(0, width):
+                patterns[rows, self.matrix[:, position]] |= numpy.uint64(1 << position)
+            self._revealPatterns = patterns[:, :len(self.letters)]
+        return self._revealPatterns
+
+    def partitionSizes(self, usedLetters: str) -> list:
+        """
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: for every letter that has not been used (in self.letters order), the sizes of the groups guessing it would split the words into
+        """
+        unused = numpy.flatnonzero(self.unusedMask(usedLetters))
+        patterns = numpy.sort(self.revealPatterns()[:, unused], axis=0)
+        sizes = []
+        for column in patterns.T:
+            boundaries = numpy.flatnonzero(column[1:] != column[:-1]) + 1
+            sizes.append(numpy.diff(numpy.concatenate(([0], boundaries, [len(column)]))))
+        return sizes
@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy
+
+import HangmanSolver
+from HangmanGame import HangmanGame
+
+
+async def requestGuess(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: dict) -> dict:
+    """
+    Sends one guess request over an open keep-alive connection and reads the response
+    :param reader: stream of the connection to the server
+    :param writer: stream of the connection to the server
+    :param request: the body of the guess request
+    :return: the decoded body of the response
+    """
+    body = json.dumps(request).encode("utf-8")
+    writer.write(("POST /guess HTTP/1.1\r\nContent-Type: application/json\r\nContent-Length: " + str(len(body)) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    status = await reader.readline()
+    headers = {}
+    while True:
+        headerLine = await reader.readline()
+        if headerLine in (b"\r\n", b"\n", b""):
+            break
+        name, value = headerLine.decode("latin-1").split(":", 1)
+        headers[name.strip().lower()] = value.strip()
+    response = json.loads(await reader.readexactly(int(headers["content-length"])))
+    if not status.startswith(b"HTTP/1.1 200"):
+        raise RuntimeError(status.decode("latin-1").strip() + " " + str(response))
+    return response
+
+
+async def playGames(host: str, port: int, dictionaryFileName: str, heuristic: str, words: list, latencies: list):
+    """
+    Plays games on one connection, asking the server for every guess
+    :param host: address of the server
+    :param port: port of the server
+    :param dictionaryFileName: name of the dictionary on the server
+    :param heuristic: the strategy the server is asked to use
+    :param words: secret words still to be played, shared with the other connections
+    :param latencies: list the time of every request is appended to, in seconds
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    while len(words) > 0:
+        game = HangmanGame(words.pop(), 8)
+        # a game can only go wrong this many times if the server guesses letters the word does not have over and over
+        for turn in range(0, 64):
+            if game.complete:
+                break
+            start = time.perf_counter()
+            guess = await requestGuess(reader, writer, {"dictionary": dictionaryFileName, "heuristic": heuristic,
+                                                        "board": game.board, "usedLetters": game.usedLetters})
+            latencies.append(time.perf_counter() - start)
+            if guess["word"] != "":
+                game.playWord(guess["word"])
+            else:
+                game.playLetter(guess["letter"])
+    writer.close()
+
+
+async def runLoadTest(host: str, port: int, dictionaryFileName: str, heuristic: str, gameCount: int, connectionCount: int, seed: int):
+    """
+    Plays random words from the dictionary against a SolverServer over several connections and prints the request
+    latency percentiles and the throughput
+    :param host: address of the server
+    :param port: port of the server
+    :param dictionaryFileName: dictionary the server was started with, the secret words are picked from the same file
+    :param heuristic: the strategy the server is asked to use
+    :param gameCount: number of games to play
+    :param connectionCount: number of connections playing games at the same time
+    :param seed: seed for picking the secret words
+    """
+    dictionary = HangmanSolver.loadDictionaryIndex(dictionaryFileName)
+    rows = numpy.random.default_rng(seed).integers(0, dictionary.wordCount, gameCount)
+    words = [dictionary.getWord(row) for row in rows.tolist()]
+    latencies = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*[playGames(host, port, dictionaryFileName, heuristic, words, latencies) for connection in range(0, connectionCount)])
+    elapsed = time.perf_counter() - start
+
+    latencies = numpy.array(latencies)*1000
+    print("games", gameCount, "requests", len(latencies), "connections", connectionCount, "seconds", round(elapsed, 3))
+    print("latency ms p50", round(float(numpy.percentile(latencies, 50)), 3), "p99", round(float(numpy.percentile(latencies, 99)), 3),
+          "max", round(float(latencies.max()), 3))
+    print("requests/sec", round(len(latencies)/elapsed, 1), "games/sec", round(gameCount/elapsed, 1))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load test for SolverServer")
+    parser.add_argument("-d", "--dictionary", help="dictionary the server was started with", type=str, required=True)
+    parser.add_argument("-s", "--strategy", help="guessing heuristic to use", type=str, default="frequency")
+    parser.add_argument("-H", "--host", help="address of the server", type=str, default="127.0.0.1")
+    parser.add_argument("-p", "--port", help="port of the server", type=int, default=8080)
+    parser.add_argument("-g", "--games", help="number of games to play", type=int, default=1000)
+    parser.add_argument("-c", "--connections", help="number of connections playing at the same time", type=int, default=8)
+    parser.add_argument("--seed", help="seed for picking the secret words", type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(runLoadTest(args.host, args.port, args.dictionary, args.strategy, args.games, args.connections, args.seed))
@@ -0,0 +1,103 @@
+import numpy
+
+import HangmanSolver
+from DictionaryIndex import DictionaryIndex
+
+
+class LockstepSimulator:
+    def __init__(self, dictionary: DictionaryIndex, heuristic: str, cache=None):
+        """
+        Plays many games at once, one guess per game each round. Games that are in the same (length, board, used letters)
+        state are grouped, the group's guess is worked out once and its outcome is applied to every game in the group by
+        comparing their secret words' letter codes with the guessed letter all at once
+        :param dictionary: index of the dictionary the secret words are from
+        :param heuristic: the name of the heuristic to use
+        :param cache: optional StrategyCache to look guesses up in before working them out
+        """
+        self.dictionary = dictionary
+        self.heuristic = heuristic
+        self.cache = cache
+        self.solvedStates = 0
+        # dictionary dataframe row -> (length, position within the length group)
+        self.bucketPositions = {}
+        for length, (rows, codes, bitsets) in dictionary.buckets.items():
+            for position, row in enumerate(rows.tolist()):
+                self.bucketPositions[row] = (length, position)
+
+    def getGuess(self, board: str, usedLetters: str, positions: numpy.ndarray) -> (str, str):
+        """
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :param positions: the possible words as positions within the length group
+        :return: letter, word: the guess for the state, see HangmanSolver.getGuess
+        """
+        self.solvedStates += 1
+        state = HangmanSolver.CandidateState(board, usedLetters, self.dictionary, positions)
+        if self.cache is not None:
+            return self.cache.getGuess(board, usedLetters, state)
+        return HangmanSolver.getGuess(self.heuristic, board, usedLetters, state)
+
+    def playGames(self, gameNumbers: list) -> dict:
+        """
+        Plays the games with the given numbers until every one of them is complete
+        :param gameNumbers: numbers of the games to play, game x uses the word in row x - 1 of the dictionary
+        :return: dictionary mapping each game number to the result testGame gives for it
+        """
+        gameNumbers = list(gameNumbers)
+        secrets = numpy.zeros(len(gameNumbers), dtype=numpy.int64)
+        guessCounts = numpy.zeros(len(gameNumbers), dtype=numpy.int64)
+        correctGuessCounts = numpy.zeros(len(gameNumbers), dtype=numpy.int64)
+        incorrectGuessCounts = numpy.zeros(len(gameNumbers), dtype=numpy.int64)
+        results = {}
+
+        # (length, board, usedLetters) -> (possible words as positions within the length group, indices of the games in the state)
+        groups = {}
+        gamesByLength = {}
+        for game, gameNumber in enumerate(gameNumbers):
+            length, secrets[game] = self.bucketPositions[gameNumber - 1]
+            gamesByLength.setdefault(length, []).append(game)
+        for length, games in gamesByLength.items():
+            groups[(length, "_"*length, "")] = (numpy.arange(len(self.dictionary.buckets[length][0])), numpy.array(games, dtype=numpy.int64))
+
+        def finish(length: int, games: numpy.ndarray, usedLetters: str):
+            rows = self.dictionary.buckets[length][0]
+            for game in games.tolist():
+                word = self.dictionary.getWord(int(rows[secrets[game]]))
+                results[gameNumbers[game]] = (word, len(word), int(guessCounts[game]), int(correctGuessCounts[game]), int(incorrectGuessCounts[game]), usedLetters)
+
+        while len(groups) > 0:
+            nextGroups = {}
+            for (length, board, usedLetters), (positions, games) in groups.items():
+                codes = self.dictionary.buckets[length][1]
+                letter, word = self.getGuess(board, usedLetters, positions)
+                guessCounts[games] += 1
+
+                if word != "":
+                    # the word is only guessed when it is the last one possible, so it is the secret word of every game here
+                    correctGuessCounts[games] += 1
+                    finish(length, games, usedLetters)
+                    continue
+
+                # the revealed positions are packed into bytes so whole boards can be compared and grouped as single values
+                code = self.dictionary.letterCodes[letter]
+                packedWidth = (length + 7) // 8
+                gamePatterns = numpy.packbits(codes[secrets[games]] == code, axis=1).view("V" + str(packedWidth)).reshape(-1)
+                wordPatterns = numpy.packbits(codes[positions] == code, axis=1).view("V" + str(packedWidth)).reshape(-1)
+                patterns, inverse = numpy.unique(gamePatterns, return_inverse=True)
+                inverse = inverse.reshape(-1)
+
+                for group, pattern in enumerate(patterns):
+                    groupGames = games[inverse == group]
+                    revealed = numpy.unpackbits(numpy.frombuffer(pattern.tobytes(), dtype=numpy.uint8))[:length]
+                    if revealed.any():
+                        correctGuessCounts[groupGames] += 1
+                    else:
+                        incorrectGuessCounts[groupGames] += 1
+                    childBoard = "".join([letter if hit else space for space, hit in zip(board, revealed.tolist())])
+                    if "_" not in childBoard:
+                        finish(length, groupGames, usedLetters + letter)
+                    else:
+                        nextGroups[(length, childBoard, usedLetters + letter)] = (positions[wordPatterns == pattern], groupGames)
+            groups = nextGroups
+
+        return results
@@ -0,0 +1,130 @@
+import json
+import os
+
+import numpy
+
+import HangmanSolver
+from DictionaryIndex import DictionaryIndex
+from StrategyCache import hashDictionaryFile
+
+bookVersion = 1
+
+
+def getBookFileName(dictionaryFileName: str, heuristic: str) -> str:
+    """
+    :param dictionaryFileName: the dictionary file the book is made from
+    :param heuristic: the name of the heuristic the book is made with
+    :return: the file the book of the dictionary and heuristic is kept in, next to the dictionary
+    """
+    return os.path.splitext(dictionaryFileName)[0] + "." + heuristic + ".book.npz"
+
+
+class OpeningBook:
+    def __init__(self, heuristic: str, dictionaryHash: str, nodes: dict, positions: numpy.ndarray, policyHash: str = None):
+        """
+        The first guesses of every game, worked out ahead of time. Every game of a given length starts from the same empty
+        board, so the first few guesses of a heuristic only depend on how the earlier ones went. The book holds the guess
+        of each of those states and the positions of its possible words, so a turn found in the book costs a lookup
+        instead of a pass over the largest sets of words in the game
+        :param heuristic: the name of the heuristic the guesses were made with
+        :param dictionaryHash: sha256 hex digest of the dictionary file the book was made from
+        :param nodes: (board, usedLetters) -> (letter, word, start, end), letter and word are None for a state whose guess is not in the book, start and end are the slice of positions holding its possible words
+        :param positions: positions within their length group of the possible words of every state, one after the other
+        :param policyHash: PolicyTable.policyHash of the policy table the adaptive heuristic picked its guesses with, None for other heuristics
+        """
+        self.heuristic = heuristic
+        self.dictionaryHash = dictionaryHash
+        self.policyHash = policyHash
+        self.nodes = nodes
+        self.positions = positions
+        self.hits = 0
+
+    def getGuess(self, board: str, usedLetters: str) -> (str, str):
+        """
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: letter, word: the guess for the state as HangmanSolver.getGuess would make it, or None if the state's guess is not in the book
+        """
+        node = self.nodes.get((board, usedLetters))
+        if node is None or node[0] is None:
+            return None
+        self.hits += 1
+        return node[0], node[1]
+
+    def getPositions(self, board: str, usedLetters: str) -> numpy.ndarray:
+        """
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: the possible words of the state as positions within their length group, or None if the state is not in the book
+        """
+        node = self.nodes.get((board, usedLetters))
+        if node is None:
+            return None
+        return self.positions[node[2]:node[3]]
+
+    @staticmethod
+    def make(dictionary: DictionaryIndex, dictionaryFileName: str, heuristic: str, plies: int = 2, minimumCandidates: int = 100) -> "OpeningBook":
+        """
+        Plays the first plies of every word length's guess tree, splitting each state's words by the board the guess
+        would leave them with. States with fewer than minimumCandidates words are cheap to work out as they come and are
+        left out, which also keeps the book clear of the sets an ExactSolver takes over
+        :param dictionary: index of the dictionary
+        :param dictionaryFileName: the dictionary file the index was loaded from
+        :param heuristic: the name of the heuristic to use
+        :param plies: number of guesses to work out from the empty board
+        :param minimumCandidates: fewest possible words a state needs to be put in the book
+        :return: the book
+        """
+        nodes = {}
+        positionArrays = []
+        positionCount = 0
+        for length in sorted(dictionary.buckets):
+            rows, codes, bitsets = dictionary.buckets[length]
+            frontier = [("_"*length, "", numpy.arange(len(rows)))]
+            for ply in range(plies + 1):
+                nextFrontier = []
+                for board, usedLetters, positions in frontier:
+                    if len(positions) < minimumCandidates:
+                        continue
+                    letter, word = None, None
+                    if ply < plies:
+                        state = HangmanSolver.CandidateState(board, usedLetters, dictionary, positions)
+                        letter, word = HangmanSolver.getGuess(heuristic, board, usedLetters, state)
+                        if word == "":
+                            revealed = codes[positions] == dictionary.letterCodes[letter]
+                            patterns, groups = numpy.unique(revealed, axis=0, return_inverse=True)
+                            groups = groups.reshape(-1)
+                            for group, pattern in enumerate(patterns):
+                                childBoard = "".join([letter if hit else space for space, hit in zip(board, pattern.tolist())])
+                                if "_" in childBoard:
+                                    nextFrontier.append((childBoard, usedLetters + letter, positions[groups == group]))
+                    nodes[(board, usedLetters)] = (letter, word, positionCount, positionCount + len(positions))
+                    positionArrays.append(positions.astype(numpy.int32))
+                    positionCount += len(positions)
+                frontier = nextFrontier
+            print("booked", sum([1 for board, usedLetters in nodes if len(board) == length]), "states of length", length)
+        positions = numpy.concatenate(positionArrays) if len(positionArrays) > 0 else numpy.zeros(0, dtype=numpy.int32)
+        policyHash = HangmanSolver.policyTable.policyHash if heuristic == "adaptive" and HangmanSolver.policyTable is not None else None
+        return OpeningBook(heuristic, hashDictionaryFile(dictionaryFileName), nodes, positions, policyHash)
+
+    def save(self, fileName: str):
+        """
+        :param fileName: the .npz file to write the book to
+        """
+        header = {"version": bookVersion, "heuristic": self.heuristic, "dictionaryHash": self.dictionaryHash, "policyHash": self.policyHash,
+                  "nodes": [[board, usedLetters] + list(node) for (board, usedLetters), node in self.nodes.items()]}
+        numpy.savez(fileName, header=numpy.array(json.dumps(header)), positions=self.positions)
+
+    @staticmethod
+    def load(fileName: str) -> "OpeningBook":
+        """
+        :param fileName: a file written by OpeningBook.save
+        :return: the book
+        """
+        with numpy.load(fileName) as bookFile:
+            header = json.loads(str(bookFile["header"]))
+            positions = bookFile["positions"]
+        if header["version"] != bookVersion:
+            raise ValueError("opening book version " + str(header["version"]) + " is not supported, make it again")
+        nodes = {(board, usedLetters): (letter, word, start, end) for board, usedLetters, letter, word, start, end in header["nodes"]}
+        return OpeningBook(header["heuristic"], header["dictionaryHash"], nodes, positions, header.get("policyHash"))
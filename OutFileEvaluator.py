@@ -1,5 +1,9 @@
 import csv
 import math
+import os
+
+import numpy
+import pandas
 
 
 def aggregateOutFileData(outFileName: str, aggDataFileName: str):
@@ -26,11 +30,7 @@ def aggregateOutFileData(outFileName: str, aggDataFileName: str):
             totalAvgWrongGuesses += wrongGuesses/wordLength  # entry(5)
 
             # specific data
-            if wordLength in dataDict:
-                values = dataDict[wordLength]
-                dataDict[wordLength] = (values[0] + guesses, values[1] + guesses*guesses, values[2] + correctGuesses, values[3] + correctGuesses*correctGuesses, values[4] + wrongGuesses, values[5] + wrongGuesses*wrongGuesses, values[6] + 1)
-            else:
-                dataDict[wordLength] = (guesses, guesses*guesses, correctGuesses, correctGuesses*correctGuesses, wrongGuesses, wrongGuesses*wrongGuesses, 1)
+            addGameToDataDict(dataDict, wordLength, guesses, correctGuesses, wrongGuesses)
 
         avgCorrectGuessesPerLetter = totalAvgGuesses/entryCount  # how many correct guesses it takes to find the secret word per letter in the secret word
         avgGuessesPerLetter = totalAvgCorrectGuesses/entryCount  # how many guesses it takes to find the secret word per letter in the secret word
@@ -40,25 +40,167 @@ def aggregateOutFileData(outFileName: str, aggDataFileName: str):
         print("avgCorrectGuessesPerLetter", avgCorrectGuessesPerLetter)
         print("avgWrongGuessesPerLetter", avgWrongGuessesPerLetter)
 
-    aggDataFileLines = "wordLength,avgGuessesPerLetter,avgCorrectGuessesPerLetter,avgWrongGuessesPerLetter,stddevGuessesPerLetter,stddevCorrectGuessesPerLetter,stddevWrongGuessesPerLetter"
-    # find mean
-    means = {}
-    for k, v in sorted(dataDict.items()):
-        # print("\nFor words of length", k)
+    writeAggDataFile(dataDict, aggDataFileName)
+
+
+def addGameToDataDict(dataDict: dict, wordLength: int, guesses: int, correctGuesses: int, wrongGuesses: int):
+    """
+    Adds a game to the per word length sums the aggFile is made from
+    :param dataDict: maps word length to the tuple described in writeAggDataFile, updated in place
+    :param wordLength: the length of the secret word
+    :param guesses: the total number of guesses used
+    :param correctGuesses: the number of correct guesses
+    :param wrongGuesses: the number of incorrect guesses
+    """
+    if wordLength in dataDict:
+        values = dataDict[wordLength]
+        dataDict[wordLength] = (values[0] + guesses, values[1] + guesses*guesses, values[2] + correctGuesses, values[3] + correctGuesses*correctGuesses, values[4] + wrongGuesses, values[5] + wrongGuesses*wrongGuesses, values[6] + 1)
+    else:
+        dataDict[wordLength] = (guesses, guesses*guesses, correctGuesses, correctGuesses*correctGuesses, wrongGuesses, wrongGuesses*wrongGuesses, 1)
+
+
+def getStratifiedEstimate(dataDict: dict, strataSizes: dict, column: int, z: float) -> (float, float):
+    """
+    Estimates the mean per game over a whole dictionary from games sampled at random within each word length
+    :param dataDict: maps word length to the tuple described in writeAggDataFile, every length needs at least one game
+    :param strataSizes: maps word length to the number of words of that length in the dictionary
+    :param column: where the sum of the value to estimate is in the tuples, 0 for guesses, 2 for correct and 4 for wrong guesses, its sum of squares follows it
+    :param z: the standard normal quantile of the confidence level, 1.96 for 95%
+    :return: mean, halfWidth: the estimated mean and the half width of its confidence interval
+    """
+    wordCount = sum(strataSizes.values())
+    mean = 0.0
+    variance = 0.0
+    for length, size in strataSizes.items():
+        values = dataDict[length]
+        count = values[6]
+        weight = size/wordCount
+        mean += weight*values[column]/count
+        if count > 1:
+            sampleVariance = max(values[column + 1] - values[column]*values[column]/count, 0)/(count - 1)
+            # the finite population correction, a length group that has been played in full adds no uncertainty
+            variance += weight*weight*sampleVariance/count*(1 - count/size)
+    return mean, z*math.sqrt(variance)
 
+
+def writeAggDataFile(dataDict: dict, aggDataFileName: str):
+    """
+    Writes the per word length means and standard deviations
+    :param dataDict: maps word length to the tuple (sum of guesses, sum of squared guesses, sum of correct guesses, sum of squared correct guesses, sum of wrong guesses, sum of squared wrong guesses, game count)
+    :param aggDataFileName: name of the file the aggregated data is written to
+    """
+    statistics = {}
+    for k, v in dataDict.items():
         avgGuesses = v[0]/v[6]
         avgCorrectGuesses = v[2]/v[6]
         avgWrongGuesses = v[4]/v[6]
 
-        stddevGuesses = math.sqrt(v[1]/v[6]-avgGuesses*avgGuesses)
-        stddevCorrectGuesses = math.sqrt(v[3]/v[6]-avgCorrectGuesses*avgCorrectGuesses)
-        stddevWrongGuesses = math.sqrt(v[5]/v[6]-avgWrongGuesses*avgWrongGuesses)
+        # the mean of the squares less the square of the mean can come out a rounding error below zero when every game of
+        # a length is the same, which is a deviation of zero
+        stddevGuesses = math.sqrt(max(v[1]/v[6]-avgGuesses*avgGuesses, 0))
+        stddevCorrectGuesses = math.sqrt(max(v[3]/v[6]-avgCorrectGuesses*avgCorrectGuesses, 0))
+        stddevWrongGuesses = math.sqrt(max(v[5]/v[6]-avgWrongGuesses*avgWrongGuesses, 0))
+
+        statistics[k] = (avgGuesses, avgCorrectGuesses, avgWrongGuesses, stddevGuesses, stddevCorrectGuesses, stddevWrongGuesses)
 
-        aggDataFileLines += "\n" + str(k) + ',' + str(avgGuesses) + ',' + str(avgCorrectGuesses) + ',' + str(avgWrongGuesses) + ',' + str(stddevGuesses) + ',' + str(stddevCorrectGuesses) + ',' + str(stddevWrongGuesses)
+    writeAggStatistics(statistics, aggDataFileName)
 
-        means[k] = (avgGuesses, avgCorrectGuesses, avgWrongGuesses)
+
+def writeAggStatistics(statistics: dict, aggDataFileName: str):
+    """
+    :param statistics: maps word length to (avgGuesses, avgCorrectGuesses, avgWrongGuesses, stddevGuesses, stddevCorrectGuesses, stddevWrongGuesses)
+    :param aggDataFileName: name of the file the aggregated data is written to
+    """
+    aggDataFileLines = "wordLength,avgGuessesPerLetter,avgCorrectGuessesPerLetter,avgWrongGuessesPerLetter,stddevGuessesPerLetter,stddevCorrectGuessesPerLetter,stddevWrongGuessesPerLetter"
+    for k, v in sorted(statistics.items()):
+        aggDataFileLines += "\n" + str(k) + ''.join([',' + str(value) for value in v])
 
     with open(aggDataFileName, "w") as aggDataFile:
         aggDataFile.write(aggDataFileLines)
 
     print("agg data written at:", aggDataFileName)
+
+
+def writeColumnarFile(columnarFileName: str, columns: dict):
+    """
+    Writes game results as a columnar .npz file with typed integer columns, the usedLetters column is dictionary-encoded as
+    integer codes into an array of its distinct values. The file is replaced in one step, so it is never left half written
+    :param columnarFileName: name of the .npz file to write
+    :param columns: maps every outFile column name to a list or series of its values, in outFile order
+    """
+    usedLettersCodes, usedLettersValues = pandas.factorize(pandas.Series(columns["usedLetters"], dtype=object))
+    with open(columnarFileName + ".tmp", "wb") as columnarFile:
+        numpy.savez(columnarFile,
+                    gameNumber=numpy.asarray(columns["gameNumber"], dtype=numpy.int64),
+                    word=numpy.asarray(columns["word"], dtype=str),
+                    wordLength=numpy.asarray(columns["wordLength"], dtype=numpy.int32),
+                    guessCount=numpy.asarray(columns["guessCount"], dtype=numpy.int32),
+                    correctGuessCount=numpy.asarray(columns["correctGuessCount"], dtype=numpy.int32),
+                    incorrectGuessCount=numpy.asarray(columns["incorrectGuessCount"], dtype=numpy.int32),
+                    usedLettersCodes=usedLettersCodes.astype(numpy.int32),
+                    usedLettersValues=numpy.asarray(usedLettersValues, dtype=str))
+    os.replace(columnarFileName + ".tmp", columnarFileName)
+
+
+def convertOutFileToColumnar(outFileName: str, columnarFileName: str):
+    """
+    Converts an outFile to a columnar .npz file, see writeColumnarFile
+    :param outFileName: name of the outFile to convert
+    :param columnarFileName: name of the .npz file to write
+    """
+    outFrame = pandas.read_csv(outFileName, dtype={"word": str, "usedLetters": str}, keep_default_na=False)
+    writeColumnarFile(columnarFileName, {column: outFrame[column] for column in outFrame.columns})
+
+
+def aggregateColumnarData(columnarFileName: str, aggDataFileName: str):
+    """
+    Does what aggregateOutFileData does for a columnar file from convertOutFileToColumnar, with group-by reductions over
+    the columns instead of a loop over the rows. The aggFile it writes is identical
+    :param columnarFileName: name of the .npz file to aggregate
+    :param aggDataFileName: name of the file the aggregated data is written to
+    """
+    with numpy.load(columnarFileName) as columns:
+        wordLength = columns["wordLength"].astype(numpy.int64)
+        guesses = columns["guessCount"].astype(numpy.int64)
+        correctGuesses = columns["correctGuessCount"].astype(numpy.int64)
+        wrongGuesses = columns["incorrectGuessCount"].astype(numpy.int64)
+
+    print("avgGuessesPerLetter", (correctGuesses/wordLength).mean())
+    print("avgCorrectGuessesPerLetter", (guesses/wordLength).mean())
+    print("avgWrongGuessesPerLetter", (wrongGuesses/wordLength).mean())
+
+    # the per-length sums are whole numbers well below 2**53, so they are exact and the means and deviations come out exactly
+    # as aggregateOutFileData works them out
+    lengths, groups = numpy.unique(wordLength, return_inverse=True)
+    columnSums = []
+    for column in (guesses, guesses*guesses, correctGuesses, correctGuesses*correctGuesses, wrongGuesses, wrongGuesses*wrongGuesses):
+        columnSums.append(numpy.bincount(groups, weights=column, minlength=len(lengths)).astype(numpy.int64).tolist())
+    counts = numpy.bincount(groups, minlength=len(lengths)).tolist()
+
+    dataDict = {}
+    for i, length in enumerate(lengths.tolist()):
+        dataDict[length] = tuple(columnSum[i] for columnSum in columnSums) + (counts[i],)
+
+    writeAggDataFile(dataDict, aggDataFileName)
+
+
+def compareOutFiles(outFileNames: dict, comparisonFileName: str) -> pandas.core.frame.DataFrame:
+    """
+    Puts the results of several strategies over the same dictionary side by side, best average of wrong guesses first
+    :param outFileNames: {strategy: outFile of its run}
+    :param comparisonFileName: name of the csv file the comparison table is written to
+    :return: the comparison table, one row per strategy
+    """
+    rows = []
+    for strategy, outFileName in outFileNames.items():
+        outFrame = pandas.read_csv(outFileName, dtype={"word": str, "usedLetters": str}, keep_default_na=False)
+        wrongGuesses = outFrame.incorrectGuessCount
+        rows.append({"strategy": strategy, "games": len(outFrame),
+                     "avgGuesses": outFrame.guessCount.mean(), "avgCorrectGuesses": outFrame.correctGuessCount.mean(),
+                     "avgWrongGuesses": wrongGuesses.mean(), "stddevWrongGuesses": wrongGuesses.std(ddof=0),
+                     "maxWrongGuesses": wrongGuesses.max(), "gamesLost": int((wrongGuesses >= 8).sum())})
+    comparison = pandas.DataFrame(rows).set_index("strategy").sort_values("avgWrongGuesses")
+    comparison.to_csv(comparisonFileName)
+    print(comparison.to_string())
+    print("comparison written at:", comparisonFileName)
+    return comparison
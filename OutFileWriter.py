@@ -0,0 +1,114 @@
+import os
+
+import OutFileEvaluator
+
+outFileHeader = "gameNumber,word,wordLength,guessCount,correctGuessCount,incorrectGuessCount,usedLetters"
+
+
+def getColumnarFileName(outFileName: str) -> str:
+    """
+    :param outFileName: an outFile
+    :return: the columnar .npz file its writer writes next to it when OutFileWriter.columnarOutput is set
+    """
+    return os.path.splitext(outFileName)[0] + ".npz"
+
+
+def formatGameResult(gameNumber: int, gameResult: tuple) -> str:
+    """
+    :param gameNumber: the number of the game, game x uses word x - 1
+    :param gameResult: the game details as returned by testGame
+    :return: the comma separated line for the game, without a line break
+    """
+    return str(gameNumber) + ',' + gameResult[0] + ',' + str(gameResult[1]) + ',' + str(gameResult[2]) + ',' + str(gameResult[3]) + ',' + str(gameResult[4]) + ',' + str(gameResult[5])
+
+
+class OutFileWriter:
+    columnarOutput = False  # set to true for every writer to also write its games as a columnar file when it is closed
+
+    def __init__(self, outFileName: str, checkpointSize: int = 1000):
+        """
+        Appends game results to an outFile in batches. Every line is written with its line break and the file is fsync'd
+        after each batch, so a crash loses at most the batch in progress. Opening an existing file finds every game number
+        already in it, whatever order they were written in, so a run can resume with just the games that are missing.
+        If columnarOutput is set the games are also kept as columns, the ones already in the file included, and written as a
+        columnar file when the writer is closed, so the results never have to be read back from the outFile to get one
+        :param outFileName: name of the file that results are appended to, created if it does not exist
+        :param checkpointSize: number of results to buffer before they are written and synced to disk
+        """
+        self.outFileName = outFileName
+        self.checkpointSize = checkpointSize
+        self.completedGames = set()
+        self.pendingLines = []
+        self.columns = {column: [] for column in outFileHeader.split(",")} if self.columnarOutput else None
+
+        content = b""
+        if os.path.exists(outFileName):
+            with open(outFileName, "rb") as outFile:
+                content = outFile.read()
+        # anything after the last line break is a line that was being written when a run stopped (or the last line of a
+        # file written before lines were terminated), either way dropping it is safe because that game is just played again
+        if not content.startswith(outFileHeader.encode("utf-8")) and len(content) > 0:
+            raise ValueError(outFileName + " is not an outFile")
+        complete = content[:content.rfind(b"\n") + 1]
+        lines = complete.decode("utf-8").split("\n")[:-1]
+        if len(lines) == 0:
+            complete = (outFileHeader + "\n").encode("utf-8")
+        for line in lines[1:]:
+            self.completedGames.add(int(line.split(',')[0]))
+        if self.columns is not None:
+            for line in lines[1:]:
+                fields = line.split(',')
+                self._addColumns(int(fields[0]), (fields[1], int(fields[2]), int(fields[3]), int(fields[4]), int(fields[5]), fields[6]))
+
+        if content.startswith(complete) and len(complete) < len(content):
+            # cutting the partial line off in place never leaves the file without the results before it
+            os.truncate(outFileName, len(complete))
+        elif complete != content:
+            # there are no results yet, the header is written to a new file that replaces the old one in one step
+            with open(outFileName + ".tmp", "wb") as outFile:
+                outFile.write(complete)
+                outFile.flush()
+                os.fsync(outFile.fileno())
+            os.replace(outFileName + ".tmp", outFileName)
+        self.outFile = open(outFileName, "a", encoding="utf-8")
+
+    def _addColumns(self, gameNumber: int, gameResult: tuple):
+        """
+        :param gameNumber: the number of the game, game x uses word x - 1
+        :param gameResult: the game details as returned by testGame
+        """
+        self.columns["gameNumber"].append(gameNumber)
+        for column, value in zip(outFileHeader.split(",")[1:], gameResult):
+            self.columns[column].append(value)
+
+    def write(self, gameNumber: int, gameResult: tuple):
+        """
+        :param gameNumber: the number of the game, game x uses word x - 1
+        :param gameResult: the game details as returned by testGame
+        """
+        self.pendingLines.append(formatGameResult(gameNumber, gameResult) + "\n")
+        self.completedGames.add(gameNumber)
+        if self.columns is not None:
+            self._addColumns(gameNumber, gameResult)
+        if len(self.pendingLines) >= self.checkpointSize:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """
+        Writes the buffered results and syncs the file to disk
+        """
+        if len(self.pendingLines) > 0:
+            self.outFile.write("".join(self.pendingLines))
+            self.pendingLines = []
+        self.outFile.flush()
+        os.fsync(self.outFile.fileno())
+
+    def close(self):
+        """
+        Writes the buffered results and closes the file, then writes the columnar file if columnarOutput is set
+        """
+        self.checkpoint()
+        self.outFile.close()
+        if self.columns is not None:
+            OutFileEvaluator.writeColumnarFile(getColumnarFileName(self.outFileName), self.columns)
+            print("columnar results written at:", getColumnarFileName(self.outFileName))
@@ -0,0 +1,157 @@
+import csv
+import hashlib
+import json
+import math
+
+import numpy
+
+import ExactSolver
+from HangmanGame import HangmanGame
+from SolverSession import SolverSession
+
+# heuristics from cheapest to most expensive to score a turn with, measured with Benchmark.py
+heuristicCosts = ["frequency", "occurrence", "absence", "avgOccurrenceInWord", "positionsInWord", "entropy", "minimaxPartition"]
+
+
+def getFeatures(board: str, candidateCount: int) -> (int, int, int):
+    """
+    :param board: the current state of the hangman game
+    :param candidateCount: the number of words that are still possible
+    :return: length, sizeClass, revealedClass: the word length, the candidate count rounded down to a power of two, and the revealed quarter of the board
+    """
+    length = len(board)
+    revealed = length - board.count("_")
+    return length, int(math.log2(max(candidateCount, 1))), revealed*4//max(length, 1)
+
+
+class PolicyTable:
+    def __init__(self, cells: dict, tolerance: float = 0.02, minimumSamples: int = 20, exactThreshold: int = ExactSolver.defaultThreshold):
+        """
+        Picks a heuristic for every turn from how each heuristic did in past runs from similar states. A state is described
+        by its word length, the size of its candidate set and how much of the board is revealed, and each heuristic is
+        scored by the average number of wrong guesses games made from such states until they ended. The cheapest heuristic
+        within the tolerance of the best one is used, so expensive scoring only runs where it pays off
+        :param cells: (length, sizeClass, revealedClass) -> {heuristic: [states seen, total wrong guesses still to come]}
+        :param tolerance: fraction a heuristic's score can be above the best one's and still be picked for being cheaper
+        :param minimumSamples: number of states a heuristic needs in a cell for its score to be trusted
+        :param exactThreshold: candidate count at or below which the heuristics are not scored at all
+        """
+        self.cells = cells
+        self.tolerance = tolerance
+        self.minimumSamples = minimumSamples
+        self.exactThreshold = exactThreshold
+        self.choices = {}
+        self.fallbacks = {}
+
+        # cells without enough samples fall back to the choice over every length with the same size and board classes
+        pooled = {}
+        for (length, sizeClass, revealedClass), scores in cells.items():
+            for heuristic, (count, total) in scores.items():
+                pooledScore = pooled.setdefault((sizeClass, revealedClass), {}).setdefault(heuristic, [0, 0])
+                pooledScore[0] += count
+                pooledScore[1] += total
+        for key, scores in cells.items():
+            choice = self._choose(scores)
+            if choice is not None:
+                self.choices[key] = choice
+        for key, scores in pooled.items():
+            choice = self._choose(scores)
+            if choice is not None:
+                self.fallbacks[key] = choice
+
+    def _choose(self, scores: dict) -> str:
+        """
+        :param scores: {heuristic: [states seen, total wrong guesses still to come]} of one cell
+        :return: the cheapest heuristic whose average is within the tolerance of the best, or None if no heuristic has enough samples
+        """
+        averages = {heuristic: total/count for heuristic, (count, total) in scores.items() if count >= self.minimumSamples}
+        if len(averages) == 0:
+            return None
+        best = min(averages.values())
+        for heuristic in sorted(averages, key=lambda name: heuristicCosts.index(name) if name in heuristicCosts else len(heuristicCosts)):
+            if averages[heuristic] <= best*(1 + self.tolerance):
+                return heuristic
+
+    def chooseHeuristic(self, board: str, candidateCount: int) -> str:
+        """
+        :param board: the current state of the hangman game
+        :param candidateCount: the number of words that are still possible
+        :return: the heuristic to guess with
+        """
+        if candidateCount <= self.exactThreshold:
+            return heuristicCosts[0]
+        length, sizeClass, revealedClass = getFeatures(board, candidateCount)
+        choice = self.choices.get((length, sizeClass, revealedClass))
+        if choice is None:
+            choice = self.fallbacks.get((sizeClass, revealedClass), heuristicCosts[0])
+        return choice
+
+    @staticmethod
+    def learn(dictionary, outFileNames: dict, sampleSize: int = 20000, seed: int = 0) -> dict:
+        """
+        Replays the games of past outFiles to find the state before every guess and how many wrong guesses were still to come
+        :param dictionary: index of the dictionary the outFiles were made with
+        :param outFileNames: {heuristic: outFile made with it}
+        :param sampleSize: most games replayed from each outFile
+        :param seed: seed for picking the games to replay
+        :return: the cells for a PolicyTable
+        """
+        cells = {}
+        for heuristic, outFileName in outFileNames.items():
+            with open(outFileName, "r") as outFileCSV:
+                games = [(entry["word"], int(entry["incorrectGuessCount"]), entry["usedLetters"]) for entry in csv.DictReader(outFileCSV, delimiter=',')]
+            if len(games) > sampleSize:
+                games = [games[i] for i in numpy.random.default_rng(seed).choice(len(games), sampleSize, replace=False).tolist()]
+            print("replaying", len(games), "games from", outFileName)
+
+            for word, incorrectGuessCount, usedLetters in games:
+                game = HangmanGame(word, 8)
+                session = SolverSession(dictionary, heuristic, len(word))
+                wrongGuesses = 0
+                for letter in usedLetters:
+                    scores = cells.setdefault(getFeatures(game.board, session.candidateCount), {}).setdefault(heuristic, [0, 0])
+                    scores[0] += 1
+                    scores[1] += incorrectGuessCount - wrongGuesses
+                    if not game.playLetter(letter):
+                        wrongGuesses += 1
+                    session.recordLetterGuess(letter, game.board)
+        return cells
+
+    @property
+    def policyHash(self) -> str:
+        """
+        :return: sha256 hex digest of the cells and settings, the same for tables that pick the same heuristics wherever they were loaded from
+        """
+        return hashlib.sha256(json.dumps(self.toJson(), sort_keys=True).encode("utf-8")).hexdigest()
+
+    def toJson(self) -> dict:
+        """
+        :return: the cells and settings as a JSON object
+        """
+        return {"tolerance": self.tolerance, "minimumSamples": self.minimumSamples, "exactThreshold": self.exactThreshold,
+                "cells": [[list(key), scores] for key, scores in sorted(self.cells.items())]}
+
+    @staticmethod
+    def fromJson(policy: dict) -> "PolicyTable":
+        """
+        :param policy: a JSON object made by toJson
+        :return: the policy table
+        """
+        cells = {tuple(key): scores for key, scores in policy["cells"]}
+        return PolicyTable(cells, policy["tolerance"], policy["minimumSamples"], policy["exactThreshold"])
+
+    def save(self, fileName: str):
+        """
+        :param fileName: the JSON file to write the cells and settings to
+        """
+        with open(fileName, "w") as policyFile:
+            json.dump(self.toJson(), policyFile)
+
+    @staticmethod
+    def load(fileName: str) -> "PolicyTable":
+        """
+        :param fileName: a file written by PolicyTable.save
+        :return: the policy table
+        """
+        with open(fileName, "r") as policyFile:
+            return PolicyTable.fromJson(json.load(policyFile))
@@ -0,0 +1,124 @@
+import time
+import tracemalloc
+
+import pandas
+
+# phases a turn's time is split into, "game" is whatever is left of a game's time once the others are taken out
+phases = ["filter", "statistics", "rank", "partition", "cache", "game"]
+
+
+class Profiler:
+    def __init__(self, traceAllocations: bool = False):
+        """
+        Records where the time of each game goes. HangmanSolver.profiler is None unless profiling is on, and every
+        instrumented function only calls start and stop when it is set, so turning profiling off costs one check per phase.
+        Phases nest, a phase's time does not include the phases started inside it
+        :param traceAllocations: also record the peak memory each game allocates with tracemalloc, off by default as it slows
+            every allocation down and so skews the times being measured
+        """
+        self.traceAllocations = traceAllocations
+        self.records = []  # one dictionary per game, see endGame
+        self._stack = []
+        self._phaseSeconds = dict.fromkeys(phases, 0.0)
+        self._phaseScanned = dict.fromkeys(phases, 0)
+        self._game = None
+        if traceAllocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def start(self, phase: str):
+        """
+        :param phase: the phase that is starting
+        """
+        self._stack.append([phase, time.perf_counter(), 0.0])
+
+    def stop(self, scanned: int = 0):
+        """
+        Ends the newest phase that was started
+        :param scanned: the number of candidate words the phase went over
+        """
+        phase, startTime, childSeconds = self._stack.pop()
+        seconds = time.perf_counter() - startTime
+        self._phaseSeconds[phase] += seconds - childSeconds
+        self._phaseScanned[phase] += scanned
+        if len(self._stack) > 0:
+            self._stack[-1][2] += seconds
+
+    def startGame(self, heuristic: str, length: int, cache=None, stateCache=None):
+        """
+        :param heuristic: the heuristic the game is played with
+        :param length: the length of the secret word
+        :param cache: the StrategyCache the game looks guesses up in, if any, its hits and misses during the game are recorded
+        :param stateCache: the StateCache the game looks states up in, if any, its hits and misses during the game are recorded
+        """
+        self._phaseSeconds = dict.fromkeys(phases, 0.0)
+        self._phaseScanned = dict.fromkeys(phases, 0)
+        allocated = 0
+        if self.traceAllocations:
+            tracemalloc.reset_peak()
+            allocated = tracemalloc.get_traced_memory()[0]
+        cacheCounts = (cache.hits, cache.misses) if cache is not None else (0, 0)
+        stateCacheCounts = (stateCache.hits, stateCache.misses) if stateCache is not None else (0, 0)
+        self._game = (heuristic, length, cache, cacheCounts, stateCache, stateCacheCounts, allocated, time.perf_counter())
+
+    def endGame(self, turns: int):
+        """
+        :param turns: the number of guesses the game took
+        """
+        heuristic, length, cache, cacheCounts, stateCache, stateCacheCounts, allocated, startTime = self._game
+        seconds = time.perf_counter() - startTime
+        record = {"heuristic": heuristic, "length": length, "games": 1, "turns": turns, "seconds": seconds}
+        self._phaseSeconds["game"] = seconds - sum(self._phaseSeconds.values())
+        for phase in phases:
+            record[phase + "Seconds"] = self._phaseSeconds[phase]
+        for phase in phases:
+            record[phase + "Scanned"] = self._phaseScanned[phase]
+        record["peakBytes"] = tracemalloc.get_traced_memory()[1] - allocated if self.traceAllocations else 0
+        record["strategyCacheHits"] = cache.hits - cacheCounts[0] if cache is not None else 0
+        record["strategyCacheMisses"] = cache.misses - cacheCounts[1] if cache is not None else 0
+        record["stateCacheHits"] = stateCache.hits - stateCacheCounts[0] if stateCache is not None else 0
+        record["stateCacheMisses"] = stateCache.misses - stateCacheCounts[1] if stateCache is not None else 0
+        self.records.append(record)
+        self._game = None
+
+    def takeRecords(self) -> list:
+        """
+        :return: the records made since the last call, which are then dropped, so a pool worker can send them back per batch
+        """
+        records = self.records
+        self.records = []
+        return records
+
+    def summarize(self, by: list) -> pandas.core.frame.DataFrame:
+        """
+        :param by: the record fields to group the games by, such as ["heuristic"] or ["heuristic", "length"]
+        :return: totals of each group, with the time of each phase as a share of the total, averages per game and per turn,
+            and the hit rate of the StrategyCache and of the StateCache, 0 for a cache that was not looked in
+        """
+        summary = pandas.DataFrame(self.records).groupby(by).sum(numeric_only=True)
+        for phase in phases:
+            summary[phase + "Share"] = summary[phase + "Seconds"]/summary["seconds"]
+        summary["msPerGame"] = summary["seconds"]*1000/summary["games"]
+        summary["scannedPerTurn"] = summary[[phase + "Scanned" for phase in phases]].sum(axis=1)/summary["turns"]
+        summary["peakKBPerGame"] = summary["peakBytes"]/summary["games"]/1024
+        for cacheName in ["strategyCache", "stateCache"]:
+            lookups = summary[cacheName + "Hits"] + summary[cacheName + "Misses"]
+            summary[cacheName + "HitRate"] = (summary[cacheName + "Hits"]/lookups.where(lookups > 0)).fillna(0)
+        return summary.drop(columns=["length"] if "length" not in by else [])
+
+    def report(self, fileName: str = None):
+        """
+        Prints the summary per heuristic and per heuristic and word length
+        :param fileName: optional csv file the per heuristic and word length summary is also written to
+        """
+        if len(self.records) == 0:
+            print("no games were profiled")
+            return
+        columns = (["games", "msPerGame"] + [phase + "Share" for phase in phases] + ["scannedPerTurn"] +
+                   (["peakKBPerGame"] if self.traceAllocations else []) + ["strategyCacheHitRate", "stateCacheHitRate"])
+        with pandas.option_context("display.width", 250, "display.max_columns", None, "display.float_format", "{:.3f}".format):
+            print(self.summarize(["heuristic"])[columns])
+            byLength = self.summarize(["heuristic", "length"])
+            print(byLength[columns])
+        if fileName is not None:
+            byLength.to_csv(fileName)
+            print("profile written to", fileName)
@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import collections
+
+import numpy
+
+import HangmanSolver
+import JsonHttp
+
+
+class SolverServer:
+    def __init__(self, dictionaryFileNames: list, cacheSize: int = 100000):
+        """
+        Long running solver that answers guess requests over HTTP with JSON bodies. Dictionaries are loaded and indexed once
+        when the server starts, and the candidate states of recent boards are kept in an LRU. A state that is not in the LRU
+        is narrowed down from the state before the last guess when that one is, which is the usual case for a client
+        playing a game turn by turn, so most requests never scan the dictionary
+        :param dictionaryFileNames: dictionary text files or compiled dictionaries to serve, requests name them the same way
+        :param cacheSize: maximum number of candidate states kept in the LRU
+        """
+        self.dictionaries = {}
+        for dictionaryFileName in dictionaryFileNames:
+            self.dictionaries[dictionaryFileName] = HangmanSolver.loadDictionaryIndex(dictionaryFileName)
+            print("loaded", self.dictionaries[dictionaryFileName].wordCount, "words from", dictionaryFileName)
+        self.cacheSize = cacheSize
+        self.states = collections.OrderedDict()  # (dictionary, board, usedLetters) -> (CandidateState, {heuristic: guess})
+        self.hits = 0
+        self.narrowed = 0
+        self.misses = 0
+        self.requestCount = 0
+
+    def getEntry(self, dictionaryFileName: str, board: str, usedLetters: str) -> (HangmanSolver.CandidateState, dict):
+        """
+        Finds the candidate state of a board in the LRU, making it if it is not there
+        :param dictionaryFileName: which of the loaded dictionaries the secret word is from
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: state, guesses: the candidate state and the guesses already made for it by heuristic
+        """
+        key = (dictionaryFileName, board, usedLetters)
+        entry = self.states.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.states.move_to_end(key)
+            return entry
+
+        dictionary = self.dictionaries[dictionaryFileName]
+        positions = None
+        letter = usedLetters[-1:]
+        if letter != "" and letter not in usedLetters[:-1] and len(board) in dictionary.buckets:
+            parentBoard = board.replace(letter, "_")
+            parent = self.states.get((dictionaryFileName, parentBoard, usedLetters[:-1]))
+            code = dictionary.letterCodes.get(letter)
+            if parent is not None and code is not None:
+                # the last guess only keeps the words that have the letter in exactly the spaces it revealed
+                self.narrowed += 1
+                parentPositions = parent[0].positions
+                revealed = numpy.array([space == letter for space in board], dtype=bool)
+                codes = dictionary.buckets[len(board)][1][parentPositions]
+                positions = parentPositions[((codes == code) == revealed).all(axis=1)]
+        if positions is None:
+            self.misses += 1
+
+        entry = (HangmanSolver.CandidateState(board, usedLetters, dictionary, positions), {})
+        self.states[key] = entry
+        if len(self.states) > self.cacheSize:
+            self.states.popitem(last=False)
+        return entry
+
+    def getGuess(self, request: dict) -> dict:
+        """
+        :param request: the decoded body of a guess request, with the board, usedLetters, heuristic and optionally the dictionary
+        :return: the body of the response, the guess as HangmanSolver.getGuess makes it and the number of possible words
+        """
+        JsonHttp.checkRequest(request, {"board": str, "heuristic": str}, {"usedLetters": str, "dictionary": str})
+        dictionaryFileName = request.get("dictionary", next(iter(self.dictionaries)))
+        if dictionaryFileName not in self.dictionaries:
+            raise ValueError("the dictionary " + dictionaryFileName + " is not served")
+        board = request["board"]
+        usedLetters = request.get("usedLetters", "")
+        heuristic = request["heuristic"]
+        state, guesses = self.getEntry(dictionaryFileName, board, usedLetters)
+        if heuristic not in guesses:
+            guesses[heuristic] = HangmanSolver.getGuess(heuristic, board, usedLetters, state)
+        letter, word = guesses[heuristic]
+        return {"letter": letter, "word": word, "candidateCount": state.candidateCount}
+
+    def getStats(self) -> dict:
+        """
+        :return: the body of a stats request
+        """
+        return {"dictionaries": {name: dictionary.wordCount for name, dictionary in self.dictionaries.items()},
+                "requests": self.requestCount, "cachedStates": len(self.states),
+                "hits": self.hits, "narrowed": self.narrowed, "misses": self.misses}
+
+    def route(self, method: str, path: str, request) -> (str, dict):
+        """
+        :param method: the method of the request
+        :param path: the path of the request
+        :param request: the decoded body of the request, None if it has none
+        :return: status, body of the response
+        """
+        self.requestCount += 1
+        if method == "POST" and path == "/guess":
+            return "200 OK", self.getGuess(request)
+        if method == "GET" and path == "/stats":
+            return "200 OK", self.getStats()
+        return "404 Not Found", {"error": "unknown request " + method + " " + path}
+
+    async def handleConnection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serves the HTTP requests of one connection, see JsonHttp.serveConnection
+        :param reader: stream the requests are read from
+        :param writer: stream the responses are written to
+        """
+        await JsonHttp.serveConnection(reader, writer, self.route)
+
+    async def serve(self, host: str, port: int):
+        """
+        Accepts connections until the process is stopped
+        :param host: address to listen on
+        :param port: port to listen on
+        """
+        server = await asyncio.start_server(self.handleConnection, host, port)
+        print("serving guesses on", host + ":" + str(port))
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Hangman solver server, POST /guess with {\"board\", \"usedLetters\", \"heuristic\", \"dictionary\"} and GET /stats")
+    parser.add_argument("-d", "--dictionary", help="dictionary to serve, a text file or a compiled dictionary (can be given more than once)", type=str, action="append", required=True)
+    parser.add_argument("-H", "--host", help="address to listen on", type=str, default="127.0.0.1")
+    parser.add_argument("-p", "--port", help="port to listen on", type=int, default=8080)
+    parser.add_argument("-cs", "--cacheSize", help="maximum number of candidate states kept in memory", type=int, default=100000)
+    args = parser.parse_args()
+
+    solverServer = SolverServer(args.dictionary, args.cacheSize)
+    try:
+        asyncio.run(solverServer.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print(solverServer.getStats())
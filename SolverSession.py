@@ -0,0 +1,162 @@
+import numpy
+
+import HangmanSolver
+from DictionaryIndex import DictionaryIndex
+from StateCache import StateCache
+
+
+class SolverSession:
+    def __init__(self, dictionary: DictionaryIndex, heuristic: str, wordLength: int, cache=None, stateCache: StateCache = None):
+        """
+        Plays one game from the solver's side. The possible words are kept between turns and narrowed down with only the
+        outcome of the newest guess, so each turn costs work in proportion to the words that are still possible
+        :param dictionary: index of the dictionary the secret word is believed to be from
+        :param heuristic: the name of the heuristic to use
+        :param wordLength: the length of the secret word
+        :param cache: optional StrategyCache to look guesses up in before working them out
+        :param stateCache: optional StateCache to look the possible words and guesses of states up in, shared by the games a worker plays
+        """
+        self.dictionary = dictionary
+        self.heuristic = heuristic
+        self.cache = cache
+        self.board = "_"*wordLength
+        self.usedLetters = ""
+        if wordLength in dictionary.buckets:
+            self.positions = numpy.arange(len(dictionary.buckets[wordLength][0]))
+            self.codes = dictionary.buckets[wordLength][1]
+        else:
+            self.positions = numpy.zeros(0, dtype=numpy.int64)
+            self.codes = numpy.zeros((0, wordLength), dtype=numpy.uint8)
+        self._state = None
+        # the state cache is dropped for the rest of the game after a wrong word guess, which removes a possible word without
+        # changing the board or used letters the states are keyed by
+        self.stateCache = stateCache if stateCache is not None and stateCache.heuristic == heuristic and len(self.positions) > 0 else None
+        self.cacheEntry = None
+        if self.stateCache is not None:
+            self.cacheEntry = self.stateCache.get(self.board, self.usedLetters)
+            if self.cacheEntry is None:
+                self.cacheEntry = self.stateCache.put(self.board, self.usedLetters, self.positions)
+
+    @property
+    def candidateCount(self) -> int:
+        """
+        :return: the number of words that are still possible
+        """
+        return len(self.positions)
+
+    def getState(self) -> HangmanSolver.CandidateState:
+        """
+        :return: the candidate state of the current turn
+        """
+        if self._state is None:
+            self._state = HangmanSolver.CandidateState(self.board, self.usedLetters, self.dictionary, self.positions)
+        return self._state
+
+    def getGuess(self) -> (str, str):
+        """
+        :return: letter, word: the guess for the current turn, see HangmanSolver.getGuess
+        """
+        if self.cacheEntry is not None:
+            if self.cacheEntry[1] is None:
+                self.cacheEntry[1] = self._makeGuess()
+            return self.cacheEntry[1]
+        return self._makeGuess()
+
+    def _makeGuess(self) -> (str, str):
+        """
+        :return: letter, word: the guess for the current turn, from the opening book, the exact search, the cache or the heuristic
+        """
+        openingBook = HangmanSolver.openingBook
+        if openingBook is not None and self.heuristic == openingBook.heuristic:
+            guess = openingBook.getGuess(self.board, self.usedLetters)
+            if guess is not None:
+                return guess
+        exactSolver = HangmanSolver.exactSolver
+        if exactSolver is not None and exactSolver.canSolve(self.board, self.candidateCount):
+            # the session drops a wrongly guessed word from the possible words, so the exact search may guess words here,
+            # which also keeps it away from the cache since a wrong word guess leaves the board and used letters as they were
+            if HangmanSolver.profiler is not None:
+                HangmanSolver.profiler.start("rank")
+            guess = exactSolver.getGuess(self.board, self.getState().words.words.tolist(), wordGuesses=True)
+            if HangmanSolver.profiler is not None:
+                HangmanSolver.profiler.stop(self.candidateCount)
+            return guess
+        if self.cache is not None:
+            return self.cache.getGuess(self.board, self.usedLetters, self.getState())
+        return HangmanSolver.getGuess(self.heuristic, self.board, self.usedLetters, self.getState())
+
+    def _keep(self, selected: numpy.ndarray):
+        """
+        Narrows the possible words down to the selected ones and starts a new turn
+        :param selected: boolean array over the possible words, true for the ones to keep
+        """
+        HangmanSolver.wordListPasses["partition"] += 1
+        self.positions = self.positions[selected]
+        self.codes = self.codes[selected]
+        self._state = None
+
+    def recordLetterGuess(self, letter: str, board: str):
+        """
+        Narrows the possible words with the outcome of a letter guess. A miss drops every word containing the letter, a hit
+        keeps only the words that have the letter in exactly the positions that were revealed
+        :param letter: the letter that was guessed
+        :param board: the board after the guess
+        """
+        if HangmanSolver.profiler is not None:
+            HangmanSolver.profiler.start("partition")
+        scanned = len(self.positions)
+        self.usedLetters += letter
+        self.board = board
+        self.cacheEntry = None
+        if self.stateCache is not None:
+            self.cacheEntry = self.stateCache.get(board, self.usedLetters)
+            if self.cacheEntry is not None:
+                # another game went through this state, only the codes of its words have to be gathered
+                self.positions = self.cacheEntry[0]
+                self.codes = self.dictionary.buckets[len(board)][1][self.positions]
+                self._state = None
+                if HangmanSolver.profiler is not None:
+                    HangmanSolver.profiler.stop(len(self.positions))
+                return
+        bookPositions = HangmanSolver.openingBook.getPositions(board, self.usedLetters) if HangmanSolver.openingBook is not None else None
+        if bookPositions is not None:
+            # the book already holds the words that are left, only their codes have to be gathered
+            self.positions = bookPositions
+            self.codes = self.dictionary.buckets[len(board)][1][bookPositions]
+            self._state = None
+        else:
+            code = self.dictionary.letterCodes.get(letter)
+            revealed = numpy.array([space == letter for space in board], dtype=bool)
+            if code is None:
+                self._keep(numpy.full(len(self.positions), not revealed.any(), dtype=bool))
+            elif revealed.any():
+                self._keep(((self.codes == code) == revealed).all(axis=1))
+            else:
+                self._keep(~(self.codes == code).any(axis=1))
+        if self.stateCache is not None and "_" in board:
+            self.cacheEntry = self.stateCache.put(board, self.usedLetters, self.positions)
+        if HangmanSolver.profiler is not None:
+            HangmanSolver.profiler.stop(len(bookPositions) if bookPositions is not None else scanned)
+
+    def recordWordGuess(self, word: str, correct: bool):
+        """
+        Narrows the possible words with the outcome of a word guess
+        :param word: the word that was guessed
+        :param correct: true if the word was the secret word
+        """
+        if HangmanSolver.profiler is not None:
+            HangmanSolver.profiler.start("partition")
+        scanned = len(self.positions)
+        self.cacheEntry = None
+        if not correct:
+            self.stateCache = None
+        if correct:
+            self.board = word
+        codes = [self.dictionary.letterCodes.get(letter) for letter in word]
+        if len(word) != self.codes.shape[1] or None in codes:
+            matches = numpy.zeros(len(self.positions), dtype=bool)
+        else:
+            matches = (self.codes == numpy.array(codes, dtype=self.codes.dtype)).all(axis=1)
+        self._keep(matches if correct else ~matches)
+        if HangmanSolver.profiler is not None:
+            HangmanSolver.profiler.stop(scanned)
@@ -0,0 +1,85 @@
+import collections
+import os
+
+import numpy
+
+
+class StateCache:
+    def __init__(self, heuristic: str, maxBytes: int = 64 << 20):
+        """
+        In-process LRU of the board states recent games went through, for a worker that plays many games one after the
+        other. Games of the same length start from the same empty board and keep going through the same first few states,
+        so the possible words of a state and the guess made from them are kept and used again instead of being narrowed
+        down and ranked every game. Only guesses of one heuristic are kept, since the guess depends on it
+        :param heuristic: the name of the heuristic the guesses are made with
+        :param maxBytes: roughly how much memory the entries may use, the least recently used states are dropped beyond it
+        """
+        self.heuristic = heuristic
+        self.maxBytes = maxBytes
+        self.entries = collections.OrderedDict()  # (word length, board, usedLetters) -> [positions, guess or None]
+        self.entryBytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _size(self, key: tuple, entry: list) -> int:
+        """
+        :param key: the key of an entry
+        :param entry: the entry
+        :return: roughly the bytes the entry takes up
+        """
+        return entry[0].nbytes + len(key[1]) + len(key[2]) + 200
+
+    def get(self, board: str, usedLetters: str) -> list:
+        """
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: the [positions, guess] entry of the state, guess is None if none was made yet, or None if the state is not kept
+        """
+        if "_" not in board:
+            # a finished game has nothing left to look up, counting it would only lower the hit rate
+            return None
+        key = (len(board), board, usedLetters)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, board: str, usedLetters: str, positions: numpy.ndarray) -> list:
+        """
+        Keeps the possible words of a state, dropping the least recently used states if it is over its memory budget
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :param positions: the possible words of the state as positions within their length group
+        :return: the [positions, guess] entry of the state, the guess can be set on it once it is made
+        """
+        key = (len(board), board, usedLetters)
+        entry = [positions, None]
+        self.entries[key] = entry
+        self.entryBytes += self._size(key, entry)
+        while self.entryBytes > self.maxBytes and len(self.entries) > 1:
+            oldKey, oldEntry = self.entries.popitem(last=False)
+            self.entryBytes -= self._size(oldKey, oldEntry)
+            self.evictions += 1
+        return entry
+
+    def getStats(self) -> dict:
+        """
+        :return: the size of the cache and how often it was hit, along with the id of the process it is in
+        """
+        return {"pid": os.getpid(), "states": len(self.entries), "bytes": self.entryBytes, "maxBytes": self.maxBytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    @staticmethod
+    def formatStats(stats: dict) -> str:
+        """
+        :param stats: stats from getStats
+        :return: one line with the size of the cache and how often it was hit
+        """
+        lookups = stats["hits"] + stats["misses"]
+        return ("state cache: " + str(stats["states"]) + " states, " + str(stats["bytes"] >> 10) + " of " + str(stats["maxBytes"] >> 10) +
+                " KiB, " + str(stats["hits"]) + " hits, " + str(stats["misses"]) + " misses (" + str(round(100*stats["hits"]/max(lookups, 1), 1)) +
+                "% hit), " + str(stats["evictions"]) + " evictions")
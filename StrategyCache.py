@@ -0,0 +1,132 @@
+import hashlib
+import os
+import sqlite3
+
+import HangmanSolver
+
+
+def hashDictionaryFile(filePath: str) -> str:
+    """
+    :param filePath: dictionary text file where each line is another word
+    :return: sha256 hex digest of the contents of the file
+    """
+    digest = hashlib.sha256()
+    with open(filePath, "rb") as dictionaryFile:
+        for block in iter(lambda: dictionaryFile.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StrategyCache:
+    def __init__(self, fileName: str, dictionaryFileName: str, heuristic: str, maxEntries: int = 1000000):
+        """
+        SQLite file that remembers the guess a heuristic made for a (board, used letters) state so repeat runs with the same
+        dictionary do not have to work it out again. Entries are keyed by the hash of the dictionary file, so editing the
+        dictionary invalidates them, and the least recently used entries are evicted once there are more than maxEntries
+        :param fileName: the SQLite file to use, created if it does not exist
+        :param dictionaryFileName: the dictionary text file the guesses are made from
+        :param heuristic: the name of the heuristic the guesses are made with
+        :param maxEntries: the most entries to keep in the file
+        """
+        self.dictionaryHash = hashDictionaryFile(dictionaryFileName)
+        self.heuristic = heuristic
+        # guesses made with an exact search at the end of the game are kept apart from the heuristic's own, and adaptive
+        # guesses are kept apart by the policy table they were picked with
+        self.strategy = heuristic
+        if heuristic == "adaptive" and HangmanSolver.policyTable is not None:
+            self.strategy += "@" + HangmanSolver.policyTable.policyHash
+        if HangmanSolver.exactSolver is not None:
+            self.strategy += "+" + HangmanSolver.exactSolver.name
+        self.maxEntries = maxEntries
+        self.hits = 0
+        self.misses = 0
+        self.pendingWrites = 0
+
+        self.connection = sqlite3.connect(fileName)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS guesses (dictionaryHash TEXT, heuristic TEXT, board TEXT, usedLetters TEXT, letter TEXT, word TEXT, lastUsed INTEGER,
+                PRIMARY KEY (dictionaryHash, heuristic, board, usedLetters));
+            CREATE INDEX IF NOT EXISTS guessesByLastUsed ON guesses (lastUsed);
+            CREATE TABLE IF NOT EXISTS dictionaries (fileName TEXT PRIMARY KEY, dictionaryHash TEXT);
+        """)
+
+        # guesses made from an older version of the dictionary file can never be used again
+        dictionaryKey = os.path.abspath(dictionaryFileName)
+        previous = self.connection.execute("SELECT dictionaryHash FROM dictionaries WHERE fileName = ?", (dictionaryKey,)).fetchone()
+        if previous is not None and previous[0] != self.dictionaryHash:
+            self.connection.execute("DELETE FROM guesses WHERE dictionaryHash = ?", (previous[0],))
+        self.connection.execute("INSERT OR REPLACE INTO dictionaries VALUES (?, ?)", (dictionaryKey, self.dictionaryHash))
+        self.connection.commit()
+
+        self.clock = self.connection.execute("SELECT COALESCE(MAX(lastUsed), 0) FROM guesses").fetchone()[0]
+
+    def get(self, board: str, usedLetters: str):
+        """
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: the cached (letter, word) guess for the state, or None if there is none
+        """
+        key = (self.dictionaryHash, self.strategy, board, usedLetters)
+        guess = self.connection.execute("SELECT letter, word FROM guesses WHERE dictionaryHash = ? AND heuristic = ? AND board = ? AND usedLetters = ?", key).fetchone()
+        if guess is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.clock += 1
+        self.connection.execute("UPDATE guesses SET lastUsed = ? WHERE dictionaryHash = ? AND heuristic = ? AND board = ? AND usedLetters = ?", (self.clock,) + key)
+        self._wrote()
+        return guess[0], guess[1]
+
+    def put(self, board: str, usedLetters: str, guess: (str, str)):
+        """
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :param guess: the (letter, word) guess made for the state
+        """
+        self.clock += 1
+        self.connection.execute("INSERT OR REPLACE INTO guesses VALUES (?, ?, ?, ?, ?, ?, ?)", (self.dictionaryHash, self.strategy, board, usedLetters, guess[0], guess[1], self.clock))
+        self._wrote()
+
+    def getGuess(self, board: str, usedLetters: str, dictionary) -> (str, str):
+        """
+        Looks the guess up in the cache, falling back to HangmanSolver.getGuess and caching what it returns
+        :param board: the current state of the hangman game
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :param dictionary: passed on to HangmanSolver.getGuess, a CandidateState only does its work if the guess is not cached
+        :return: letter, word: see HangmanSolver.getGuess
+        """
+        if HangmanSolver.profiler is not None:
+            HangmanSolver.profiler.start("cache")
+        guess = self.get(board, usedLetters)
+        if guess is None:
+            guess = HangmanSolver.getGuess(self.heuristic, board, usedLetters, dictionary)
+            self.put(board, usedLetters, guess)
+        if HangmanSolver.profiler is not None:
+            HangmanSolver.profiler.stop()
+        return guess
+
+    def _wrote(self):
+        """
+        Commits and evicts every few thousand writes rather than on every one
+        """
+        self.pendingWrites += 1
+        if self.pendingWrites >= 5000:
+            self.commit()
+
+    def commit(self):
+        """
+        Evicts the least recently used entries past maxEntries and writes everything to disk
+        """
+        entryCount = self.connection.execute("SELECT COUNT(*) FROM guesses").fetchone()[0]
+        if entryCount > self.maxEntries:
+            self.connection.execute("DELETE FROM guesses WHERE rowid IN (SELECT rowid FROM guesses ORDER BY lastUsed LIMIT ?)", (entryCount - self.maxEntries,))
+        self.connection.commit()
+        self.pendingWrites = 0
+
+    def close(self):
+        """
+        Commits and closes the cache file
+        """
+        self.commit()
+        self.connection.close()
+        print("strategy cache:", self.hits, "hits,", self.misses, "misses")
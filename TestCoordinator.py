@@ -0,0 +1,237 @@
+import asyncio
+import collections
+import time
+
+import JsonHttp
+from OutFileWriter import OutFileWriter
+
+
+def isValidGameNumber(gameNumber) -> bool:
+    """
+    :param gameNumber: a game number decoded from a request
+    :return: true if it is a game number
+    """
+    return isinstance(gameNumber, int) and not isinstance(gameNumber, bool) and gameNumber > 0
+
+
+def isValidGameResult(gameResult) -> bool:
+    """
+    :param gameResult: game details decoded from a request
+    :return: true if they have the shape testGame returns them in, so they can be written to an outFile as one line
+    """
+    return (isinstance(gameResult, list) and len(gameResult) == 6
+            and all([isinstance(text, str) and "," not in text and "\n" not in text for text in (gameResult[0], gameResult[5])])
+            and all([isinstance(value, int) and not isinstance(value, bool) for value in gameResult[1:5]]))
+
+
+class TestCoordinator:
+    def __init__(self, wordCount: int, dictionaryHash: str, outFileNames: dict, rangeSize: int = 500, leaseTimeout: float = 60,
+                 settings: dict = None):
+        """
+        Hands the games of a dictionary test out to workers over HTTP with JSON bodies, so a test can be spread over several
+        machines. The games missing from each strategy's outFile are split into ranges of consecutive game numbers, and a
+        worker leases one range at a time and streams its results back as it plays them. A lease that has not been heard
+        from within the timeout is given to the next worker that asks, so a worker that dies only costs the games it had
+        not sent yet. Results are held until every game before them is in, so each outFile is written in game number order
+        :param wordCount: the number of words in the dictionary, game x uses word x - 1
+        :param dictionaryHash: sha256 hex digest of the dictionary file, workers with another version of it are turned away
+        :param outFileNames: {strategy: outFile its results are appended to}
+        :param rangeSize: the most games in one lease
+        :param leaseTimeout: seconds a lease is kept without word from its worker
+        :param settings: what workers play the games with besides the strategy, {"exactSearch": (threshold, objective, maxBytes) or None, "policy": PolicyTable.toJson() or None}
+        """
+        self.dictionaryHash = dictionaryHash
+        self.settings = settings if settings is not None else {"exactSearch": None, "policy": None}
+        self.leaseTimeout = leaseTimeout
+        self.writers = {}
+        self.remaining = {}  # strategy -> game numbers missing from its outFile, in order
+        self.nextIndex = {}  # strategy -> position in remaining of the next game to write
+        self.received = {}  # strategy -> {game number: game details} of games received but not written yet
+        self.ranges = collections.deque()  # (strategy, game numbers) not leased yet
+        for strategy, outFileName in outFileNames.items():
+            writer = OutFileWriter(outFileName)
+            self.writers[strategy] = writer
+            self.remaining[strategy] = [gameNumber for gameNumber in range(1, wordCount + 1) if gameNumber not in writer.completedGames]
+            self.nextIndex[strategy] = 0
+            self.received[strategy] = {}
+            for i in range(0, len(self.remaining[strategy]), rangeSize):
+                self.ranges.append((strategy, self.remaining[strategy][i:i + rangeSize]))
+            print(strategy + ":", wordCount - len(self.remaining[strategy]), "games already in", outFileName + ",", len(self.remaining[strategy]), "to play")
+        self.leases = {}  # lease id -> [strategy, game numbers, worker, deadline]
+        self.nextLeaseId = 1
+        self.expiredLeases = 0
+        self.workers = set()
+        self.startTime = time.monotonic()
+        self.finished = asyncio.Event()
+
+    @property
+    def complete(self) -> bool:
+        """
+        :return: true once every game of every strategy has been written
+        """
+        return all(self.nextIndex[strategy] == len(remaining) for strategy, remaining in self.remaining.items())
+
+    def _expireLeases(self):
+        """
+        Puts the unfinished games of every lease that timed out back at the front of the queue
+        """
+        now = time.monotonic()
+        for leaseId, (strategy, gameNumbers, worker, deadline) in list(self.leases.items()):
+            if deadline < now:
+                del self.leases[leaseId]
+                self.expiredLeases += 1
+                missing = [gameNumber for gameNumber in gameNumbers if not self._isDone(strategy, gameNumber)]
+                if len(missing) > 0:
+                    print("lease", leaseId, "of", worker, "timed out with", len(missing), "games left, reassigning them")
+                    self.ranges.appendleft((strategy, missing))
+
+    def _isDone(self, strategy: str, gameNumber: int) -> bool:
+        """
+        :param strategy: the strategy of the game
+        :param gameNumber: the number of the game
+        :return: true if the game's results have been received, whether or not they are written yet
+        """
+        remaining = self.remaining[strategy]
+        nextIndex = self.nextIndex[strategy]
+        return gameNumber in self.received[strategy] or (nextIndex > 0 and gameNumber <= remaining[nextIndex - 1])
+
+    def getSettings(self, request: dict) -> dict:
+        """
+        :param request: the decoded body of a settings request, with the worker's name and the hash of its dictionary
+        :return: the body of the response, the settings workers play the games with
+        """
+        JsonHttp.checkRequest(request, {"worker": str, "dictionaryHash": str})
+        if request["dictionaryHash"] != self.dictionaryHash:
+            raise ValueError("the worker's dictionary is not the one the games are numbered by")
+        return self.settings
+
+    def lease(self, request: dict) -> dict:
+        """
+        :param request: the decoded body of a lease request, with the worker's name and the hash of its dictionary
+        :return: the body of the response, the lease id, strategy and game numbers of the lease, or wait with the seconds to
+            wait for if every game is leased out, or done once every game is written
+        """
+        JsonHttp.checkRequest(request, {"worker": str, "dictionaryHash": str})
+        worker = request["worker"]
+        if request["dictionaryHash"] != self.dictionaryHash:
+            raise ValueError("the worker's dictionary is not the one the games are numbered by")
+        self.workers.add(worker)
+        if self.complete:
+            return {"done": True}
+        self._expireLeases()
+        while len(self.ranges) > 0:
+            strategy, gameNumbers = self.ranges.popleft()
+            gameNumbers = [gameNumber for gameNumber in gameNumbers if not self._isDone(strategy, gameNumber)]
+            if len(gameNumbers) > 0:
+                leaseId = self.nextLeaseId
+                self.nextLeaseId += 1
+                self.leases[leaseId] = [strategy, gameNumbers, worker, time.monotonic() + self.leaseTimeout]
+                return {"leaseId": leaseId, "strategy": strategy, "gameNumbers": gameNumbers, "leaseTimeout": self.leaseTimeout}
+        return {"wait": min(1.0, self.leaseTimeout/4)}
+
+    def addResults(self, request: dict) -> dict:
+        """
+        Takes in results streamed from a lease and writes every game that is next in line in its outFile. Results of a
+        lease that timed out are still used, a game that was played twice is only written once
+        :param request: the decoded body of a results request, with the lease id, strategy and [game number, game details] pairs
+        :return: the body of the response, expired is true if the lease was given to another worker and should be dropped
+        """
+        JsonHttp.checkRequest(request, {"leaseId": int, "strategy": str, "results": list})
+        leaseId = request["leaseId"]
+        strategy = request["strategy"]
+        if strategy not in self.received:
+            raise ValueError("the test has no strategy " + strategy)
+        # every result is checked before any is kept, so a bad one never leaves the others half taken in
+        results = []
+        for result in request["results"]:
+            if not (isinstance(result, list) and len(result) == 2 and isValidGameNumber(result[0]) and isValidGameResult(result[1])):
+                raise ValueError("a result is not [game number, game details]: " + repr(result)[:100])
+            results.append((result[0], tuple(result[1])))
+        received = self.received[strategy]
+        for gameNumber, gameResult in results:
+            if not self._isDone(strategy, gameNumber):
+                received[gameNumber] = gameResult
+
+        writer = self.writers[strategy]
+        remaining = self.remaining[strategy]
+        nextIndex = self.nextIndex[strategy]
+        while nextIndex < len(remaining) and remaining[nextIndex] in received:
+            writer.write(remaining[nextIndex], received.pop(remaining[nextIndex]))
+            nextIndex += 1
+        self.nextIndex[strategy] = nextIndex
+        writer.checkpoint()
+
+        lease = self.leases.get(leaseId)
+        if lease is None:
+            return {"expired": True}
+        if all(self._isDone(strategy, gameNumber) for gameNumber in lease[1]):
+            del self.leases[leaseId]
+        else:
+            lease[3] = time.monotonic() + self.leaseTimeout
+        if self.complete:
+            self.finished.set()
+        return {"expired": False}
+
+    def getStats(self) -> dict:
+        """
+        :return: the body of a stats request
+        """
+        return {"written": {strategy: self.nextIndex[strategy] for strategy in self.remaining},
+                "toPlay": {strategy: len(remaining) for strategy, remaining in self.remaining.items()},
+                "waiting": {strategy: len(received) for strategy, received in self.received.items()},
+                "leases": len(self.leases), "expiredLeases": self.expiredLeases, "workers": sorted(self.workers),
+                "seconds": time.monotonic() - self.startTime}
+
+    def route(self, method: str, path: str, request) -> (str, dict):
+        """
+        :param method: the method of the request
+        :param path: the path of the request
+        :param request: the decoded body of the request, None if it has none
+        :return: status, body of the response
+        """
+        if method == "POST" and path == "/settings":
+            return "200 OK", self.getSettings(request)
+        if method == "POST" and path == "/lease":
+            return "200 OK", self.lease(request)
+        if method == "POST" and path == "/results":
+            return "200 OK", self.addResults(request)
+        if method == "GET" and path == "/stats":
+            return "200 OK", self.getStats()
+        return "404 Not Found", {"error": "unknown request " + method + " " + path}
+
+    async def handleConnection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serves the HTTP requests of one connection, see JsonHttp.serveConnection
+        :param reader: stream the requests are read from
+        :param writer: stream the responses are written to
+        """
+        await JsonHttp.serveConnection(reader, writer, self.route)
+
+    async def serve(self, host: str, port: int, linger: float = 2, workersAlive=None):
+        """
+        Accepts connections until every game is written, then keeps answering for a moment so idle workers hear that the
+        test is done, and closes the outFiles
+        :param host: address to listen on
+        :param port: port to listen on
+        :param linger: seconds to keep answering after the last game is written
+        :param workersAlive: optional function that returns false once every worker the test relies on has exited, which
+            stops the coordinator with the games that are left unplayed rather than waiting for workers that will not come
+        """
+        server = await asyncio.start_server(self.handleConnection, host, port)
+        print("coordinating", sum([len(remaining) for remaining in self.remaining.values()]), "games on", host + ":" + str(port))
+        try:
+            async with server:
+                while not self.complete:
+                    try:
+                        await asyncio.wait_for(self.finished.wait(), 1)
+                    except asyncio.TimeoutError:
+                        if workersAlive is not None and not workersAlive():
+                            print("every worker exited with", sum([len(remaining) - self.nextIndex[strategy] for strategy, remaining in self.remaining.items()]),
+                                  "games left unplayed, stopping")
+                            break
+                if self.complete:
+                    await asyncio.sleep(linger)
+        finally:
+            for writer in self.writers.values():
+                writer.close()
+        print(self.getStats())
@@ -0,0 +1,128 @@
+import argparse
+import http.client
+import json
+import os
+import socket
+import time
+
+import HangmanSolver
+import HangmanTester
+from ExactSolver import ExactSolver
+from PolicyTable import PolicyTable
+from StrategyCache import hashDictionaryFile
+
+
+class TestWorker:
+    def __init__(self, dictionaryFileName: str, host: str, port: int, name: str = None, reportSize: int = 64, connectTimeout: float = 30):
+        """
+        Plays the games a TestCoordinator leases to it, sending the results back as it goes, until the coordinator says
+        every game is done. The worker loads its own copy of the dictionary, which has to be the same file the coordinator
+        numbers the games by, and takes the exact search and policy table settings of the test from the coordinator
+        :param dictionaryFileName: the dictionary text file or compiled dictionary
+        :param host: address of the coordinator
+        :param port: port of the coordinator
+        :param name: name of the worker in the coordinator's logs, the host name and process id by default
+        :param reportSize: number of games played between sending results
+        :param connectTimeout: seconds to keep trying to reach a coordinator that is not up yet
+        """
+        self.dictionary = HangmanSolver.loadDictionaryIndex(dictionaryFileName)
+        self.dictionaryHash = hashDictionaryFile(dictionaryFileName)
+        self.host = host
+        self.port = port
+        self.name = name if name is not None else socket.gethostname() + ":" + str(os.getpid())
+        self.reportSize = reportSize
+        self.connectTimeout = connectTimeout
+        self.connection = None
+        self.gameCount = 0
+
+    def request(self, path: str, body: dict) -> dict:
+        """
+        Posts a request to the coordinator over a keep-alive connection, opening it again if it was dropped
+        :param path: the path of the request
+        :param body: the body of the request
+        :return: the decoded body of the response
+        """
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port)
+            try:
+                self.connection.request("POST", path, json.dumps(body), {"Content-Type": "application/json"})
+                response = self.connection.getresponse()
+                responseBody = json.loads(response.read())
+                break
+            except (ConnectionError, http.client.HTTPException):
+                self.connection.close()
+                self.connection = None
+                if attempt == 1:
+                    raise
+        if response.status != 200:
+            raise RuntimeError(str(response.status) + " " + str(responseBody))
+        return responseBody
+
+    def applySettings(self, settings: dict):
+        """
+        Plays the games the way the coordinator's test was set up
+        :param settings: the body of the settings response
+        """
+        if settings["exactSearch"] is not None:
+            HangmanSolver.exactSolver = ExactSolver(*settings["exactSearch"])
+        if settings["policy"] is not None:
+            HangmanSolver.policyTable = PolicyTable.fromJson(settings["policy"])
+
+    def playLease(self, lease: dict):
+        """
+        Plays the games of a lease, sending the results every reportSize games, and drops the lease if the coordinator has given it to another worker
+        :param lease: the body of the lease response
+        """
+        strategy = lease["strategy"]
+        gameNumbers = lease["gameNumbers"]
+        for start in range(0, len(gameNumbers), self.reportSize):
+            results = []
+            for gameNumber in gameNumbers[start:start + self.reportSize]:
+                results.append([gameNumber, list(HangmanTester.testGame(self.dictionary.getWord(gameNumber - 1), self.dictionary, strategy))])
+            self.gameCount += len(results)
+            if self.request("/results", {"leaseId": lease["leaseId"], "strategy": strategy, "results": results})["expired"]:
+                print(self.name, "lost lease", lease["leaseId"], "to another worker")
+                return
+
+    def run(self):
+        """
+        Leases and plays games until the coordinator says every game is done
+        """
+        deadline = time.monotonic() + self.connectTimeout
+        while True:
+            try:
+                self.applySettings(self.request("/settings", {"worker": self.name, "dictionaryHash": self.dictionaryHash}))
+                lease = self.request("/lease", {"worker": self.name, "dictionaryHash": self.dictionaryHash})
+                break
+            except ConnectionRefusedError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
+        while True:
+            if lease.get("done"):
+                break
+            if "wait" in lease:
+                time.sleep(lease["wait"])
+            else:
+                self.playLease(lease)
+            try:
+                lease = self.request("/lease", {"worker": self.name, "dictionaryHash": self.dictionaryHash})
+            except ConnectionRefusedError:
+                # the coordinator stops a moment after the last game is written
+                break
+        if self.connection is not None:
+            self.connection.close()
+        print(self.name, "played", self.gameCount, "games")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Worker for testDictionaryW/Distributed, plays the games a coordinator leases to it")
+    parser.add_argument("-d", "--dictionary", help="the dictionary the coordinator was started with, a text file or a compiled dictionary", type=str, required=True)
+    parser.add_argument("-H", "--host", help="address of the coordinator", type=str, default="127.0.0.1")
+    parser.add_argument("-p", "--port", help="port of the coordinator", type=int, default=8090)
+    parser.add_argument("-n", "--name", help="name of the worker in the coordinator's logs", type=str)
+    parser.add_argument("-rs", "--reportSize", help="number of games played between sending results", type=int, default=64)
+    args = parser.parse_args()
+
+    TestWorker(args.dictionary, args.host, args.port, args.name, args.reportSize).run()
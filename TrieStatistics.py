@@ -0,0 +1,66 @@
+import numpy
+
+from LetterStatistics import LetterStatistics
+
+
+class TrieStatistics:
+    def __init__(self, letters: list, letterTotals: numpy.ndarray, wordsContaining: numpy.ndarray, histogram: numpy.ndarray,
+                 wordCount: int, usedLetters: str, makeMatrix):
+        """
+        Letter statistics that DictionaryTrie counts while it walks the words matching a board, with the same attributes and
+        methods as LetterStatistics. Only the partition methods need the words themselves, they are spelled out of the trie
+        the first time one of them is called
+        :param letters: the letters found in the words, in the order they are first seen when reading the words in dictionary order
+        :param letterTotals: number of times each letter appears in the words
+        :param wordsContaining: number of words each letter appears in
+        :param histogram: (letter, position) counts of the letters that are not in usedLetters, see LetterStatistics.positionHistogram
+        :param wordCount: number of words
+        :param usedLetters: the used letters of the board the words match
+        :param makeMatrix: function returning the (word, position) code matrix of the words in dictionary order and its alphabet
+        """
+        self.wordCount = wordCount
+        self.letters = letters
+        self.letterTotals = letterTotals
+        self.letterCount = int(letterTotals.sum())
+        self.wordsContaining = wordsContaining
+        self._histogram = histogram
+        self._usedLetters = usedLetters
+        self._makeMatrix = makeMatrix
+        self._statistics = None
+
+    def _getStatistics(self) -> LetterStatistics:
+        """
+        :return: the LetterStatistics of the words, made from their codes the first time it is needed
+        """
+        if self._statistics is None:
+            self._statistics = LetterStatistics(*self._makeMatrix())
+        return self._statistics
+
+    def unusedMask(self, usedLetters: str) -> numpy.ndarray:
+        """
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: boolean array that is true for every letter (in self.letters order) that has not been used
+        """
+        return numpy.array([letter not in usedLetters for letter in self.letters], dtype=bool)
+
+    def positionHistogram(self, usedLetters: str) -> numpy.ndarray:
+        """
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: (letter, position) matrix of counts, see LetterStatistics.positionHistogram
+        """
+        if usedLetters == self._usedLetters:
+            return self._histogram
+        return self._getStatistics().positionHistogram(usedLetters)
+
+    def revealPatterns(self) -> numpy.ndarray:
+        """
+        :return: see LetterStatistics.revealPatterns
+        """
+        return self._getStatistics().revealPatterns()
+
+    def partitionSizes(self, usedLetters: str) -> list:
+        """
+        :param usedLetters: list of letters that have been used already, both correct and incorrect
+        :return: see LetterStatistics.partitionSizes
+        """
+        return self._getStatistics().partitionSizes(usedLetters)
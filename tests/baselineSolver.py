@@ -0,0 +1,165 @@
+import pandas
+
+# the regex filter and per-word ranking loops HangmanSolver started from, kept as they were so the tests can check that
+# the index, the letter statistics and everything built on them still pick the same words and the same guesses
+
+
+def getPossibleWords(board: str, usedLetters: str, dictionary: pandas.core.frame.DataFrame) -> pandas.core.frame.DataFrame:
+    """
+    Uses regular expressions to select all rows of the dictionary dataframe that match the boards size and content
+    :param board: the current state of the hangman game, used to find size and correct guesses
+    :param usedLetters: list of letters that have been used already, both correct and incorrect
+    :param dictionary: the dictionary the hangman word is believed to be from
+    :return: all possible words that could be the secret word bases on the correct and incorrect guesses and size of the secret word
+    """
+    regex = "(?=\\b\\w{"+str(len(board))+"}\\b)"
+
+    if len(usedLetters) > 0:
+        regex += "(?="
+        for space in board:
+            if space == "_":
+                regex += "[^"+usedLetters+"]"
+            else:
+                regex += space
+        regex += ")"
+
+    return dictionary[dictionary.words.str.match(regex)]
+
+
+def findPossibleLetters(words: pandas.core.frame.DataFrame, usedLetters: str) -> list:
+    """
+    :param words: List of words to analyze
+    :param usedLetters: list of letters that have been used already, both correct and incorrect
+    :return: letters: list of remaining possible guesses
+    """
+    letters = []
+    for word in words.values:
+        word = word[0]
+        for letter in word:
+            if letter not in letters and letter not in usedLetters:
+                letters.append(letter)
+
+    return letters
+
+
+def findLetterTotals(words: pandas.core.frame.DataFrame) -> (list, int):
+    """
+    :param words: List of words to analyze
+    :return: totals, letterCount: dictionary containing all observed letters and their occurrence frequency, total number of letters counted
+    """
+    totals = {}
+    letterCount = 0
+    for word in words.values:
+        word = word[0]
+        for letter in word:
+            letterCount += 1
+            if letter in totals:
+                totals[letter] = totals[letter] + 1
+            else:
+                totals[letter] = 1
+
+    return totals, letterCount
+
+
+def rankPossibleGuessesByFrequency(board: str, usedLetters: str, possibleWords: pandas.core.frame.DataFrame) -> dict:
+    totals, letterCount = findLetterTotals(possibleWords)
+    freqs = {}
+    for k, v in totals.items():
+        if k not in usedLetters:
+            freqs[k] = v
+        else:
+            letterCount -= v
+    for k, v in freqs.items():
+        freqs[k] = v / letterCount
+
+    return freqs
+
+
+def rankPossibleGuessesByOccurrences(board: str, usedLetters: str, possibleWords: pandas.core.frame.DataFrame) -> dict:
+    letters = findPossibleLetters(possibleWords, usedLetters)
+    occurrences = {}
+    for word in possibleWords.values:
+        word = word[0]
+        seenLetters = ""
+        for letter in word:
+            if letter in letters and letter not in seenLetters:
+                seenLetters += letter
+                if letter in occurrences:
+                    occurrences[letter] = occurrences[letter] + 1
+                else:
+                    occurrences[letter] = 1
+
+    return occurrences
+
+
+def rankPossibleGuessesByAbsence(board: str, usedLetters: str, possibleWords: pandas.core.frame.DataFrame) -> dict:
+    letters = findPossibleLetters(possibleWords, usedLetters)
+    absences = {}
+    for letter in letters:
+        count = 0
+        for word in possibleWords.values:
+            word = word[0]
+            if letter not in word:
+                count += 1
+        absences[letter] = count
+
+    return absences
+
+
+def rankPossibleGuessesByAvgOccurrenceInWord(board: str, usedLetters: str, possibleWords: pandas.core.frame.DataFrame) -> dict:
+    possibleLetters = findPossibleLetters(possibleWords, usedLetters)
+    letterCounts = findLetterTotals(possibleWords)[0]
+    occurrences = rankPossibleGuessesByOccurrences(board, usedLetters, possibleWords)
+    avgOccurrenceInWord = {}
+    for letter in possibleLetters:
+        avgOccurrenceInWord[letter] = letterCounts[letter]/occurrences[letter]
+
+    return avgOccurrenceInWord
+
+
+def rankPossibleGuessesByPositionsInWord(board: str, usedLetters: str, possibleWords: pandas.core.frame.DataFrame) -> dict:
+    positions = len(board)
+    oneHotEncodings = {}
+    for word in possibleWords.values:
+        position = 0
+        word = word[0]
+        for letter in word:
+            if letter in usedLetters:
+                continue
+            if letter in oneHotEncodings:
+                oneHotEncodings[letter][position] = oneHotEncodings[letter][position] + 1
+            else:
+                oneHotEncodings[letter] = [0 for i in range(0, positions)]
+                oneHotEncodings[letter][position] = oneHotEncodings[letter][position] + 1
+            position += 1
+    ranks = {}
+    for k, v in oneHotEncodings.items():
+        ranks[k] = sum([c/len(possibleWords.values) for c in v if c > 0])*len([c for c in v if c > 0])/len(possibleWords.values)
+
+    return ranks
+
+
+rankFunctions = {"frequency": rankPossibleGuessesByFrequency, "occurrence": rankPossibleGuessesByOccurrences,
+                 "absence": rankPossibleGuessesByAbsence, "avgOccurrenceInWord": rankPossibleGuessesByAvgOccurrenceInWord,
+                 "positionsInWord": rankPossibleGuessesByPositionsInWord}
+
+
+def getGuess(heuristic: str, board: str, usedLetters: str, dictionary: pandas.core.frame.DataFrame) -> (str, str):
+    """
+    :param heuristic: the name of the heuristic to use, one of rankFunctions
+    :param board: the current state of the hangman game
+    :param usedLetters: list of letters that have been used already, both correct and incorrect
+    :param dictionary: dictionary dataframe assumed to contain the secret word
+    :return: letter, word: the best letter to guess based on the given heuristic, the last remaining word if only one is left, otherwise an empty string
+    """
+    letterRanks = rankFunctions[heuristic](board, usedLetters, dictionary)
+    v = list(letterRanks.values())
+    k = list(letterRanks.keys())
+
+    possibleWords = getPossibleWords(board, usedLetters, dictionary)
+    if possibleWords.size == 1:
+        word = possibleWords.words.iloc[0]
+    else:
+        word = ""
+
+    return k[v.index(max(v))], word
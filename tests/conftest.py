@@ -0,0 +1,22 @@
+import pytest
+
+import Benchmark
+import HangmanSolver
+
+
+@pytest.fixture(scope="session")
+def dictionaryFileName(tmp_path_factory) -> str:
+    """
+    :return: a small synthetic dictionary file, with enough words of each length that the filters and heuristics have something to split
+    """
+    fileName = str(tmp_path_factory.mktemp("dictionary") / "words.txt")
+    Benchmark.makeSyntheticDictionary(fileName, 400, 5, 1.5, 7)
+    return fileName
+
+
+@pytest.fixture(scope="session")
+def dictionary(dictionaryFileName):
+    """
+    :return: the synthetic dictionary as a dataframe
+    """
+    return HangmanSolver.loadDictionary(dictionaryFileName)
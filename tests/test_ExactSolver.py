@@ -0,0 +1,56 @@
+import numpy
+import pandas
+import pytest
+
+import HangmanSolver
+import HangmanTester
+from ExactSolver import ExactSolver
+
+
+def bruteForce(words: list, board: str, objective: str) -> int:
+    """
+    Tries every order of letter guesses
+    :param words: the words that are still possible
+    :param board: the current state of the game
+    :param objective: "expected" for the fewest wrong guesses over all the words, "worst" for the fewest wrong guesses of the worst word
+    :return: the wrong guesses perfect play makes from here
+    """
+    if len(words) == 1:
+        return 0
+    best = None
+    for letter in sorted(set("".join(words)) - set(board)):
+        groups = {}
+        for word in words:
+            groups.setdefault("".join(letter if wordLetter == letter else space for wordLetter, space in zip(word, board)), []).append(word)
+        if len(groups) == 1:
+            continue
+        costs = [(len(group) if pattern == board else 0, 1 if pattern == board else 0, bruteForce(group, pattern, objective))
+                 for pattern, group in groups.items()]
+        if objective == "expected":
+            value = sum([misses + rest for misses, missed, rest in costs])
+        else:
+            value = max([missed + rest for misses, missed, rest in costs])
+        best = value if best is None else min(best, value)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("objective", ["expected", "worst"])
+def testExactPlayIsOptimal(monkeypatch, seed, objective):
+    generator = numpy.random.default_rng(seed)
+    words = sorted({"".join(generator.choice(list("abcdef"), 4).tolist()) for i in range(9)})
+    monkeypatch.setattr(HangmanSolver, "exactSolver", ExactSolver(len(words), objective))
+    dictionary = pandas.DataFrame({"words": words})
+    wrongGuesses = [HangmanTester.testGame(word, dictionary, "frequency")[4] for word in words]
+    played = sum(wrongGuesses) if objective == "expected" else max(wrongGuesses)
+    assert played == bruteForce(words, "____", objective)
+
+
+def testThreshold():
+    solver = ExactSolver(3)
+    assert solver.canSolve("____", 3)
+    assert not solver.canSolve("____", 4)
+    assert not solver.canSolve("____", 0)
+    assert solver.name == "exact-expected-3"
+    with pytest.raises(ValueError):
+        ExactSolver(3, "fastest")
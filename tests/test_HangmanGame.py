@@ -0,0 +1,38 @@
+import HangmanGame
+from HangmanGame import HangmanGame as Game
+
+
+def testLetterBitsAreFixed():
+    assert HangmanGame.getLetterBit("a") == 1
+    assert HangmanGame.getLetterBit("z") == 1 << 25
+    # letters outside a to z get the bits above them, in the order they are first guessed
+    assert HangmanGame.getLetterBit("é") >= 1 << 26
+    assert HangmanGame.getLetterBit("é") == HangmanGame.getLetterBit("é")
+
+
+def testUsedLetterMaskFollowsGuesses():
+    game = Game("hangman", 8)
+    assert game.playLetter("z") is False
+    assert game.playLetter("a") is True
+    assert game.usedLetterMask == 1 | 1 << 25
+    assert game.board == "_a___a_"
+    assert game.usedLetters == "za"
+    assert game.remainingGuesses == 7
+
+
+def testRepeatedLetterIsCorrectButRevealsNothing():
+    game = Game("abba", 8)
+    assert game.playLetter("b") is True
+    assert game.playLetter("b") is True
+    assert game.board == "_bb_"
+    assert game.usedLetters == "bb"
+    assert not game.complete
+    assert game.playLetter("a") is True
+    assert game.complete
+
+
+def testWordGuesses():
+    game = Game("abba", 8)
+    assert game.guessWord("abab") == ("____", "", 7, False)
+    assert game.guessWord("abba") == ("abba", "", 7, True)
+    assert game.complete
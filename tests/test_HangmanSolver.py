@@ -0,0 +1,76 @@
+import pytest
+
+import HangmanSolver
+import HangmanTester
+from DictionaryIndex import DictionaryIndex
+from DictionaryTrie import DictionaryTrie
+from HangmanGame import HangmanGame
+from tests import baselineSolver
+
+
+def playBaselineGame(word: str, dictionary, heuristic: str) -> (tuple, list):
+    """
+    Plays a game the way the tester did before the index, filtering the dataframe again every turn
+    :param word: the secret word
+    :param dictionary: the dictionary dataframe
+    :param heuristic: one of baselineSolver.rankFunctions
+    :return: the game details as testGame returns them, and the (board, usedLetters) of every turn
+    """
+    game = HangmanGame(word, 8)
+    states = []
+    guessCount = correctGuessCount = incorrectGuessCount = 0
+    possibleWords = dictionary
+    while not game.complete:
+        states.append((game.board, game.usedLetters))
+        possibleWords = baselineSolver.getPossibleWords(game.board, game.usedLetters, possibleWords)
+        letter, guessWord = baselineSolver.getGuess(heuristic, game.board, game.usedLetters, possibleWords)
+        result = game.playWord(guessWord) if guessWord != "" else game.playLetter(letter)
+        correctGuessCount += result
+        incorrectGuessCount += not result
+        guessCount += 1
+    return (word, len(word), guessCount, correctGuessCount, incorrectGuessCount, game.usedLetters), states
+
+
+@pytest.fixture(scope="module")
+def baselineStates(dictionary) -> list:
+    """
+    :return: the board states the baseline frequency games went through, on every tenth word
+    """
+    states = []
+    for word in dictionary.words.tolist()[::10]:
+        states.extend(playBaselineGame(word, dictionary, "frequency")[1])
+    return states
+
+
+def testDictionaryBackendsMatchRegexFilter(dictionary, baselineStates):
+    index = DictionaryIndex(dictionary)
+    trie = DictionaryTrie(dictionary.words.tolist())
+    # boards with a length that is not in the dictionary and with a letter that is not in it either
+    states = baselineStates + [("_"*20, ""), ("_"*20, "e"), ("__q", "q"), ("___", "eai")]
+    for board, usedLetters in states:
+        expected = baselineSolver.getPossibleWords(board, usedLetters, dictionary).words.tolist()
+        assert HangmanSolver.getPossibleWords(board, usedLetters, dictionary).words.tolist() == expected
+        assert index.getPossibleWords(board, usedLetters).words.tolist() == expected
+        assert trie.getPossibleWords(board, usedLetters).words.tolist() == expected
+
+
+@pytest.mark.parametrize("heuristic", list(baselineSolver.rankFunctions))
+def testGetGuessMatchesBaseline(dictionary, baselineStates, heuristic):
+    index = DictionaryIndex(dictionary)
+    for board, usedLetters in baselineStates:
+        possibleWords = baselineSolver.getPossibleWords(board, usedLetters, dictionary)
+        expected = baselineSolver.getGuess(heuristic, board, usedLetters, possibleWords)
+        assert HangmanSolver.getGuess(heuristic, board, usedLetters, possibleWords) == expected
+        state = HangmanSolver.CandidateState(board, usedLetters, index)
+        assert HangmanSolver.getGuess(heuristic, board, usedLetters, state) == expected
+
+
+@pytest.mark.parametrize("heuristic", ["frequency", "positionsInWord"])
+def testGamesMatchBaseline(dictionary, heuristic):
+    index = DictionaryIndex(dictionary)
+    trie = DictionaryTrie(dictionary.words.tolist())
+    for word in dictionary.words.tolist()[::4]:
+        expected = playBaselineGame(word, dictionary, heuristic)[0]
+        assert HangmanTester.testGame(word, dictionary, heuristic) == expected
+        assert HangmanTester.testGame(word, index, heuristic) == expected
+        assert HangmanTester.testGame(word, trie, heuristic) == expected
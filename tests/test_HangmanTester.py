@@ -0,0 +1,39 @@
+import pytest
+
+import HangmanTester
+from DictionaryIndex import DictionaryIndex
+
+
+def readGames(outFileName: str) -> list:
+    """
+    :param outFileName: an outFile
+    :return: its game lines, without the header
+    """
+    with open(outFileName) as outFile:
+        return outFile.read().split("\n")[1:-1]
+
+
+def testSampleSizeIncludesPilot(dictionary, tmp_path):
+    outFileName = str(tmp_path / "sample.csv")
+    HangmanTester.runSampledTests(DictionaryIndex(dictionary), "frequency", outFileName, str(tmp_path / "agg.csv"), 50, roundSize=20)
+    assert len(readGames(outFileName)) == 50
+
+
+def testSampleTooSmallForPilot(dictionary, tmp_path):
+    with pytest.raises(ValueError):
+        HangmanTester.runSampledTests(DictionaryIndex(dictionary), "frequency", str(tmp_path / "sample.csv"), str(tmp_path / "agg.csv"), 10)
+
+
+def testSampledRunResumesAfterPartialLine(dictionary, tmp_path):
+    index = DictionaryIndex(dictionary)
+    outFileName = str(tmp_path / "sample.csv")
+    HangmanTester.runSampledTests(index, "frequency", outFileName, str(tmp_path / "agg.csv"), 60, roundSize=20)
+    games = readGames(outFileName)
+    with open(outFileName, "a") as outFile:
+        outFile.write("999,abc,3")
+    # the same seed draws the same words, so a bigger sample plays on from the games that are already in
+    HangmanTester.runSampledTests(index, "frequency", outFileName, str(tmp_path / "agg.csv"), 100, roundSize=20)
+    resumed = readGames(outFileName)
+    assert resumed[:len(games)] == games
+    assert len(resumed) == 100
+    assert len(set([line.split(",")[0] for line in resumed])) == 100
@@ -0,0 +1,77 @@
+import numpy
+import pytest
+
+from IncrementalAggregator import IncrementalAggregator
+from OutFileWriter import outFileHeader
+
+# wordLength, guessCount, correctGuessCount, incorrectGuessCount of some games
+games = [(3, 5, 3, 2), (3, 3, 3, 0), (4, 9, 3, 6), (4, 4, 4, 0), (4, 6, 4, 2), (5, 5, 5, 0), (3, 7, 2, 5)]
+
+
+def gameLine(gameNumber: int) -> str:
+    wordLength, guesses, correctGuesses, wrongGuesses = games[gameNumber - 1]
+    return ",".join([str(gameNumber), "w"*wordLength, str(wordLength), str(guesses), str(correctGuesses), str(wrongGuesses), "abc"])
+
+
+def checkTotals(aggregator: IncrementalAggregator, gameCount: int):
+    """
+    Compares what the aggregator worked out with the statistics of the first games worked out in one go
+    """
+    values = numpy.array(games[:gameCount], dtype=float)
+    count, avgGuesses, avgWrongGuesses, stddevWrongGuesses = aggregator.getTotals()
+    assert count == gameCount
+    assert avgGuesses == pytest.approx(values[:, 1].mean())
+    assert avgWrongGuesses == pytest.approx(values[:, 3].mean())
+    assert stddevWrongGuesses == pytest.approx(values[:, 3].std())
+    for length, statistics in aggregator.getStatistics().items():
+        lengthValues = values[values[:, 0] == length]
+        assert statistics == pytest.approx(tuple(lengthValues[:, 1:].mean(axis=0)) + tuple(lengthValues[:, 1:].std(axis=0)))
+
+
+def testLinesAddedAfterAnUnterminatedLine(tmp_path):
+    # outFiles written before lines were terminated put the line break before each line instead of after it
+    outFileName = str(tmp_path / "out.csv")
+    with open(outFileName, "w") as outFile:
+        outFile.write(outFileHeader + "\n" + gameLine(1) + "\n" + gameLine(2))
+    aggregator = IncrementalAggregator(outFileName)
+    assert aggregator.update(final=True) == 2
+    with open(outFileName, "a") as outFile:
+        outFile.write("\n" + gameLine(3) + "\n" + gameLine(4))
+    assert aggregator.update(final=False) == 1
+    assert aggregator.update(final=True) == 1
+    checkTotals(aggregator, 4)
+
+
+def testBlankLinesAreSkipped(tmp_path):
+    outFileName = str(tmp_path / "out.csv")
+    with open(outFileName, "w") as outFile:
+        outFile.write(outFileHeader + "\n" + gameLine(1) + "\n\n" + gameLine(2) + "\n \n")
+    aggregator = IncrementalAggregator(outFileName)
+    assert aggregator.update() == 2
+    checkTotals(aggregator, 2)
+
+
+def testResumeReadsOnlyNewGames(tmp_path):
+    outFileName = str(tmp_path / "out.csv")
+    with open(outFileName, "w") as outFile:
+        outFile.write(outFileHeader + "\n" + "".join([gameLine(gameNumber) + "\n" for gameNumber in range(1, 4)]))
+    aggregator = IncrementalAggregator(outFileName)
+    aggregator.publish(str(tmp_path / "agg.csv"))
+    with open(outFileName, "a") as outFile:
+        outFile.write("".join([gameLine(gameNumber) + "\n" for gameNumber in range(4, 8)]))
+    resumed = IncrementalAggregator(outFileName)
+    assert resumed.offset == aggregator.offset
+    assert resumed.update() == 4
+    checkTotals(resumed, 7)
+
+
+def testRewrittenFileIsReadAgain(tmp_path):
+    outFileName = str(tmp_path / "out.csv")
+    with open(outFileName, "w") as outFile:
+        outFile.write(outFileHeader + "\n" + "".join([gameLine(gameNumber) + "\n" for gameNumber in range(1, 6)]))
+    aggregator = IncrementalAggregator(outFileName)
+    aggregator.update()
+    with open(outFileName, "w") as outFile:
+        outFile.write(outFileHeader + "\n" + "".join([gameLine(gameNumber) + "\n" for gameNumber in range(1, 3)]))
+    assert aggregator.update() == 2
+    checkTotals(aggregator, 2)
@@ -0,0 +1,38 @@
+import numpy
+import pandas
+
+import HangmanSolver
+from LetterStatistics import LetterStatistics
+from tests import baselineSolver
+
+
+def testLettersAreInFirstSeenOrder():
+    statistics = LetterStatistics.fromWords(["dcb", "abd", "ee"])
+    assert statistics.letters == ["d", "c", "b", "a", "e"]
+    assert statistics.letterTotals.tolist() == [2, 1, 2, 1, 2]
+    assert statistics.wordsContaining.tolist() == [2, 1, 2, 1, 1]
+    assert statistics.letterCount == 8
+
+
+def testTiesGoToTheFirstLetterSeen():
+    # every letter is tied under every heuristic, the baseline loops kept the one they met first
+    words = pandas.DataFrame({"words": ["zyx", "xzy", "yxz"]})
+    for heuristic in baselineSolver.rankFunctions:
+        assert HangmanSolver.getGuess(heuristic, "___", "", words) == baselineSolver.getGuess(heuristic, "___", "", words)
+        assert HangmanSolver.getGuess(heuristic, "___", "", words)[0] == "z"
+
+
+def testPaddedWordsOfDifferentLengths():
+    statistics = LetterStatistics.fromWords(["ab", "abca", "c"])
+    assert statistics.matrix.shape == (3, 4)
+    assert statistics.letterTotals.tolist() == [3, 2, 2]
+    assert statistics.positionHistogram("").tolist() == [[2, 0, 0, 1], [0, 2, 0, 0], [1, 0, 1, 0]]
+
+
+def testPartitionSizes():
+    statistics = LetterStatistics.fromWords(["aab", "aba", "bba", "bbb"])
+    sizes = statistics.partitionSizes("")
+    assert [sorted(groupSizes.tolist()) for groupSizes in sizes] == [[1, 1, 1, 1], [1, 1, 1, 1]]
+    assert statistics.revealPatterns()[:, 0].tolist() == [3, 5, 4, 0]
+    assert [groupSizes.tolist() for groupSizes in statistics.partitionSizes("a")] == [[1, 1, 1, 1]]
+    assert numpy.array_equal(statistics.unusedMask("a"), [False, True])
@@ -0,0 +1,68 @@
+import numpy
+import pytest
+
+import OutFileEvaluator
+from OutFileWriter import OutFileWriter, getColumnarFileName, outFileHeader
+
+gameResult = ("abc", 3, 4, 3, 1, "zabc")
+
+
+def testNewFileGetsHeader(tmp_path):
+    outFileName = str(tmp_path / "out.csv")
+    writer = OutFileWriter(outFileName)
+    writer.write(2, gameResult)
+    writer.close()
+    with open(outFileName) as outFile:
+        assert outFile.read() == outFileHeader + "\n2,abc,3,4,3,1,zabc\n"
+
+
+def testPartialLastLineIsCutOff(tmp_path):
+    outFileName = str(tmp_path / "out.csv")
+    complete = outFileHeader + "\n3,abc,3,4,3,1,zabc\n1,abc,3,4,3,1,zabc\n"
+    with open(outFileName, "w") as outFile:
+        outFile.write(complete + "999,abc,3")
+    writer = OutFileWriter(outFileName)
+    assert writer.completedGames == {1, 3}
+    with open(outFileName) as outFile:
+        assert outFile.read() == complete
+    writer.write(2, gameResult)
+    writer.close()
+    with open(outFileName) as outFile:
+        assert outFile.read() == complete + "2,abc,3,4,3,1,zabc\n"
+
+
+def testUnterminatedHeaderIsRewritten(tmp_path):
+    outFileName = str(tmp_path / "out.csv")
+    with open(outFileName, "w") as outFile:
+        outFile.write(outFileHeader)
+    writer = OutFileWriter(outFileName)
+    assert writer.completedGames == set()
+    writer.close()
+    with open(outFileName) as outFile:
+        assert outFile.read() == outFileHeader + "\n"
+
+
+def testOtherFilesAreRefused(tmp_path):
+    outFileName = str(tmp_path / "out.csv")
+    with open(outFileName, "w") as outFile:
+        outFile.write("word,count\n")
+    with pytest.raises(ValueError):
+        OutFileWriter(outFileName)
+
+
+def testColumnarFileMatchesConvertedOutFile(tmp_path, monkeypatch):
+    monkeypatch.setattr(OutFileWriter, "columnarOutput", True)
+    outFileName = str(tmp_path / "out.csv")
+    with open(outFileName, "w") as outFile:
+        outFile.write(outFileHeader + "\n3,abc,3,4,3,1,zabc\n1,ab,2,2,2,0,ab\n5,a")
+    writer = OutFileWriter(outFileName)
+    writer.write(2, ("abcd", 4, 5, 4, 1, "zabcd"))
+    writer.write(4, ("b", 1, 1, 1, 0, ""))
+    writer.close()
+    OutFileEvaluator.convertOutFileToColumnar(outFileName, str(tmp_path / "converted.npz"))
+    with numpy.load(getColumnarFileName(outFileName)) as written, numpy.load(str(tmp_path / "converted.npz")) as converted:
+        assert written.files == converted.files
+        for column in converted.files:
+            assert written[column].dtype == converted[column].dtype
+            assert written[column].tolist() == converted[column].tolist()
+        assert written["gameNumber"].tolist() == [3, 1, 2, 4]
@@ -0,0 +1,17 @@
+import ExactSolver
+from PolicyTable import PolicyTable
+
+cells = {(5, 3, 0): {"frequency": [40, 80], "entropy": [40, 76]}, (5, 2, 1): {"frequency": [30, 30], "entropy": [3, 0]}}
+
+
+def testDefaultThresholdIsTheExactSolvers():
+    assert PolicyTable(cells).exactThreshold == ExactSolver.ExactSolver().threshold == ExactSolver.defaultThreshold
+    assert PolicyTable(cells).policyHash == PolicyTable(cells, exactThreshold=ExactSolver.defaultThreshold).policyHash
+    assert PolicyTable(cells).policyHash != PolicyTable(cells, exactThreshold=ExactSolver.defaultThreshold + 1).policyHash
+
+
+def testJsonRoundTripKeepsTheHash():
+    policyTable = PolicyTable(cells, tolerance=0.1, exactThreshold=4)
+    loaded = PolicyTable.fromJson(policyTable.toJson())
+    assert loaded.policyHash == policyTable.policyHash
+    assert loaded.chooseHeuristic("_____", 12) == policyTable.chooseHeuristic("_____", 12)
@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+import pytest
+
+from SolverServer import SolverServer
+
+
+async def exchange(handleConnection, requests: list) -> list:
+    """
+    Sends raw requests over one connection to a server that is started for them
+    :param handleConnection: the connection handler of the server
+    :param requests: the bytes of each request, sent one after the other
+    :return: (status line, decoded body) of each response, fewer if the server closed the connection
+    """
+    server = await asyncio.start_server(handleConnection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    responses = []
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for request in requests:
+            writer.write(request)
+            await writer.drain()
+            status = await reader.readline()
+            if status == b"":
+                break
+            headers = {}
+            while True:
+                headerLine = await reader.readline()
+                if headerLine in (b"\r\n", b""):
+                    break
+                name, value = headerLine.decode("latin-1").split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+            responses.append((status.decode("latin-1").strip(), json.loads(await reader.readexactly(int(headers["content-length"])))))
+        writer.close()
+    return responses
+
+
+def post(path: str, body) -> bytes:
+    """
+    :param path: the path of the request
+    :param body: the body of the request, encoded as JSON unless it is already bytes
+    :return: a keep-alive POST request
+    """
+    body = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+    return ("POST " + path + " HTTP/1.1\r\nContent-Length: " + str(len(body)) + "\r\n\r\n").encode("latin-1") + body
+
+
+@pytest.fixture
+def solverServer(dictionaryFileName) -> SolverServer:
+    return SolverServer([dictionaryFileName])
+
+
+def testGuess(solverServer):
+    responses = asyncio.run(exchange(solverServer.handleConnection, [post("/guess", {"board": "___", "heuristic": "frequency"})]))
+    assert responses[0][0] == "HTTP/1.1 200 OK"
+    assert len(responses[0][1]["letter"]) == 1
+
+
+@pytest.mark.parametrize("body", [[], ["board"], {"board": 5, "heuristic": "frequency"}, {"heuristic": "frequency"},
+                                  {"board": "___", "heuristic": "frequency", "usedLetters": ["e"]},
+                                  {"board": "___", "heuristic": "frequency", "dictionary": "other.txt"}, b"{", b"\xff", b""])
+def testBadBodiesGet400AndKeepTheConnection(solverServer, body):
+    responses = asyncio.run(exchange(solverServer.handleConnection, [post("/guess", body), post("/guess", {"board": "___", "heuristic": "frequency"})]))
+    assert [status for status, response in responses] == ["HTTP/1.1 400 Bad Request", "HTTP/1.1 200 OK"]
+
+
+@pytest.mark.parametrize("rawRequest", [b"garbage\r\n\r\n", b"POST /guess HTTP/1.1\r\nno colon\r\n\r\n",
+                                     b"POST /guess HTTP/1.1\r\nContent-Length: x\r\n\r\n"])
+def testUnreadableRequestsGet400AndClose(solverServer, rawRequest):
+    responses = asyncio.run(exchange(solverServer.handleConnection, [rawRequest, post("/guess", {"board": "___", "heuristic": "frequency"})]))
+    assert [status for status, response in responses] == ["HTTP/1.1 400 Bad Request"]
+
+
+def testFailuresGet500(solverServer, monkeypatch):
+    def getStats():
+        raise RuntimeError("stats are broken")
+    monkeypatch.setattr(solverServer, "getStats", getStats)
+    responses = asyncio.run(exchange(solverServer.handleConnection, [b"GET /stats HTTP/1.1\r\n\r\n", b"GET /nothing HTTP/1.1\r\n\r\n"]))
+    assert [status for status, response in responses] == ["HTTP/1.1 500 Internal Server Error", "HTTP/1.1 404 Not Found"]
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from OutFileWriter import outFileHeader
+import TestCoordinator
+from tests.test_SolverServer import exchange, post
+
+worker = {"worker": "test", "dictionaryHash": "hash"}
+
+
+def gameResult(word: str) -> list:
+    return [word, len(word), 4, 3, 1, "z" + word]
+
+
+@pytest.fixture
+def coordinator(tmp_path) -> TestCoordinator.TestCoordinator:
+    return TestCoordinator.TestCoordinator(3, "hash", {"frequency": str(tmp_path / "out.csv")})
+
+
+def testGamesAreWrittenInOrder(coordinator, tmp_path):
+    leaseRequest = post("/lease", worker)
+    responses = asyncio.run(exchange(coordinator.handleConnection, [
+        post("/settings", worker), leaseRequest,
+        post("/results", {"leaseId": 1, "strategy": "frequency", "results": [[2, gameResult("ab")], [3, gameResult("abc")]]}),
+        post("/results", {"leaseId": 1, "strategy": "frequency", "results": [[1, gameResult("a")]]}), leaseRequest]))
+    assert [status for status, response in responses] == ["HTTP/1.1 200 OK"]*5
+    assert responses[0][1] == {"exactSearch": None, "policy": None}
+    assert responses[1][1]["gameNumbers"] == [1, 2, 3]
+    assert responses[4][1] == {"done": True}
+    coordinator.writers["frequency"].close()
+    with open(str(tmp_path / "out.csv")) as outFile:
+        assert outFile.read() == outFileHeader + "\n1,a,1,4,3,1,za\n2,ab,2,4,3,1,zab\n3,abc,3,4,3,1,zabc\n"
+
+
+@pytest.mark.parametrize("path, body", [("/results", []), ("/results", {"leaseId": "1", "strategy": "frequency", "results": []}),
+                                        ("/results", {"leaseId": 1, "strategy": "other", "results": []}),
+                                        ("/results", {"leaseId": 1, "strategy": "frequency", "results": {}}),
+                                        ("/results", {"leaseId": 1, "strategy": "frequency", "results": [[1, gameResult("a")], [2, "ab"]]}),
+                                        ("/results", {"leaseId": 1, "strategy": "frequency", "results": [[1, gameResult("a,b")]]}),
+                                        ("/results", {"leaseId": 1, "strategy": "frequency", "results": [[True, gameResult("a")]]}),
+                                        ("/results", {"leaseId": 1, "strategy": "frequency", "results": [[1]]}),
+                                        ("/lease", ["test"]), ("/lease", {"worker": "test"}), ("/lease", {"worker": "test", "dictionaryHash": "other"}),
+                                        ("/settings", "hash"), ("/settings", {"worker": 5, "dictionaryHash": "hash"})])
+def testBadBodiesGet400AndChangeNothing(coordinator, path, body):
+    responses = asyncio.run(exchange(coordinator.handleConnection, [post("/lease", worker), post(path, body), post("/lease", worker)]))
+    assert [status for status, response in responses] == ["HTTP/1.1 200 OK", "HTTP/1.1 400 Bad Request", "HTTP/1.1 200 OK"]
+    assert coordinator.getStats()["written"] == {"frequency": 0}
+    assert coordinator.received["frequency"] == {}